@@ -0,0 +1,36 @@
+"""Times the semantic analysis of calls to a chain of functions calling each other."""
+
+import os, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import src.ast
+from src.ast import BinaryOp, Constant, FunCall, Identifier
+from src.interpreter import AnalyzerVisitor, Context, FunctionStorage
+
+CALLS = 3
+
+def define_chain(ctx: Context, length: int):
+	"""Defines f0(x) = x and fi(x) = f(i-1)(x) + ... with CALLS calls to the previous one."""
+	x = Identifier('x')
+	ctx.set_function('f0', FunctionStorage([x], x))
+	for i in range(1, length + 1):
+		call = FunCall(Identifier(f'f{i - 1}'), [x])
+		body = call
+		for _ in range(CALLS - 1):
+			body = BinaryOp(body, '+', call)
+		ctx.set_function(f'f{i}', FunctionStorage([x], body, {f'f{i - 1}'}))
+
+if __name__ == '__main__':
+	for length in (4, 8, 12, 16):
+		ctx = Context()
+		define_chain(ctx, length)
+		call = FunCall(Identifier(f'f{length}'), [Constant(1)])
+		start = time.perf_counter()
+		AnalyzerVisitor(ctx).visit(call)
+		first = (time.perf_counter() - start) * 1e6
+		start = time.perf_counter()
+		AnalyzerVisitor(ctx).visit(call)
+		cached = (time.perf_counter() - start) * 1e6
+		print(f'chain of {length:2} functions: first call {first:9.1f} us, '
+			f'summarized {cached:6.1f} us')
@@ -0,0 +1,36 @@
+"""Tabulates user-defined functions with and without compiling them."""
+
+import os, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import src.ast
+from src.ast import Constant, FunCall, Identifier
+from src.interpreter import AnalyzerVisitor, Context, EvaluatorVisitor
+from src.parser import parse
+
+DEFINITIONS = [
+	'f(x) = 3x ^ 2 + sin(x) * 2 - x / 4',
+	'g(x) = f(x) * f(x + 1) - abs(x - 10)',
+	'h(x) = [[g(x), x]; [1, f(x)]] ** [[x]; [2]]'
+]
+
+POINTS = 2000
+
+if __name__ == '__main__':
+	for id in ('f', 'g', 'h'):
+		timings = {}
+		for compiled in (False, True):
+			ctx = Context()
+			ev = EvaluatorVisitor(ctx)
+			ev.compile_functions = compiled
+			for s in DEFINITIONS:
+				stmt = parse(s)
+				AnalyzerVisitor(ctx).visit(stmt)
+				ev.visit(stmt)
+			calls = [FunCall(Identifier(id), [Constant(i / 10)]) for i in range(POINTS)]
+			start = time.perf_counter()
+			[ev.visit(call) for call in calls]
+			timings[compiled] = (time.perf_counter() - start) / POINTS * 1e6
+		print(f'{id}: tree walk {timings[False]:8.2f} us/call, compiled {timings[True]:8.2f} '
+			f'us/call, speedup {timings[False] / timings[True]:6.2f}x')
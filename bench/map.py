@@ -0,0 +1,39 @@
+"""Samples a user-defined function with one statement per point, then with a single map or sum."""
+
+import os, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import src.ast
+from src.ast import Constant
+from src.dtype import Matrix
+from src.interpreter import AnalyzerVisitor, Context, EvaluatorVisitor
+from src.parser import parse
+
+DEFINITION = 'f(x) = 3x ^ 2 + sin(x) * 2 - x / 4'
+
+POINTS = 10000
+
+def run(ctx: Context, ev: EvaluatorVisitor, statements: list):
+	start = time.perf_counter()
+	for s in statements:
+		stmt = parse(s)
+		AnalyzerVisitor(ctx).visit(stmt)
+		ev.visit(stmt)
+	return time.perf_counter() - start
+
+if __name__ == '__main__':
+	ctx = Context()
+	ev = EvaluatorVisitor(ctx)
+	run(ctx, ev, [DEFINITION])
+	points = [i / 10 for i in range(POINTS)]
+	statements = run(ctx, ev, [f'f({x})' for x in points])
+	ctx.set_variable('m', Constant(Matrix([[x] for x in points])))
+	batched = run(ctx, ev, ['map(f, m)'])
+	print(f'{POINTS} points: statements {statements * 1e3:8.2f} ms, map {batched * 1e3:8.2f} ms, '
+		f'speedup {statements / batched:6.2f}x')
+	run(ctx, ev, ['s = 0'])
+	statements = run(ctx, ev, [f's = s + f({k})' for k in range(1, POINTS + 1)])
+	reduced = run(ctx, ev, [f'sum(f, 1, {POINTS})'])
+	print(f'{POINTS} terms: statements {statements * 1e3:8.2f} ms, sum {reduced * 1e3:8.2f} ms, '
+		f'speedup {statements / reduced:6.2f}x')
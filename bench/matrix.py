@@ -0,0 +1,31 @@
+"""Times parsing, analyzing and evaluating a large matrix literal."""
+
+import os, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import src.ast
+from src.interpreter import AnalyzerVisitor, Context, EvaluatorVisitor
+from src.parser import parse
+
+def matrix_literal(n: int):
+	rows = ('[' + ', '.join(str(i * n + j) for j in range(n)) + ']' for i in range(n))
+	return 'm = [' + '; '.join(rows) + ']'
+
+if __name__ == '__main__':
+	for n in (100, 300):
+		s = matrix_literal(n)
+		for backend in ('ply', 'pratt'):
+			ctx = Context()
+			start = time.perf_counter()
+			stmt = parse(s, backend)
+			parsed = time.perf_counter()
+			AnalyzerVisitor(ctx).visit(stmt)
+			EvaluatorVisitor(ctx).visit(stmt)
+			end = time.perf_counter()
+			print(f'{n}x{n} {backend:6} parse {(parsed - start) * 1000:9.2f} ms, '
+				f'analyze + evaluate {(end - parsed) * 1000:9.2f} ms')
+		start = time.perf_counter()
+		for _ in range(100):
+			EvaluatorVisitor(ctx).visit(parse('m'))
+		print(f'{n}x{n} variable lookup {(time.perf_counter() - start) * 10:9.3f} ms')
@@ -0,0 +1,33 @@
+"""Compares the PLY and the hand-written parser backends on large statements."""
+
+import os, sys, timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import src.ast
+from src.parser import parse
+
+def matrix_literal(n: int):
+	rows = ('[' + ', '.join(str(i * n + j) for j in range(n)) + ']' for i in range(n))
+	return 'm = [' + '; '.join(rows) + ']'
+
+def expression_chain(n: int):
+	ops = ['+', '*', '-', '/', '^']
+	return 'x = ' + ' '.join(f'{i} {ops[i % len(ops)]}' for i in range(n)) + ' y'
+
+WORKLOADS = {
+	'matrix literal 100x100': matrix_literal(100),
+	'expression chain of 10000 terms': expression_chain(10000),
+	'short statement': 'f(x) = 2x ^ 2 + 3 * x - 1'
+}
+
+if __name__ == '__main__':
+	for name, s in WORKLOADS.items():
+		number = 10 if len(s) > 1000 else 10000
+		print(name)
+		timings = {}
+		for backend in ('ply', 'pratt'):
+			t = min(timeit.repeat(lambda: parse(s, backend=backend), number=number, repeat=3))
+			timings[backend] = t / number * 1000
+			print(f'  {backend:6} {timings[backend]:10.4f} ms')
+		print(f'  speedup {timings["ply"] / timings["pratt"]:8.2f}x')
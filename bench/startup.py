@@ -0,0 +1,36 @@
+"""Measures the time from interpreter start to the first prompt of computorv2.
+
+Each run starts a fresh `python3 computorv2.py` process with an empty standard input, so it
+exits right after the first call to input(). The cold runs use an empty table cache, which
+matches the previous behaviour where the parse tables were regenerated at import time."""
+
+import os, statistics, subprocess, sys, tempfile, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNS = 20
+
+def run_once(cache_dir: str):
+	env = dict(os.environ, COMPUTORV2_CACHE_DIR=cache_dir)
+	start = time.perf_counter()
+	subprocess.run([sys.executable, 'computorv2.py'], cwd=ROOT, env=env, check=True,
+		stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL)
+	return time.perf_counter() - start
+
+def measure(cold: bool):
+	timings = []
+	with tempfile.TemporaryDirectory() as warm_dir:
+		run_once(warm_dir)
+		for _ in range(RUNS):
+			if cold:
+				with tempfile.TemporaryDirectory() as cold_dir:
+					timings.append(run_once(cold_dir))
+			else:
+				timings.append(run_once(warm_dir))
+	return statistics.median(timings) * 1000
+
+if __name__ == '__main__':
+	cold = measure(True)
+	warm = measure(False)
+	print(f'generated tables: {cold:8.2f} ms')
+	print(f'cached tables:    {warm:8.2f} ms')
+	print(f'speedup:          {cold / warm:8.2f}x')
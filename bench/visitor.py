@@ -0,0 +1,77 @@
+"""Measures the per-node cost of the accept() double dispatch against the dispatch tables."""
+
+import os, sys, timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import src.ast
+from src.ast import RenderVisitor, Visitor
+from src.interpreter import AnalyzerVisitor, Context, DependenciesVisitor, EvaluatorVisitor
+from src.parser import parse
+
+class NodeCounter(Visitor):
+	"""Counts the nodes of a tree using the dispatch table."""
+
+	def visit(self, n):
+		return self.handlers[n.__class__](self, n)
+
+	def visit_assign(self, assign):
+		return 1 + self.visit(assign.target) + self.visit(assign.value)
+
+	def visit_binaryop(self, binop):
+		return 1 + self.visit(binop.left) + self.visit(binop.right)
+
+	def visit_bind(self, bind):
+		return 1 + self.visit(bind.target) + self.visit(bind.value)
+
+	def visit_command(self, _):
+		return 1
+
+	def visit_constant(self, _):
+		return 1
+
+	def visit_funcall(self, funcall):
+		return 1 + self.visit(funcall.id) + sum(self.visit(arg) for arg in funcall.args)
+
+	def visit_identifier(self, _):
+		return 1
+
+	def visit_matdecl(self, matdecl):
+		return 1 + sum(self.visit(cell) for row in matdecl.rows for cell in row)
+
+	def visit_solve(self, solve):
+		return 1 + self.visit(solve.assign)
+
+	def visit_unaryop(self, unop):
+		return 1 + self.visit(unop.right)
+
+class AcceptNodeCounter(NodeCounter):
+	"""Counts the nodes of a tree using node.accept()."""
+
+	def visit(self, n):
+		return n.accept(self)
+
+def expression(n: int):
+	return 'g(x) = ' + ' + '.join(f'sin(x) * -{i} ^ x' for i in range(n))
+
+def timing(f):
+	return min(timeit.repeat(f, number=20, repeat=5)) / 20
+
+if __name__ == '__main__':
+	sys.setrecursionlimit(100000)
+	node = parse(expression(2000))
+	n_nodes = NodeCounter().visit(node)
+	print(f'dispatch overhead ({n_nodes} nodes)')
+	t_accept = timing(lambda: AcceptNodeCounter().visit(node))
+	t_table = timing(lambda: NodeCounter().visit(node))
+	print(f'  accept {t_accept * 1e9 / n_nodes:8.1f} ns/node')
+	print(f'  table  {t_table * 1e9 / n_nodes:8.1f} ns/node')
+	print(f'  saved  {(t_accept - t_table) * 1e9 / n_nodes:8.1f} ns/node')
+	visitors = {
+		'AnalyzerVisitor': lambda: AnalyzerVisitor(Context()).visit(node),
+		'DependenciesVisitor': lambda: DependenciesVisitor(Context()).visit(node),
+		'EvaluatorVisitor': lambda: EvaluatorVisitor(Context()).visit(node),
+		'RenderVisitor': lambda: RenderVisitor().visit(node)
+	}
+	for name, run in visitors.items():
+		print(f'{name:20} {timing(run) * 1e9 / n_nodes:8.1f} ns/node')
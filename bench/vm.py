@@ -0,0 +1,50 @@
+"""Compares the tree-walking evaluator with the virtual machine and profiles the opcodes."""
+
+import os, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import src.ast
+from src.interpreter import AnalyzerVisitor, Context, EvaluatorVisitor
+from src.parser import parse
+
+DEFINITIONS = [
+	'f(x) = 3x ^ 2 + sin(x) * 2 - x / 4',
+	'g(x) = f(x) * f(x + 1) - abs(x - 10)'
+]
+
+WORKLOADS = {
+	'sum of 500 terms': 'x = ' + ' + '.join(f'{i} * 2 - 1' for i in range(500)),
+	'sum of 10000 terms': 'x = ' + ' + '.join(str(i) for i in range(10000)),
+	'function calls': 'x = ' + ' + '.join(f'g({i})' for i in range(200)),
+	'matrix literal': 'x = [' + '; '.join(f'[f({i}), {i} * 2]' for i in range(200)) + ']'
+}
+
+def run(engine: str, stmt, ctx: Context):
+	ev = EvaluatorVisitor(ctx, engine)
+	start = time.perf_counter()
+	try:
+		ev.visit(stmt)
+	except RecursionError:
+		return None
+	return (time.perf_counter() - start) * 1000
+
+if __name__ == '__main__':
+	ctx = Context()
+	for s in DEFINITIONS:
+		stmt = parse(s)
+		AnalyzerVisitor(ctx).visit(stmt)
+		EvaluatorVisitor(ctx).visit(stmt)
+	for name, s in WORKLOADS.items():
+		stmt = parse(s)
+		print(name)
+		for engine in EvaluatorVisitor.engines:
+			t = run(engine, stmt, ctx)
+			print(f'  {engine:4} ' + (f'{t:9.2f} ms' if t is not None else 'recursion limit'))
+	ev = EvaluatorVisitor(ctx, 'vm')
+	ev.vm.profiling = True
+	for s in WORKLOADS.values():
+		ev.visit(parse(s))
+	print('opcode profile')
+	for name, (count, t) in sorted(ev.vm.stats.items(), key=lambda x: -x[1][1]):
+		print(f'  {name:12} {count:8} calls {t * 1000:9.2f} ms {t / count * 1e9:8.1f} ns/op')
@@ -1,6 +1,8 @@
 from src.ast.ast import Ast
 from src.ast.terminals import Constant, Identifier
 from src.ast.operators import BinaryOp, UnaryOp
-from src.ast.statements import Assign, Command, FunCall, MatDecl, Solve
+from src.ast.statements import Assign, Bind, Command, FunCall, MatDecl, Solve
 from src.ast.visitor import Visitor
 from src.ast.render_visitor import RenderVisitor
+from src.ast.interner import Interner
+from src.ast.optimizer import Optimizer
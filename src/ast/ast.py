@@ -1,8 +1,46 @@
 from abc import ABC, abstractmethod
 
 class Ast(ABC):
-	"""Represents an Abstract Syntax Tree node."""
+	"""Represents an immutable Abstract Syntax Tree node.
+
+	Nodes are compared structurally and their hash is computed once, when they are created,
+	from the already cached hashes of their children."""
+
+	__slots__ = ('_hash',)
+
+	def _freeze(self):
+		object.__setattr__(self, '_hash', hash((self.__class__, self._key())))
+
+	@abstractmethod
+	def _key(self):
+		"""Returns the tuple of fields identifying the node."""
+		pass
 
 	@abstractmethod
 	def accept(self, visitor):
 		pass
+
+	def __copy__(self):
+		return self
+
+	def __deepcopy__(self, memo):
+		return self
+
+	def __delattr__(self, name):
+		raise AttributeError(f'{self.__class__.__name__} is immutable')
+
+	def __eq__(self, other):
+		if self is other:
+			return True
+		if self.__class__ is not other.__class__ or self._hash != other._hash:
+			return False
+		return self._key() == other._key()
+
+	def __hash__(self):
+		return self._hash
+
+	def __ne__(self, other):
+		return not self == other
+
+	def __setattr__(self, name, value):
+		raise AttributeError(f'{self.__class__.__name__} is immutable')
@@ -0,0 +1,73 @@
+from src.ast import Assign, Ast, BinaryOp, Bind, Command, Constant, FunCall, Identifier, MatDecl, \
+	Solve, UnaryOp, Visitor
+
+class Interner(Visitor):
+	"""Hash-conses AST nodes so that structurally equal subtrees share a single node.
+
+	Interned trees are DAGs: their size is the number of distinct subexpressions."""
+
+	def __init__(self, limit: int = 1024):
+		self.limit = limit
+		self.nodes = {}
+		self.res = None
+
+	def _intern(self, node: Ast):
+		return self.nodes.setdefault(node, node)
+
+	def clear(self):
+		self.nodes.clear()
+
+	def retain(self, roots):
+		"""Drops the nodes that are not reachable from the given roots."""
+		self.clear()
+		[self.visit(root) for root in roots if isinstance(root, Ast)]
+		self.limit = max(self.limit, 2 * len(self.nodes))
+
+	def visit(self, node: Ast):
+		r = self.nodes.get(node)
+		if r is None:
+			r = self.handlers[node.__class__](self, node)
+		self.res = r
+		return r
+
+	def visit_assign(self, assign: Assign):
+		return self._intern(Assign(self.visit(assign.target), self.visit(assign.value)))
+
+	def visit_binaryop(self, binop: BinaryOp):
+		# Left-nested chains such as long sums are rebuilt iteratively
+		spine = []
+		while isinstance(binop.left, BinaryOp):
+			spine.append(binop)
+			binop = binop.left
+		node = self._intern(BinaryOp(self.visit(binop.left), binop.op, self.visit(binop.right)))
+		for binop in reversed(spine):
+			node = self._intern(BinaryOp(node, binop.op, self.visit(binop.right)))
+		return node
+
+	def visit_bind(self, bind: Bind):
+		return self._intern(Bind(self.visit(bind.target), self.visit(bind.value)))
+
+	def visit_command(self, cmd: Command):
+		return self._intern(cmd)
+
+	def visit_constant(self, constant: Constant):
+		return self._intern(constant)
+
+	def visit_funcall(self, funcall: FunCall):
+		args = [self.visit(arg) for arg in funcall.args]
+		return self._intern(FunCall(self.visit(funcall.id), args))
+
+	def visit_identifier(self, id: Identifier):
+		return self._intern(id)
+
+	def visit_matdecl(self, matdecl: MatDecl):
+		return self._intern(MatDecl([[self.visit(cell) for cell in row] for row in matdecl.rows]))
+
+	def visit_solve(self, solve: Solve):
+		return self._intern(Solve(self.visit(solve.assign)))
+
+	def visit_unaryop(self, unop: UnaryOp):
+		return self._intern(UnaryOp(unop.op, self.visit(unop.right)))
+
+	def __len__(self):
+		return len(self.nodes)
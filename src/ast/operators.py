@@ -20,10 +20,13 @@ class BinaryOp(Ast):
 		'-': lambda a, b: a - b
 	}
 
+	__slots__ = ('left', 'op', 'right')
+
 	def __init__(self, left: Ast, op: str, right: Ast):
-		self.left = left
-		self.op = op
-		self.right = right
+		object.__setattr__(self, 'left', left)
+		object.__setattr__(self, 'op', op)
+		object.__setattr__(self, 'right', right)
+		self._freeze()
 
 	def _convert_to_token(self):
 		symbol_to_token = {
@@ -37,6 +40,9 @@ class BinaryOp(Ast):
 		}
 		return symbol_to_token[self.op]
 
+	def _key(self):
+		return (self.left, self.op, self.right)
+
 	def accept(self, visitor):
 		return visitor.visit_binaryop(self)
 
@@ -63,15 +69,21 @@ class UnaryOp(Ast):
 		'+': lambda a: a
 	}
 
+	__slots__ = ('op', 'right')
+
 	def __init__(self, op: str, right: Ast):
-		self.op = op
-		self.right = right
+		object.__setattr__(self, 'op', op)
+		object.__setattr__(self, 'right', right)
+		self._freeze()
 
 	def _convert_to_token(self):
 		return 'UADD' if self.op == '+' else 'USUB'
 
+	def _key(self):
+		return (self.op, self.right)
+
 	def accept(self, visitor):
-		visitor.visit_unaryop(self)
+		return visitor.visit_unaryop(self)
 
 	def evaluate(self, right):
 		return self.unary_ops[self.op](right)
@@ -0,0 +1,180 @@
+from src.ast import Assign, Ast, BinaryOp, Bind, Command, Constant, FunCall, Identifier, MatDecl, \
+	Solve, UnaryOp, Visitor
+
+def is_value(node: Ast, value: int):
+	# Float constants are not matched, since E + 0.0 turns an integer E into a float
+	return isinstance(node, Constant) and isinstance(node.value, int) and node.value == value
+
+def rule(*ops: str, scalar_only: bool = False, pure_only: bool = False):
+	"""Registers the decorated function as a rewrite rule for the given root operators.
+	Unary operators are prefixed with 'u'."""
+	def decorator(f):
+		f.ops = ops
+		f.scalar_only = scalar_only
+		f.pure_only = pure_only
+		return f
+	return decorator
+
+@rule('+', pure_only=True)
+def add_same(node: BinaryOp):
+	if node.left == node.right:
+		return BinaryOp(Constant(2), '*', node.left)
+
+@rule('*')
+def mul_one(node: BinaryOp):
+	if is_value(node.left, 1):
+		return node.right
+	if is_value(node.right, 1):
+		return node.left
+
+@rule('-')
+def sub_zero(node: BinaryOp):
+	if is_value(node.right, 0):
+		return node.left
+
+@rule('^', scalar_only=True)
+def pow_one(node: BinaryOp):
+	if is_value(node.right, 1):
+		return node.left
+
+@rule('u+')
+def unary_add(node: UnaryOp):
+	return node.right
+
+@rule('u-')
+def unary_sub_twice(node: UnaryOp):
+	if isinstance(node.right, UnaryOp) and node.right.op == '-':
+		return node.right.right
+
+class Optimizer(Visitor):
+	"""Simplifies an AST with the rules described in doc/optimizer.md until none applies.
+
+	Rules are indexed by the operator of the node they rewrite. The rules that do not hold
+	when an operand is a matrix, such as E ^ 1 -> E, only rewrite nodes whose operands are
+	known to be scalars: numbers and the given scalar identifiers, unless every operand is
+	assumed to be a scalar. The rules that merge repeated operands, such as E + E -> 2 * E,
+	only rewrite nodes whose calls are all to the given pure functions."""
+
+	rules = (add_same, mul_one, sub_zero, pow_one, unary_add, unary_sub_twice)
+
+	def __init__(self, assume_scalars: bool = False, scalars: set = frozenset(),
+			pure_functions: set = frozenset()):
+		self.assume_scalars = assume_scalars
+		self.scalars = scalars
+		self.pure_functions = pure_functions
+		self.changed = False
+		self.index = {}
+		for r in self.rules:
+			for op in r.ops:
+				self.index.setdefault(op, []).append(r)
+
+	def _is_scalar(self, node: Ast):
+		cls = node.__class__
+		if cls is Constant:
+			return isinstance(node.value, (int, float))
+		if cls is Identifier:
+			return node.value in self.scalars
+		if cls is BinaryOp:
+			return node.op != '**' and self._is_scalar(node.left) and self._is_scalar(node.right)
+		if cls is UnaryOp:
+			return self._is_scalar(node.right)
+		return False
+
+	def _is_pure(self, node: Ast):
+		nodes = [node]
+		while nodes:
+			node = nodes.pop()
+			cls = node.__class__
+			if cls is BinaryOp:
+				nodes += (node.left, node.right)
+			elif cls is UnaryOp:
+				nodes.append(node.right)
+			elif cls is FunCall:
+				if node.id.value not in self.pure_functions:
+					return False
+				nodes += node.args
+			elif cls is MatDecl:
+				nodes += (cell for row in node.rows for cell in row)
+		return True
+
+	def _rewrite(self, node: Ast):
+		"""Applies the rules of the node operator until none matches."""
+		while True:
+			if isinstance(node, BinaryOp):
+				key = node.op
+			elif isinstance(node, UnaryOp):
+				key = 'u' + node.op
+			else:
+				return node
+			for r in self.index.get(key, ()):
+				res = r(node)
+				if res is not None and r.scalar_only and not self.assume_scalars and \
+						not self._is_scalar(node):
+					res = None
+				if res is not None and r.pure_only and not self._is_pure(node):
+					res = None
+				if res is not None:
+					self.changed = True
+					node = res
+					break
+			else:
+				return node
+
+	def _fold_binaryop(self, left: Ast, op: str, right: Ast):
+		node = BinaryOp(left, op, right)
+		if isinstance(left, Constant) and isinstance(right, Constant):
+			self.changed = True
+			return Constant(node.evaluate(left.value, right.value))
+		return self._rewrite(node)
+
+	def optimize(self, node: Ast):
+		"""Returns the simplified tree, once a pass over it does not fire any rule anymore."""
+		while True:
+			self.changed = False
+			node = self.visit(node)
+			if not self.changed:
+				return node
+
+	def visit(self, node: Ast):
+		return self.handlers[node.__class__](self, node)
+
+	def visit_assign(self, assign: Assign):
+		return Assign(assign.target, self.visit(assign.value))
+
+	def visit_binaryop(self, binop: BinaryOp):
+		# Left-nested chains such as long sums are simplified iteratively
+		spine = [binop]
+		while isinstance(spine[-1].left, BinaryOp):
+			spine.append(spine[-1].left)
+		node = self.visit(spine[-1].left)
+		for binop in reversed(spine):
+			node = self._fold_binaryop(node, binop.op, self.visit(binop.right))
+		return node
+
+	def visit_bind(self, bind: Bind):
+		return Bind(bind.target, self.visit(bind.value))
+
+	def visit_command(self, cmd: Command):
+		return cmd
+
+	def visit_constant(self, constant: Constant):
+		return constant
+
+	def visit_funcall(self, funcall: FunCall):
+		return FunCall(funcall.id, [self.visit(arg) for arg in funcall.args])
+
+	def visit_identifier(self, id: Identifier):
+		return id
+
+	def visit_matdecl(self, matdecl: MatDecl):
+		return MatDecl([[self.visit(cell) for cell in row] for row in matdecl.rows])
+
+	def visit_solve(self, solve: Solve):
+		return Solve(self.visit(solve.assign))
+
+	def visit_unaryop(self, unop: UnaryOp):
+		right = self.visit(unop.right)
+		if isinstance(right, Constant):
+			self.changed = True
+			return Constant(unop.evaluate(right.value))
+		return self._rewrite(UnaryOp(unop.op, right))
@@ -1,4 +1,4 @@
-from src.ast import Assign, Ast, BinaryOp, Command, Constant, FunCall, Identifier, MatDecl, \
+from src.ast import Assign, Ast, BinaryOp, Bind, Command, Constant, FunCall, Identifier, MatDecl, \
 	Solve, UnaryOp, Visitor
 
 class RenderVisitor(Visitor):
@@ -8,7 +8,7 @@ class RenderVisitor(Visitor):
 		self.res = ''
 
 	def visit(self, node: Ast):
-		node.accept(self)
+		self.res = self.dispatch(node)
 		return self.res
 
 	def _need_parentheses(self, parent: BinaryOp, child, assoc):
@@ -18,64 +18,58 @@ class RenderVisitor(Visitor):
 			and parent.get_associativity() == assoc))
 
 	def _render_grouped(self, node, need_parenthesis):
-		if need_parenthesis:
-			self.res += '('
-		node.accept(self)
-		if need_parenthesis:
-			self.res += ')'
+		s = self.dispatch(node)
+		return '(' + s + ')' if need_parenthesis else s
 
 	def visit_assign(self, assign: Assign):
-		assign.target.accept(self)
-		self.res += ' = '
-		assign.value.accept(self)
+		return self.dispatch(assign.target) + ' = ' + self.dispatch(assign.value)
 
-	def visit_binaryop(self, binop: BinaryOp):
-		left_parentheses = self._need_parentheses(binop, binop.left, 'right')
+	def _render_binaryop(self, binop: BinaryOp, left: str):
+		if self._need_parentheses(binop, binop.left, 'right'):
+			left = '(' + left + ')'
 		right_parentheses = self._need_parentheses(binop, binop.right, 'left')
-		self._render_grouped(binop.left, left_parentheses)
-		if binop.op != '*' or not (isinstance(binop.left, Constant) \
-			and isinstance(binop.right, Identifier)):
-			self.res += ' ' + binop.op + ' '
-		self._render_grouped(binop.right, right_parentheses)
+		op = ' ' + binop.op + ' '
+		if binop.op == '*' and isinstance(binop.left, Constant) \
+			and isinstance(binop.right, Identifier):
+			op = ''
+		return left + op + self._render_grouped(binop.right, right_parentheses)
+
+	def visit_binaryop(self, binop: BinaryOp):
+		# Left-nested chains such as long sums are rendered iteratively
+		spine = [binop]
+		while isinstance(spine[-1].left, BinaryOp):
+			spine.append(spine[-1].left)
+		s = self.dispatch(spine[-1].left)
+		for binop in reversed(spine):
+			s = self._render_binaryop(binop, s)
+		return s
+
+	def visit_bind(self, bind: Bind):
+		return self.dispatch(bind.target) + ' := ' + self.dispatch(bind.value)
 
 	def visit_command(self, cmd: Command):
-		self.res += '% ' + ' '.join(cmd.args)
+		return '% ' + ' '.join(cmd.args)
 
 	def visit_constant(self, constant: Constant):
-		self.res += str(constant.value)
+		return str(constant.value)
 
 	def visit_identifier(self, id: Identifier):
-		self.res += id.value
+		return id.value
 
 	def visit_funcall(self, funcall: FunCall):
-		funcall.id.accept(self)
-		self.res += '('
-		for i, arg in enumerate(funcall.args):
-			if i > 0:
-				self.res += ', '
-			arg.accept(self)
-		self.res += ')'
+		args = ', '.join(self.dispatch(arg) for arg in funcall.args)
+		return self.dispatch(funcall.id) + '(' + args + ')'
 
 	def visit_matdecl(self, matdecl: MatDecl):
-		self.res += '['
-		for i, row in enumerate(matdecl.rows):
-			if i > 0:
-				self.res += '; '
-			self.res += '['
-			for j, cell in enumerate(row):
-				if j > 0:
-					self.res += ', '
-				cell.accept(self)
-			self.res += ']'
-		self.res += ']'
+		rows = ('[' + ', '.join(self.dispatch(cell) for cell in row) + ']'
+			for row in matdecl.rows)
+		return '[' + '; '.join(rows) + ']'
 
 	def visit_solve(self, solve: Solve):
-		solve.assign.accept(self)
-		self.res += ' ?'
+		return self.dispatch(solve.assign) + ' ?'
 
 	def visit_unaryop(self, unop: UnaryOp):
 		need_parentheses = isinstance(unop.right, (BinaryOp, UnaryOp)) \
 			and unop.get_precedence() > unop.right.get_precedence()
-		if unop.op == '-':
-			self.res += '-'
-		self._render_grouped(unop.right, need_parentheses)
+		op = '-' if unop.op == '-' else ''
+		return op + self._render_grouped(unop.right, need_parentheses)
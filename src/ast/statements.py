@@ -3,9 +3,15 @@ from src.ast import Ast, Identifier
 class Assign(Ast):
 	"""Represents an assignment statement."""
 
+	__slots__ = ('target', 'value')
+
 	def __init__(self, target: Ast, value: Ast):
-		self.target = target
-		self.value = value
+		object.__setattr__(self, 'target', target)
+		object.__setattr__(self, 'value', value)
+		self._freeze()
+
+	def _key(self):
+		return (self.target, self.value)
 
 	def accept(self, visitor):
 		return visitor.visit_assign(self)
@@ -13,51 +19,94 @@ class Assign(Ast):
 	def __repr__(self):
 		return f"{self.__class__.__name__}({repr(self.target)}, {repr(self.value)})"
 
+class Bind(Ast):
+	"""Represents a reactive binding statement."""
+
+	__slots__ = ('target', 'value')
+
+	def __init__(self, target: Ast, value: Ast):
+		object.__setattr__(self, 'target', target)
+		object.__setattr__(self, 'value', value)
+		self._freeze()
+
+	def _key(self):
+		return (self.target, self.value)
+
+	def accept(self, visitor):
+		return visitor.visit_bind(self)
+
+	def __repr__(self):
+		return f"{self.__class__.__name__}({repr(self.target)}, {repr(self.value)})"
+
 class Command(Ast):
 	"""Represents a command statement."""
 
+	__slots__ = ('args',)
+
 	def __init__(self, args: list):
-		self.args = args
+		object.__setattr__(self, 'args', tuple(args))
+		self._freeze()
+
+	def _key(self):
+		return self.args
 
 	def accept(self, visitor):
 		return visitor.visit_command(self)
 
 	def __repr__(self):
-		return f"{self.__class__.__name__}({repr(self.args)})"
+		return f"{self.__class__.__name__}({repr(list(self.args))})"
 
 class FunCall(Ast):
 	"""Represents a function call statement."""
 
+	__slots__ = ('id', 'args')
+
 	def __init__(self, id: Identifier, args: list):
-		self.id = id
-		self.args = args
+		object.__setattr__(self, 'id', id)
+		object.__setattr__(self, 'args', tuple(args))
+		self._freeze()
+
+	def _key(self):
+		return (self.id, self.args)
 
 	def accept(self, visitor):
 		return visitor.visit_funcall(self)
 
 	def __repr__(self):
-		return f"{self.__class__.__name__}({repr(self.id)}, {repr(self.args)})"
+		return f"{self.__class__.__name__}({repr(self.id)}, {repr(list(self.args))})"
 
 class MatDecl(Ast):
 	"""Represents a matrix declaration statement."""
 
+	__slots__ = ('rows',)
+
 	def __init__(self, rows: list):
-		self.rows = rows
+		object.__setattr__(self, 'rows', tuple(tuple(row) for row in rows))
+		self._freeze()
+
+	def _key(self):
+		return self.rows
 
 	def accept(self, visitor):
-		visitor.visit_matdecl(self)
+		return visitor.visit_matdecl(self)
 
 	def __repr__(self):
-		return f"{self.__class__.__name__}({repr(self.rows)})"
+		return f"{self.__class__.__name__}({repr([list(row) for row in self.rows])})"
 
 class Solve(Ast):
 	"""Represents a solve statement."""
 
+	__slots__ = ('assign',)
+
 	def __init__(self, assign: Assign):
-		self.assign = assign
+		object.__setattr__(self, 'assign', assign)
+		self._freeze()
+
+	def _key(self):
+		return (self.assign,)
 
 	def accept(self, visitor):
-		visitor.visit_solve(self)
+		return visitor.visit_solve(self)
 
 	def __repr__(self):
 		return f"{self.__class__.__name__}({repr(self.assign)})"
@@ -1,10 +1,25 @@
 from src.ast import Ast
+from src.dtype import Complex, Matrix
 
 class Constant(Ast):
 	"""Represents a constant value."""
 
+	__slots__ = ('value',)
+
 	def __init__(self, value):
-		self.value = value
+		object.__setattr__(self, 'value', value)
+		self._freeze()
+
+	def _key(self):
+		value = self.value
+		if isinstance(value, float):
+			# repr() tells apart 0.0 and -0.0, and matches nan with itself
+			return (float, repr(value))
+		if isinstance(value, Complex):
+			return (Complex, repr(value.real), repr(value.imag))
+		if isinstance(value, Matrix):
+			return (Matrix, id(value))
+		return (value.__class__, value)
 
 	def accept(self, visitor):
 		return visitor.visit_constant(self)
@@ -16,11 +31,17 @@ class Constant(Ast):
 class Identifier(Ast):
 	"""Represents a function or variable identifier."""
 
+	__slots__ = ('value',)
+
 	def __init__(self, value: str):
-		self.value = value
+		object.__setattr__(self, 'value', value)
+		self._freeze()
+
+	def _key(self):
+		return (self.value,)
 
 	def accept(self, visitor):
-		visitor.visit_identifier(self)
+		return visitor.visit_identifier(self)
 
 	def __repr__(self):
 		value = repr(self.value)
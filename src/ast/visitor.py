@@ -1,9 +1,25 @@
 from abc import ABC, abstractmethod
-from src.ast import Assign, BinaryOp, Command, Constant, FunCall, Identifier, MatDecl, Solve, \
-	UnaryOp
+from src.ast import Assign, BinaryOp, Bind, Command, Constant, FunCall, Identifier, MatDecl, \
+	Solve, UnaryOp
 
 class Visitor(ABC):
-	"""Represents a visitor for the AST."""
+	"""Represents a visitor for the AST.
+
+	Each subclass gets a table mapping the node types to their visit_* handler, so a node
+	is dispatched with a single dictionary lookup and the handler result is returned."""
+
+	handlers = {}
+
+	node_types = (Assign, BinaryOp, Bind, Command, Constant, FunCall, Identifier, MatDecl, Solve,
+		UnaryOp)
+
+	def __init_subclass__(cls, **kwargs):
+		super().__init_subclass__(**kwargs)
+		cls.handlers = {t: getattr(cls, 'visit_' + t.__name__.lower()) for t in cls.node_types}
+
+	def dispatch(self, node):
+		"""Calls the handler of the node and returns its result."""
+		return self.handlers[node.__class__](self, node)
 
 	@abstractmethod
 	def visit_assign(self, assign: Assign) -> None:
@@ -13,6 +29,10 @@ class Visitor(ABC):
 	def visit_binaryop(self, binop: BinaryOp) -> None:
 		pass
 
+	@abstractmethod
+	def visit_bind(self, bind: Bind) -> None:
+		pass
+
 	@abstractmethod
 	def visit_command(self, cmd: Command) -> None:
 		pass
@@ -3,10 +3,10 @@ from src.ast import Ast, RenderVisitor
 from src.cli import Completer
 from src.interpreter import AnalyzerVisitor, Context, EvaluatorVisitor, InterpreterErrorGroup, \
 	RemovedFunctionError
-from src.parser import parse
+from src.parser import INCOMPLETE, ParseCache, ParseSession
 
 class Console():
-	def __init__(self, histfile: str, histsize: int):
+	def __init__(self, histfile: str, histsize: int, cache_size: int = 256, engine: str = 'tree'):
 		readline.parse_and_bind("tab: complete")
 		readline.set_auto_history(False)
 		readline.set_history_length(histsize)
@@ -17,6 +17,9 @@ class Console():
 			except FileNotFoundError:
 				pass
 		self.ctx = Context()
+		self.engine = engine
+		self.session = ParseSession()
+		self.cache = ParseCache(cache_size)
 
 	colors = {
 		'black': '\033[30m',
@@ -40,10 +43,20 @@ class Console():
 
 	def _exec(self, ast: Ast):
 		AnalyzerVisitor(self.ctx).visit(ast)
-		ast = EvaluatorVisitor(self.ctx).visit(ast)
+		ast = EvaluatorVisitor(self.ctx, self.engine).visit(ast)
 		if ast:
 			print(RenderVisitor().visit(ast))
 
+	def _parse(self, line: str):
+		if self.session.pending:
+			return self.session.feed(line + '\n')
+		ast = self.cache.get(line)
+		if ast is None:
+			ast = self.session.feed(line + '\n')
+			if ast is not INCOMPLETE:
+				self.cache.put(line, ast)
+		return ast
+
 	def _print_errors(self, errors: list):
 		for err in errors:
 			if isinstance(err, RemovedFunctionError):
@@ -66,13 +79,12 @@ class Console():
 		readline.set_completer(completer.complete)
 
 	def run(self):
-		buf = ''
 		self._update_completer()
 		while True:
 			line = ''
 			try:
 				if sys.stdin.isatty():
-					prompt = '... ' if buf else '> '
+					prompt = '... ' if self.session.pending else '> '
 				else:
 					prompt = ''
 				line = input(prompt)
@@ -81,12 +93,12 @@ class Console():
 			except EOFError:
 				break
 			readline.add_history(line)
-			buf += line + '\n'
 			try:
-				self._exec(parse(buf))
+				ast = self._parse(line)
+				if ast is INCOMPLETE:
+					continue
+				self._exec(ast)
 				self._update_completer()
-			except EOFError:
-				continue
 			except InterpreterErrorGroup as e:
 				self._print_errors(e.errors)
 			except Exception as e:
@@ -94,5 +106,4 @@ class Console():
 					self._print_errors(e.args[0])
 				else:
 					self._print_errors([e.args[0]])
-			buf = ''
 		self._save_history()
@@ -13,11 +13,13 @@ def implicit_conversion(func):
 	return wrapper
 
 class Complex:
-	"""Represents a complex number."""
+	"""Represents an immutable complex number."""
+
+	__slots__ = ('real', 'imag')
 
 	def __init__(self, real=0, imag=0):
-		self.real = float(real)
-		self.imag = float(imag)
+		object.__setattr__(self, 'real', float(real))
+		object.__setattr__(self, 'imag', float(imag))
 
 	def __abs__(self):
 		return sqrt(self.real ** 2 + self.imag ** 2)
@@ -29,6 +31,15 @@ class Complex:
 			c = Complex(c)
 		return Complex(self.real + c.real, self.imag + c.imag)
 
+	def __copy__(self):
+		return self
+
+	def __deepcopy__(self, memo):
+		return self
+
+	def __delattr__(self, name):
+		raise AttributeError('Complex is immutable')
+
 	def __eq__(self, c):
 		if isinstance(c, Complex):
 			return self.real == c.real and self.imag == c.imag
@@ -97,6 +108,9 @@ class Complex:
 	def __rtruediv__(self, c):
 		return c / self
 
+	def __setattr__(self, name, value):
+		raise AttributeError('Complex is immutable')
+
 	def __str__(self):
 		r, i = [utils.try_cast_as_int(x) for x in [self.real, self.imag]]
 		if r:
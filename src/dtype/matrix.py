@@ -1,4 +1,4 @@
-from copy import deepcopy
+import random
 import src.dtype.complex as dtype
 import src.dtype.utils as utils
 
@@ -6,7 +6,13 @@ class Matrix:
 	pass
 
 class Matrix:
-	"""This class represents a matrix."""
+	"""This class represents a matrix.
+
+	Matrices are immutable, so they are shared by reference instead of being copied: the rows
+	given to the constructor are copied into tuples, and every operation returns a new
+	matrix."""
+
+	__slots__ = ('shape', 'values')
 
 	class InvalidShapeError(ValueError):
 		def __init__(self):
@@ -20,10 +26,37 @@ class Matrix:
 	def identity(n: int, dtype=float):
 		return Matrix([[dtype(i == j) for j in range(n)] for i in range(n)])
 
+	@staticmethod
+	def linspace(a, b, n: int):
+		"""Returns the column vector of n evenly spaced values from a to b included."""
+		if n < 1:
+			raise ValueError('number of values must be positive.')
+		if n == 1:
+			return Matrix([[float(a)]])
+		step = (b - a) / (n - 1)
+		# The last value is b itself, not the sum of the steps which could round off
+		return Matrix([[a + i * step] for i in range(n - 1)] + [[float(b)]])
+
 	@staticmethod
 	def ones(n: int, m: int, dtype=float):
 		return Matrix([[dtype(1) for _ in range(m)] for _ in range(n)])
 
+	@staticmethod
+	def random(n: int, m: int):
+		"""Returns an n by m matrix of values drawn uniformly from [0, 1)."""
+		return Matrix([[random.random() for _ in range(m)] for _ in range(n)])
+
+	@staticmethod
+	def range(a, b, step=1):
+		"""Returns the column vector of the values from a to b excluded, spaced by step."""
+		if step == 0:
+			raise ValueError('step must not be zero.')
+		n = int(-((a - b) // step))
+		if n < 1:
+			raise ValueError('range is empty.')
+		# Values are computed from a, so that float steps do not accumulate rounding errors
+		return Matrix([[a + i * step] for i in range(n)])
+
 	@staticmethod
 	def zeros(n: int, m: int, dtype=float):
 		return Matrix([[dtype(0) for _ in range(m)] for _ in range(n)])
@@ -42,8 +75,8 @@ class Matrix:
 			else:
 				raise ValueError('all elements in the matrix must be of the same type.')
 			values = [[x if isinstance(x, vtype) else vtype(x) for x in r] for r in values]
-		self.shape = (len(values), len(values[0]))
-		self.values = values
+		object.__setattr__(self, 'shape', (len(values), len(values[0])))
+		object.__setattr__(self, 'values', tuple(map(tuple, values)))
 
 	def _do_op(self, m, op):
 		if isinstance(m, Matrix):
@@ -52,13 +85,14 @@ class Matrix:
 			return Matrix([[op(x, y) for x, y in zip(r1, r2)] for r1, r2 in zip(self.values, m.values)])
 		return Matrix([[op(x, m) for x in r] for r in self.values])
 
-	def _rref(self):
-		m = self.values
-		for i in range(self.rows()):
-			for j in range(self.cols()):
+	@staticmethod
+	def _rref(m: list):
+		"""Reduces the given rows to row echelon form in place."""
+		for i in range(len(m)):
+			for j in range(len(m[0])):
 				if m[i][j] != 0:
 					m[i] = [x / m[i][j] for x in m[i]]
-					for k in range(self.rows()):
+					for k in range(len(m)):
 						if k != i:
 							m[k] = [x - y * m[k][j] for x, y in zip(m[k], m[i])]
 					break
@@ -72,20 +106,19 @@ class Matrix:
 	def inverse(self):
 		if self.cols() != self.rows():
 			raise self.NotSquareError
-		a2 = deepcopy(self)
-		id = Matrix.identity(self.rows(), dtype=type(self.values[0][0]))
-		for i in range(a2.rows()):
-			a2.values[i] += id.values[i]
-		a2.shape = (a2.rows(), 2 * a2.cols())
-		a2._rref()
-		for i in range(a2.rows()):
-			a2.values[i] = a2.values[i][a2.cols() // 2:]
-		a2.shape = (a2.rows(), a2.cols() // 2)
-		id2 = self.matmul(a2)
-		if id == id2:
-			return a2
+		n = self.rows()
+		id = Matrix.identity(n, dtype=type(self.values[0][0]))
+		# The reduction works in place on a copy of the rows augmented with the identity
+		m = [r1 + r2 for r1, r2 in zip(self.values, id.values)]
+		Matrix._rref(m)
+		inv = Matrix([r[n:] for r in m])
+		if id == self.matmul(inv):
+			return inv
 		raise ValueError('matrix is not invertible.')
 
+	def map(self, f):
+		return Matrix([[f(x) for x in r] for r in self.values])
+
 	def matmul(self, m):
 		if self.cols() != m.rows():
 			raise self.InvalidShapeError
@@ -97,6 +130,15 @@ class Matrix:
 	def __add__(self, m):
 		return self._do_op(m, lambda x, y: x + y)
 
+	def __copy__(self):
+		return self
+
+	def __deepcopy__(self, memo):
+		return self
+
+	def __delattr__(self, name):
+		raise AttributeError('Matrix is immutable')
+
 	def __eq__(self, m):
 		if not isinstance(m, Matrix) or self.shape != m.shape:
 			return False
@@ -139,7 +181,7 @@ class Matrix:
 		return self + m
 
 	def __repr__(self):
-		return f"Matrix({self.values})"
+		return f"Matrix({list(map(list, self.values))})"
 
 	def __rmul__(self, m):
 		return self * m
@@ -147,6 +189,9 @@ class Matrix:
 	def __rsub__(self, m):
 		return self._do_op(m, lambda x, y: y - x)
 
+	def __setattr__(self, name, value):
+		raise AttributeError('Matrix is immutable')
+
 	def __str__(self):
 		rows = '; '.join('[' + ', '.join(str(e) for e in row) + ']' for row in self.values)
 		return '[' + rows + ']'
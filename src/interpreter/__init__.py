@@ -1,12 +1,20 @@
 from src.interpreter.errors import *
-from src.interpreter.function_storage import FunctionStorage
+from src.interpreter.binding import Binding
+from src.interpreter.builtin import Builtin
+from src.interpreter.call_cache import CallCache
+from src.interpreter.matrix_chain import MatrixChain, chain_names, chain_operands, is_chain, \
+	multiply_chain
+from src.interpreter.function_storage import AnalysisSummary, FunctionStorage
 from src.interpreter.scope import Scope
 from src.interpreter.context import Context
-from src.interpreter.system_commands import ClearCommand, DeleteCommand, HelpCommand, \
-	ShowCommand, SystemCommand, SystemCommandFactory
+from src.interpreter.system_commands import CacheCommand, ClearCommand, DeleteCommand, \
+	ExplainCommand, HelpCommand, ShowCommand, SystemCommand, SystemCommandFactory
 from src.interpreter.equation_solvers import ConstantEquationSolver, EquationSolverFactory, \
 	LinearEquationSolver, QuadraticEquationSolver
 from src.interpreter.dependencies_visitor import DependenciesVisitor
+from src.interpreter.function_compiler import Frame, FunctionCompiler, SymbolicValue, shared_nodes
+from src.interpreter.vm import BINARY_OP, BUILD_MATRIX, CALL, LOAD_CONST, LOAD_NAME, LOAD_SLOT, \
+	MATMUL_CHAIN, UNARY_OP, Code, VirtualMachine, lower
 from src.interpreter.analyzer_visitor import AnalyzerVisitor
 from src.interpreter.polynomial_visitor import PolynomialVisitor
 from src.interpreter.evaluator_visitor import EvaluatorVisitor
@@ -1,14 +1,16 @@
-from inspect import signature
-from src.ast import Assign, Ast, BinaryOp, Constant, FunCall, Identifier, MatDecl, Solve, \
-	UnaryOp, Visitor
-from src.interpreter import AssignExpressionError, BuiltInConstantError, BuiltInFunctionError, \
-	Context, CyclicDependencyError, DependenciesVisitor, FunctionStorage, InterpreterErrorGroup, \
-	InvalidArgumentsLengthError, MultipleDeclarationError, RequireIdentifierError, \
-	TooManyEquationVariablesError, UndefinedFunctionError, UndefinedVariableError, \
-	UnusedParameterError
+from src.ast import Assign, Ast, BinaryOp, Bind, Constant, FunCall, Identifier, MatDecl, \
+	Solve, UnaryOp, Visitor
+from src.interpreter import AnalysisSummary, AssignExpressionError, BuiltInConstantError, \
+	BuiltInFunctionError, Context, CyclicBindingError, CyclicDependencyError, DependenciesVisitor, \
+	FunctionStorage, InterpreterErrorGroup, InvalidArgumentsLengthError, MultipleDeclarationError, \
+	RequireIdentifierError, TooManyEquationVariablesError, UndefinedFunctionError, \
+	UndefinedVariableError, UnusedParameterError
 
 class AnalyzerVisitor(Visitor):
-	"""Performs a semantic analysis of the AST."""
+	"""Performs a semantic analysis of the AST.
+
+	The body of a user-defined function is analyzed once into an AnalysisSummary stored
+	with the function, which call sites check instead of walking the body again."""
 
 	def __init__(self, ctx: Context):
 		self.ctx = ctx
@@ -16,6 +18,9 @@ class AnalyzerVisitor(Visitor):
 		self.detect_unknown_variables = False
 		self.unused_variables = set()
 		self.errors = []
+		self.summarized = None
+		self.free_variables = set()
+		self.dependencies = set()
 
 	def _check_signature(self, args: list):
 		func_args = []
@@ -31,6 +36,59 @@ class AnalyzerVisitor(Visitor):
 				duplicates.add(arg.value)
 		return func_args
 
+	def _check_call(self, id: str, f: FunctionStorage, n_args: int):
+		summary = self._summarize(id, f)
+		if n_args != summary.arity:
+			self._push_error(InvalidArgumentsLengthError, summary.arity, n_args)
+		if self.assign_target_id in summary.dependencies:
+			self._push_error(CyclicDependencyError)
+		self.errors += summary.errors
+		if self.summarized:
+			self.free_variables |= summary.free_variables
+			self.dependencies |= summary.dependencies | {id}
+		elif self.detect_unknown_variables:
+			for var in sorted(summary.free_variables):
+				if not self.ctx.get_global_variable(var):
+					self._push_error(UndefinedVariableError, var)
+
+	def _check_function_argument(self, index: int, arg: Ast):
+		"""Checks an argument naming a function called by a higher-order builtin."""
+		if not isinstance(arg, Identifier):
+			self._push_error(RequireIdentifierError, index)
+			self._visit(arg)
+			return
+		id = arg.value
+		if id == self.assign_target_id:
+			self._push_error(CyclicDependencyError)
+			return
+		f = self.ctx.get_function(id)
+		if not f:
+			self._push_error(UndefinedFunctionError, id)
+			return
+		self.ctx.push_scope(id)
+		if isinstance(f, FunctionStorage):
+			self._check_call(id, f, 1)
+		elif not f.accepts(1):
+			self._push_error(InvalidArgumentsLengthError, f.arity, 1)
+		self.ctx.pop_scope()
+
+	def _is_cyclic(self, id: str, value: Ast):
+		"""Tells whether the binding of the expression to id would depend on itself."""
+		dv = DependenciesVisitor(self.ctx)
+		dv.visit(value)
+		pending = list(dv.visited_variables)
+		seen = set()
+		while pending:
+			source = pending.pop()
+			if source == id:
+				return True
+			if source not in seen:
+				seen.add(source)
+				binding = self.ctx.get_binding(source)
+				if binding:
+					pending += binding.sources
+		return False
+
 	def _push_error(self, error_type: type, *args):
 		self.errors.append(error_type(self.ctx.get_scope(), *args))
 
@@ -40,12 +98,24 @@ class AnalyzerVisitor(Visitor):
 			self.errors = []
 			raise InterpreterErrorGroup(errors)
 
+	def _summarize(self, id: str, f: FunctionStorage):
+		"""Returns the analysis summary of the function, analyzing its body on first use."""
+		if f.summary is None:
+			analyzer = AnalyzerVisitor(self.ctx)
+			analyzer.summarized = f
+			self.ctx.push_scope(id)
+			analyzer._visit(f.body)
+			self.ctx.pop_scope()
+			f.summary = AnalysisSummary(len(f.args), frozenset(analyzer.free_variables),
+				frozenset(analyzer.dependencies), analyzer.errors)
+		return f.summary
+
 	def _visit_function(self, args: list, body: Ast):
 		[self._visit(Assign(arg, Constant(None))) for arg in args]
 		self._visit(body)
 
 	def _visit(self, n):
-		n.accept(self)
+		self.handlers[n.__class__](self, n)
 
 	def visit(self, n):
 		self._visit(n)
@@ -76,8 +146,28 @@ class AnalyzerVisitor(Visitor):
 		self.detect_unknown_variables = old_detect_unknown_variables
 
 	def visit_binaryop(self, binop: BinaryOp):
+		# Left-nested chains such as long sums are walked iteratively
+		rights = []
+		while isinstance(binop.left, BinaryOp):
+			rights.append(binop.right)
+			binop = binop.left
 		self._visit(binop.left)
 		self._visit(binop.right)
+		[self._visit(right) for right in reversed(rights)]
+
+	def visit_bind(self, bind: Bind):
+		old_detect_unknown_variables = self.detect_unknown_variables
+		self.detect_unknown_variables = True
+		target = bind.target
+		if isinstance(target, Identifier):
+			self._visit(bind.value)
+			if self.ctx.is_constant(target.value):
+				self._push_error(BuiltInConstantError, target.value)
+			elif self._is_cyclic(target.value, bind.value):
+				self._push_error(CyclicBindingError, target.value)
+		else:
+			self._push_error(AssignExpressionError)
+		self.detect_unknown_variables = old_detect_unknown_variables
 
 	def visit_command(self, _):
 		pass
@@ -94,23 +184,21 @@ class AnalyzerVisitor(Visitor):
 		f = self.ctx.get_function(id)
 		if not f:
 			self._push_error(UndefinedFunctionError, id)
-		[self._visit(arg) for arg in funcall.args]
+		n = f.functions if f and not isinstance(f, FunctionStorage) else 0
+		[self._check_function_argument(i, arg) for i, arg in enumerate(funcall.args[:n])]
+		[self._visit(arg) for arg in funcall.args[n:]]
 		self.ctx.push_scope(id)
 		if isinstance(f, FunctionStorage):
-			if len(f.args) != len(funcall.args):
-				self._push_error(InvalidArgumentsLengthError, len(f.args), len(funcall.args))
-			self._visit_function(f.args, f.body)
-		elif f:
-			try:
-				sig = signature(f)
-				n_args = len([p for p in sig.parameters.values() if p.default == p.empty])
-			except ValueError:
-				n_args = 1
-			if len(funcall.args) != n_args:
-				self._push_error(InvalidArgumentsLengthError, n_args, len(funcall.args))
+			self._check_call(id, f, len(funcall.args))
+		elif f and not f.accepts(len(funcall.args)):
+			self._push_error(InvalidArgumentsLengthError, f.arity, len(funcall.args))
 		self.ctx.pop_scope()
 
 	def visit_identifier(self, id: Identifier):
+		if self.summarized:
+			if id.value not in self.summarized.slots:
+				self.free_variables.add(id.value)
+			return
 		v = self.ctx.get_variable(id.value)
 		if not v and self.detect_unknown_variables:
 			self._push_error(UndefinedVariableError, id.value)
@@ -0,0 +1,22 @@
+from dataclasses import dataclass, field
+from typing import Callable
+from src.ast import Ast
+
+@dataclass
+class Binding:
+	"""Reactive variable, whose expression is evaluated again when it is read after one of
+	its sources changed.
+
+	Sources are the variables and functions used by the expression. The context marks the
+	binding dirty when one of them is set, and compute is only called on the next read."""
+	value: Ast
+	sources: frozenset
+	compute: Callable = field(compare=False, repr=False)
+	dirty: bool = True
+	result: Ast = field(default=None, compare=False, repr=False)
+
+	def get(self):
+		if self.dirty:
+			self.result = self.compute(self.value)
+			self.dirty = False
+		return self.result
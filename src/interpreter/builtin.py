@@ -0,0 +1,32 @@
+from dataclasses import dataclass
+from typing import Callable
+
+@dataclass(frozen=True)
+class Builtin:
+	"""Descriptor of a built-in function.
+
+	A builtin takes its arity plus up to optional arguments. Each argument must be an
+	instance of its declared types, unless the types are None. A pure builtin returns the
+	same value for the same arguments, so its calls can be computed ahead and memoized.
+
+	The first arguments of a higher-order builtin name functions of one argument, which the
+	builtin receives as Python functions of the argument value."""
+	name: str
+	function: Callable
+	arity: int
+	optional: int = 0
+	types: tuple = None
+	pure: bool = True
+	functions: int = 0
+
+	def accepts(self, n_args: int):
+		return self.arity <= n_args <= self.arity + self.optional
+
+	def __call__(self, *args):
+		if self.types:
+			for i, (arg, types) in enumerate(zip(args, self.types)):
+				if not isinstance(arg, types):
+					expected = ' or '.join(t.__name__ for t in types)
+					raise TypeError(f'{self.name}: argument {i + 1} must be {expected}, '
+						f'not {type(arg).__name__}.')
+		return self.function(*args)
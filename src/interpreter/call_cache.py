@@ -0,0 +1,54 @@
+from collections import OrderedDict
+from src.ast import Ast, Constant
+
+class CallCache:
+	"""Bounded LRU cache mapping the arguments of a user-defined function call to its result.
+
+	Only pure functions are cached, so a result only changes when the function or one of its
+	dependencies is redefined, which clears the cache. A function that becomes impure loses
+	its cache."""
+
+	def __init__(self, maxsize: int = 128):
+		self.maxsize = maxsize
+		self.hits = 0
+		self.misses = 0
+		self.results = OrderedDict()
+
+	@staticmethod
+	def key(args: list):
+		"""Returns the key of the given argument nodes or values."""
+		return tuple(arg if isinstance(arg, Ast) else Constant(arg) for arg in args)
+
+	def clear(self):
+		self.results.clear()
+		self.hits = 0
+		self.misses = 0
+
+	def get(self, key: tuple):
+		"""Returns the cached result of the call or None."""
+		r = self.results.get(key)
+		if r is None:
+			self.misses += 1
+		else:
+			self.hits += 1
+			self.results.move_to_end(key)
+		return r
+
+	def get_hit_rate(self):
+		total = self.hits + self.misses
+		return self.hits / total if total else 0.0
+
+	def invalidate(self):
+		"""Drops the cached results but keeps the statistics."""
+		self.results.clear()
+
+	def put(self, key: tuple, result):
+		if self.maxsize <= 0:
+			return
+		self.results[key] = result
+		self.results.move_to_end(key)
+		while len(self.results) > self.maxsize:
+			self.results.popitem(last=False)
+
+	def __len__(self):
+		return len(self.results)
@@ -1,35 +1,63 @@
 import math
+from types import FunctionType
+from src.ast import Ast, Interner
 from src.dtype import Complex, Matrix
-from src.interpreter import FunctionStorage, Scope
+from src.interpreter import Binding, Builtin, CallCache, FunctionStorage, RemovedFunctionError, \
+	Scope
 
-def matrix_inv(m):
-	if not isinstance(m, Matrix):
-		raise TypeError('matrix inversion is only defined for matrices.')
-	return m.inverse()
+function = (FunctionType,)
+integer = (int,)
+matrix = (Matrix,)
+real = (int, float)
+value = (int, float, Complex, Matrix)
 
-def matrix_transpose(m):
-	if not isinstance(m, Matrix):
-		raise TypeError('matrix transposition is only defined for matrices.')
-	return m.transpose()
+def iterate_function(f, x, n: int):
+	if n < 0:
+		raise ValueError('number of iterations must be non-negative.')
+	for _ in range(n):
+		x = f(x)
+	return x
+
+def map_matrix(f, m: Matrix):
+	return m.map(f)
+
+def prod_function(f, a: int, b: int):
+	r = 1
+	for k in range(a, b + 1):
+		r = r * f(k)
+	return r
+
+def sum_function(f, a: int, b: int):
+	r = 0
+	for k in range(a, b + 1):
+		r = r + f(k)
+	return r
 
 class Context:
 	"""This class is used to store constants, variables, built-in functions and user-defined
 	functions."""
 
-	builtins = {
-		'abs': abs,
-		'cos': math.cos,
-		'exp': math.exp,
-		'identity': Matrix.identity,
-		'inv': matrix_inv,
-		'log': math.log,
-		'ones': Matrix.ones,
-		'sin': math.sin,
-		'sqrt': math.sqrt,
-		'tan': math.tan,
-		'transpose': matrix_transpose,
-		'zeros': Matrix.zeros
-	}
+	builtins = {b.name: b for b in (
+		Builtin('abs', abs, 1),
+		Builtin('cos', math.cos, 1, types=(real,)),
+		Builtin('exp', math.exp, 1, types=(real,)),
+		Builtin('identity', Matrix.identity, 1, types=(integer,)),
+		Builtin('inv', Matrix.inverse, 1, types=(matrix,)),
+		Builtin('iterate', iterate_function, 3, types=(function, value, integer), functions=1),
+		Builtin('linspace', Matrix.linspace, 3, types=(real, real, integer)),
+		Builtin('log', math.log, 1, optional=1, types=(real, real)),
+		Builtin('map', map_matrix, 2, types=(function, matrix), functions=1),
+		Builtin('ones', Matrix.ones, 2, types=(integer, integer)),
+		Builtin('prod', prod_function, 3, types=(function, integer, integer), functions=1),
+		Builtin('rand', Matrix.random, 2, types=(integer, integer), pure=False),
+		Builtin('range', Matrix.range, 2, optional=1, types=(real, real, real)),
+		Builtin('sin', math.sin, 1, types=(real,)),
+		Builtin('sqrt', math.sqrt, 1, types=(real,)),
+		Builtin('sum', sum_function, 3, types=(function, integer, integer), functions=1),
+		Builtin('tan', math.tan, 1, types=(real,)),
+		Builtin('transpose', Matrix.transpose, 1, types=(matrix,)),
+		Builtin('zeros', Matrix.zeros, 2, types=(integer, integer))
+	)}
 
 	constants = {
 		'e': math.e,
@@ -41,7 +69,65 @@ class Context:
 
 	def __init__(self):
 		self.functions = {}
+		self.dependents = {}
+		self.watchers = {}
+		# Orders of the chains of matrix multiplications of the last statement, by chain node
+		self.chains = {}
+		self.interner = Interner()
 		self.scopes = [Scope(None, {})]
+		# Frames of the calls being evaluated, above the scopes, as (id, slots, values) tuples
+		self.frames = []
+
+	def _link(self, id: str, f: FunctionStorage):
+		for dependency in f.dependencies:
+			self.dependents.setdefault(dependency, set()).add(id)
+
+	def _unlink(self, id: str, f: FunctionStorage):
+		for dependency in f.dependencies:
+			dependents = self.dependents[dependency]
+			dependents.discard(id)
+			if not dependents:
+				del self.dependents[dependency]
+
+	def _set_purity(self, id: str):
+		"""Computes whether the function is pure and returns whether it changed."""
+		f = self.functions.get(id)
+		if f is None:
+			return False
+		pure = not f.calls_impure and all(self.is_pure(d) for d in f.dependencies)
+		changed = pure != f.pure
+		f.pure = pure
+		if not pure:
+			# The results of impure functions must not be cached
+			f.cache = None
+		return changed
+
+	def _update_purity(self, id: str):
+		"""Computes whether the function is pure, then updates the functions depending on it,
+		directly or not, whose purity changes."""
+		self._set_purity(id)
+		pending = list(self.dependents.get(id, ()))
+		while pending:
+			dependent = pending.pop()
+			if self._set_purity(dependent):
+				pending += self.dependents.get(dependent, ())
+
+	def _unwatch(self, id: str):
+		binding = self.get_binding(id)
+		if binding:
+			for source in binding.sources:
+				watchers = self.watchers[source]
+				watchers.discard(id)
+				if not watchers:
+					del self.watchers[source]
+
+	def bind(self, id: str, binding: Binding):
+		"""Stores a reactive binding in the global scope."""
+		self._unwatch(id)
+		self.scopes[0].variables[id] = binding
+		for source in binding.sources:
+			self.watchers.setdefault(source, set()).add(id)
+		self.invalidate_bindings(id)
 
 	def get_all_symbols(self):
 		symbols = set(self.builtins.keys())
@@ -50,8 +136,12 @@ class Context:
 		symbols |= {k for k in self.scopes[-1].variables.keys()}
 		return symbols
 
+	def get_binding(self, id: str):
+		value = self.scopes[0].variables.get(id)
+		return value if value.__class__ is Binding else None
+
 	def get_depth(self):
-		return len(self.scopes) - 1
+		return len(self.scopes) - 1 + len(self.frames)
 
 	def get_function(self, id: str):
 		if id in self.functions:
@@ -61,18 +151,71 @@ class Context:
 		return None
 
 	def get_functions_using_dependency(self, dependency_id: str):
-		return {k for k, v in self.functions.items() if dependency_id in v.dependencies}
+		return set(self.dependents.get(dependency_id, ()))
+
+	def get_global_variable(self, id: str):
+		variables = self.scopes[0].variables
+		if id in variables:
+			value = variables[id]
+			return value.get() if value.__class__ is Binding else value
+		return self.constants.get(id)
 
 	def get_scope(self):
-		return self.scopes[-1].id
+		return self.frames[-1][0] if self.frames else self.scopes[-1].id
 
 	def get_variable(self, id: str):
+		if self.frames:
+			# Function bodies only see their parameters and the global scope
+			_, slots, values = self.frames[-1]
+			i = slots.get(id)
+			if i is not None:
+				return values[i]
+			return self.get_global_variable(id)
 		for s in reversed(self.scopes):
 			if id in s.variables:
-				return s.variables[id]
-		if self.is_constant(id):
-			return self.constants[id]
-		return None
+				value = s.variables[id]
+				return value.get() if value.__class__ is Binding else value
+		return self.constants.get(id)
+
+	def invalidate_dependents(self, id: str):
+		"""Drops the analysis summaries and the cached calls of the functions depending on the
+		given one, directly or not."""
+		pending = [id]
+		seen = {id}
+		while pending:
+			for dependent in self.get_functions_using_dependency(pending.pop()):
+				if dependent not in seen:
+					seen.add(dependent)
+					pending.append(dependent)
+					f = self.functions[dependent]
+					f.summary = None
+					if f.cache is not None:
+						f.cache.invalidate()
+
+	def invalidate_bindings(self, id: str):
+		"""Marks the bindings depending on the given variable or function as dirty, directly
+		or not."""
+		pending = [id]
+		seen = {id}
+		while pending:
+			for watcher in self.watchers.get(pending.pop(), ()):
+				if watcher not in seen:
+					seen.add(watcher)
+					pending.append(watcher)
+					self.scopes[0].variables[watcher].dirty = True
+
+	def intern(self, node: Ast):
+		"""Returns the shared node structurally equal to the given one.
+		Nodes no longer used by any function or global variable are dropped once the table
+		has grown past its limit."""
+		node = self.interner.visit(node)
+		if len(self.interner) > self.interner.limit:
+			roots = list(self.scopes[0].variables.values())
+			for f in self.functions.values():
+				roots += f.args
+				roots.append(f.body)
+			self.interner.retain(roots)
+		return node
 
 	def is_builtin(self, id: str):
 		return id in self.builtins
@@ -80,25 +223,79 @@ class Context:
 	def is_constant(self, id: str):
 		return id in self.constants
 
+	def is_pure(self, id: str):
+		"""Tells whether calls to the function can be memoized and computed ahead. Undefined
+		functions are pure, as their calls are left as they are."""
+		f = self.functions.get(id) or self.builtins.get(id)
+		return f is None or f.pure
+
+	def pop_frame(self):
+		self.frames.pop()
+
 	def pop_scope(self):
 		if len(self.scopes) == 1:
 			raise IndexError('cannot pop the global scope.')
 		self.scopes.pop()
 
+	def push_frame(self, id: str, slots: dict, values: list):
+		"""Pushes the frame of a call, the values being ordered as the slots of the function."""
+		self.frames.append((id, slots, values))
+
 	def push_scope(self, id: str):
 		self.scopes.append(Scope(id, {}))
 
+	def remove_function(self, id: str):
+		"""Removes the function and every function depending on it, directly or not.
+		Returns a RemovedFunctionError for each dependent function removed."""
+		errors = []
+		seen = {id}
+		# Depth-first walk, the dependents of a function being removed before it
+		stack = [(id, iter(sorted(self.dependents.get(id, ()))))]
+		while stack:
+			f, dependents = stack[-1]
+			for dependent in dependents:
+				if dependent not in seen:
+					seen.add(dependent)
+					stack.append((dependent, iter(sorted(self.dependents.get(dependent, ())))))
+					break
+			else:
+				stack.pop()
+				self._unlink(f, self.functions.pop(f))
+				self.invalidate_bindings(f)
+				if stack:
+					errors.append(RemovedFunctionError(f, stack[-1][0]))
+		return errors
+
 	def reset_stack(self):
 		self.scopes = self.scopes[:1]
+		self.frames = []
 
 	def set_function(self, id: str, content: FunctionStorage):
+		old = self.functions.get(id)
+		if old is not None:
+			self._unlink(id, old)
+			if old.cache is not None and content.cache is None:
+				content.cache = CallCache(old.cache.maxsize)
 		self.functions[id] = content
+		self._link(id, content)
+		self._update_purity(id)
+		self.invalidate_dependents(id)
+		self.invalidate_bindings(id)
 
 	def set_variable(self, id: str, value):
+		if len(self.scopes) == 1:
+			self._unwatch(id)
+			self.invalidate_bindings(id)
 		self.scopes[-1].variables[id] = value
 
 	def unset_function(self, id: str):
-		self.functions.pop(id)
+		self._unlink(id, self.functions.pop(id))
+		self._update_purity(id)
+		self.invalidate_dependents(id)
+		self.invalidate_bindings(id)
 
 	def unset_variable(self, id: str):
+		if len(self.scopes) == 1:
+			self._unwatch(id)
+			self.invalidate_bindings(id)
 		self.scopes[-1].variables.pop(id)
@@ -1,4 +1,5 @@
-from src.ast import Assign, Ast, BinaryOp, FunCall, Identifier, MatDecl, Solve, UnaryOp, Visitor
+from src.ast import Assign, Ast, BinaryOp, Bind, FunCall, Identifier, MatDecl, Solve, UnaryOp, \
+	Visitor
 from src.interpreter import Context
 
 class DependenciesVisitor(Visitor):
@@ -8,6 +9,12 @@ class DependenciesVisitor(Visitor):
 		self.ctx = ctx
 		self.visited_functions = set()
 		self.visited_variables = set()
+		# Variables given to builtins that only accept real numbers
+		self.real_variables = set()
+
+	def calls_impure_builtin(self):
+		return any(not self.ctx.builtins[x].pure for x in self.visited_functions
+			if self.ctx.is_builtin(x))
 
 	def get_undefined_variables(self):
 		return set(filter(lambda x: not self.ctx.get_variable(x), self.visited_variables))
@@ -16,15 +23,25 @@ class DependenciesVisitor(Visitor):
 		return set(filter(lambda x: not self.ctx.is_builtin(x), self.visited_functions))
 
 	def visit(self, n: Ast):
-		n.accept(self)
+		self.handlers[n.__class__](self, n)
 
 	def visit_assign(self, assign: Assign):
 		self.visit(assign.target)
 		self.visit(assign.value)
 
 	def visit_binaryop(self, binop: BinaryOp):
+		# Left-nested chains such as long sums are walked iteratively
+		rights = []
+		while isinstance(binop.left, BinaryOp):
+			rights.append(binop.right)
+			binop = binop.left
 		self.visit(binop.left)
 		self.visit(binop.right)
+		[self.visit(right) for right in reversed(rights)]
+
+	def visit_bind(self, bind: Bind):
+		self.visit(bind.target)
+		self.visit(bind.value)
 
 	def visit_command(self, _):
 		pass
@@ -34,7 +51,14 @@ class DependenciesVisitor(Visitor):
 
 	def visit_funcall(self, funcall: FunCall):
 		self.visited_functions.add(funcall.id.value)
-		[self.visit(arg) for arg in funcall.args]
+		f = self.ctx.builtins.get(funcall.id.value)
+		n = f.functions if f else 0
+		if f and f.types:
+			for arg, types in zip(funcall.args, f.types):
+				if isinstance(arg, Identifier) and all(t in (int, float) for t in types):
+					self.real_variables.add(arg.value)
+		self.visited_functions.update(arg.value for arg in funcall.args[:n])
+		[self.visit(arg) for arg in funcall.args[n:]]
 
 	def visit_identifier(self, id: Identifier):
 		self.visited_variables.add(id.value)
@@ -30,6 +30,10 @@ class BuiltInFunctionError(InterpreterError):
 	def __init__(self, scope_id: str, id: str):
 		super().__init__(scope_id, f"{id} is a built-in function")
 
+class CyclicBindingError(InterpreterError):
+	def __init__(self, scope_id: str, id: str):
+		super().__init__(scope_id, f"binding {id} depends on itself")
+
 class CyclicDependencyError(InterpreterError):
 	def __init__(self, scope_id: str):
 		super().__init__(scope_id, "call results in an infinite loop")
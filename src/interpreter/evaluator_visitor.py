@@ -1,10 +1,10 @@
-from copy import deepcopy
-from src.ast import Assign, Ast, BinaryOp, Command, Constant, FunCall, Identifier, MatDecl, \
-	Solve, UnaryOp, Visitor
+from src.ast import Assign, Ast, BinaryOp, Bind, Command, Constant, FunCall, Identifier, MatDecl, \
+	Optimizer, Solve, UnaryOp, Visitor
 from src.dtype import Matrix
-from src.interpreter import Context, DependenciesVisitor, EquationSolverFactory, \
-	FunctionStorage, InterpreterErrorGroup, PolynomialVisitor, RemovedFunctionError, \
-	SystemCommandFactory
+from src.interpreter import Binding, Builtin, CallCache, Context, DependenciesVisitor, \
+	EquationSolverFactory, Frame, FunctionCompiler, FunctionStorage, InterpreterErrorGroup, \
+	PolynomialVisitor, SymbolicValue, SystemCommandFactory, VirtualMachine, chain_operands, \
+	is_chain, multiply_chain
 
 def catch_exception(func):
 	def wrapped(self, *args, **kwargs):
@@ -16,118 +16,277 @@ def catch_exception(func):
 	return wrapped
 
 class EvaluatorVisitor(Visitor):
-	"""Evaluates the AST using the given context."""
+	"""Evaluates the AST using the given context.
 
-	def __init__(self, ctx: Context):
+	Results of operations and calls are memoized per scope frame while a statement is
+	evaluated, so a subexpression shared by a hash-consed tree is only computed once. Calls
+	to impure functions, the builtins such as rand and the user-defined functions calling
+	them, are neither memoized nor computed in the body of a definition.
+	User-defined functions called with constant arguments run their compiled body, as do
+	the functions given by name to a higher-order builtin such as map.
+
+	Chains of matrix multiplications such as A ** B ** C are computed in their cheapest order
+	when the shapes of the operands are known, see MatrixChain.
+
+	With the 'vm' engine, expressions are lowered to instructions and run by the
+	VirtualMachine instead of being walked recursively."""
+
+	engines = ('tree', 'vm')
+
+	expression_nodes = (BinaryOp, Constant, FunCall, Identifier, MatDecl, UnaryOp)
+
+	memoized_nodes = (BinaryOp, FunCall, MatDecl, UnaryOp)
+
+	def __init__(self, ctx: Context, engine: str = 'tree'):
+		if engine not in self.engines:
+			raise ValueError(f'unknown engine: {engine}')
 		self.ctx = ctx
+		self.engine = engine
+		self.vm = VirtualMachine(ctx)
 		self.res = None
+		self.compile_functions = True
+		self.expand_functions = True
+		self.depth = 0
+		# Memos of the scope frames, kept between calls and cleared when a frame is popped
+		self.memos = [{}]
+		self.frame = 0
+		self.memo = self.memos[0]
+
+	def _call_compiled(self, f: FunctionStorage, args: list):
+		if f.compiled is None:
+			f.compiled = FunctionCompiler().compile(f)
+		try:
+			return Constant(f.compiled([arg.value for arg in args], self.ctx))
+		except SymbolicValue:
+			return None
+
+	def _call_with_functions(self, funcall: FunCall, f: Builtin):
+		# The functions given by name are not evaluated, the builtin calls their compiled body
+		names = list(funcall.args[:f.functions])
+		args = [self.visit(arg) for arg in funcall.args[f.functions:]]
+		pure = f.pure and all(self.ctx.is_pure(name.value) for name in names)
+		if (pure or self.expand_functions) and all(isinstance(arg, Constant) for arg in args):
+			frame = Frame(self.ctx, [])
+			functions = [frame.function(name.value) for name in names]
+			try:
+				return Constant(f(*functions, *[arg.value for arg in args]))
+			except SymbolicValue:
+				pass
+		return FunCall(funcall.id, names + args)
+
+	def _compute_binding(self, value: Ast):
+		# Bindings live in the global scope, whatever the scope they are read from. The depth
+		# is raised so that the state of the statement being evaluated is kept.
+		ctx = self.ctx
+		scopes, frames = ctx.scopes, ctx.frames
+		expand_functions = self.expand_functions
+		ctx.scopes, ctx.frames = scopes[:1], []
 		self.expand_functions = True
+		self.depth += 1
+		self._push_memo()
+		try:
+			return self.visit(value)
+		finally:
+			self._pop_memo()
+			self.depth -= 1
+			self.expand_functions = expand_functions
+			ctx.scopes, ctx.frames = scopes, frames
+
+	def _multiply_chain(self, bop: BinaryOp):
+		operands = chain_operands(bop)
+		values = [self.visit(operand) for operand in operands]
+		if all(isinstance(value, Constant) for value in values):
+			r = multiply_chain(self.ctx.chains, [value.value for value in values], bop)
+			if r is not None:
+				return Constant(r)
+		# Not a chain of matrices, the values are multiplied from left to right as written
+		r = values[0]
+		for value in values[1:]:
+			if isinstance(r, Constant) and isinstance(value, Constant):
+				r = Constant(BinaryOp.binary_ops['**'](r.value, value.value))
+			else:
+				r = BinaryOp(r, '**', value)
+		return r
+
+	def _pop_frame(self):
+		self.ctx.pop_frame()
+		self._pop_memo()
+
+	def _pop_memo(self):
+		self.memo.clear()
+		self.frame -= 1
+		self.memo = self.memos[self.frame]
 
-	def _remove_functions_with_dependecy(self, dep_id: str):
-		errors = []
-		for id in self.ctx.get_functions_using_dependency(dep_id):
-			errors += self._remove_functions_with_dependecy(id)
-			errors.append(RemovedFunctionError(id, dep_id))
-		self.ctx.unset_function(dep_id)
-		return errors
+	def _pop_scope(self):
+		self.ctx.pop_scope()
+		self._pop_memo()
+
+	def _push_frame(self, id: str, f: FunctionStorage, args: list):
+		self.ctx.push_frame(id, f.slots, args)
+		self._push_memo()
+
+	def _push_memo(self):
+		self.frame += 1
+		if self.frame == len(self.memos):
+			self.memos.append({})
+		self.memo = self.memos[self.frame]
+
+	def _push_scope(self, id: str):
+		self.ctx.push_scope(id)
+		self._push_memo()
 
 	@catch_exception
 	def visit(self, node: Ast):
-		node.accept(self)
-		return self.res
+		if not self.depth and node.__class__ is not Command:
+			self.ctx.chains.clear()
+		if self.engine == 'vm' and isinstance(node, self.expression_nodes):
+			self.res = self.vm.evaluate(node, self.expand_functions)
+			return self.res
+		if not self.depth:
+			self.memos = [{}]
+			self.frame = 0
+			self.memo = self.memos[0]
+		cls = node.__class__
+		memoized = cls in self.memoized_nodes and \
+			(cls is not FunCall or self.ctx.is_pure(node.id.value))
+		r = self.memo.get(node) if memoized else None
+		if r is None:
+			self.depth += 1
+			try:
+				r = self.handlers[cls](self, node)
+			finally:
+				self.depth -= 1
+			if memoized:
+				self.memo[node] = r
+		self.res = r
+		return r
 
 	def visit_assign(self, assign: Assign):
 		target = assign.target
 		if isinstance(target, Identifier):
-			self.res = self.visit(assign.value)
-			self.ctx.set_variable(target.value, self.res)
+			value = self.visit(assign.value)
+			if not self.ctx.get_depth() and not isinstance(value, Constant):
+				value = self.ctx.intern(value)
+			self.ctx.set_variable(target.value, value)
+			self.memo.clear()
+			return value
 		elif isinstance(target, FunCall):
 			id = target.id.value
 			old_expand_functions = self.expand_functions
 			self.expand_functions = False
-			self.ctx.push_scope(id)
+			self._push_scope(id)
 			[self.ctx.set_variable(arg.value, arg) for arg in target.args]
-			self.res = self.visit(assign.value)
-			self.ctx.pop_scope()
+			body = self.visit(assign.value)
+			self._pop_scope()
 			dv = DependenciesVisitor(self.ctx)
-			dv.visit(self.res)
-			fs = FunctionStorage(target.args, self.res, dv.get_user_defined_functions())
+			dv.visit(body)
+			scalars = dv.real_variables & {arg.value for arg in target.args}
+			# User-defined functions may be redefined as impure, so only builtin calls merge
+			pure = {b.name for b in self.ctx.builtins.values() if b.pure and not b.functions}
+			optimizer = Optimizer(scalars=scalars, pure_functions=pure)
+			body = self.ctx.intern(optimizer.optimize(body))
+			fs = FunctionStorage(list(target.args), body, dv.get_user_defined_functions(),
+				dv.calls_impure_builtin())
+			if self.engine == 'tree' and self.compile_functions:
+				fs.compiled = FunctionCompiler().compile(fs)
 			errors = []
 			old_fs = self.ctx.get_function(id)
 			if old_fs and len(old_fs.args) != len(target.args):
-				errors = self._remove_functions_with_dependecy(id)
+				errors = self.ctx.remove_function(id)
 			self.ctx.set_function(id, fs)
 			self.expand_functions = old_expand_functions
 			if errors:
 				raise InterpreterErrorGroup(errors)
+			return body
 
 	def visit_binaryop(self, bop: BinaryOp):
-		bop.left = self.visit(bop.left)
-		bop.right = self.visit(bop.right)
-		self.res = bop
-		if all(isinstance(e, Constant) for e in (bop.left, bop.right)):
-			self.res = Constant(bop.evaluate(bop.left.value, bop.right.value))
-		else:
-			self.res = bop
+		if is_chain(bop):
+			return self._multiply_chain(bop)
+		left = self.visit(bop.left)
+		right = self.visit(bop.right)
+		if isinstance(left, Constant) and isinstance(right, Constant):
+			return Constant(bop.evaluate(left.value, right.value))
+		return BinaryOp(left, bop.op, right)
+
+	def visit_bind(self, bind: Bind):
+		dv = DependenciesVisitor(self.ctx)
+		dv.visit(bind.value)
+		sources = frozenset(dv.visited_variables | dv.get_user_defined_functions())
+		# The expression is computed before binding it, so that a failure leaves nothing bound
+		result = self._compute_binding(bind.value)
+		binding = Binding(bind.value, sources, self._compute_binding, False, result)
+		self.ctx.bind(bind.target.value, binding)
+		self.memo.clear()
+		return result
 
 	def visit_command(self, cmd: Command):
-		self.res = None
 		SystemCommandFactory.create(self.ctx, cmd.args).execute()
+		return None
 
 	def visit_constant(self, constant: Constant):
-		self.res = constant
+		return constant
 
 	def visit_funcall(self, funcall: FunCall):
-		funcall.args = [self.visit(arg) for arg in funcall.args]
 		id = funcall.id.value
 		f = self.ctx.get_function(id)
+		if isinstance(f, Builtin) and f.functions:
+			return self._call_with_functions(funcall, f)
+		args = [self.visit(arg) for arg in funcall.args]
 		if isinstance(f, FunctionStorage):
-			self.ctx.push_scope(id)
-			[self.visit(Assign(name, value)) for name, value in zip(f.args, funcall.args)]
-			self.res = self.visit(deepcopy(f.body))
-			self.ctx.pop_scope()
-			if not self.expand_functions and not isinstance(self.res, Constant):
-				self.res = funcall
-		elif f and all(isinstance(arg, Constant) for arg in funcall.args):
-			self.res = Constant(f(*[arg.value for arg in funcall.args]))
-		else:
-			self.res = funcall
+			if not (f.pure or self.expand_functions):
+				return FunCall(funcall.id, args)
+			constant_args = all(isinstance(arg, Constant) for arg in args)
+			key = CallCache.key(args) if constant_args and f.cache is not None else None
+			r = f.cache.get(key) if key else None
+			if r is not None:
+				return r
+			if self.compile_functions and constant_args:
+				r = self._call_compiled(f, args)
+			if r is None:
+				self._push_frame(id, f, args)
+				r = self.visit(f.body)
+				self._pop_frame()
+			if isinstance(r, Constant):
+				if key:
+					f.cache.put(key, r)
+			elif not self.expand_functions:
+				return FunCall(funcall.id, args)
+			return r
+		elif f and (f.pure or self.expand_functions) and \
+				all(isinstance(arg, Constant) for arg in args):
+			return Constant(f(*[arg.value for arg in args]))
+		return FunCall(funcall.id, args)
 
 	def visit_identifier(self, id: Identifier):
-		r = deepcopy(self.ctx.get_variable(id.value))
-		if r:
-			self.res = r if isinstance(r, Ast) else Constant(r)
-		else:
-			self.res = id
+		r = self.ctx.get_variable(id.value)
+		if r is not None:
+			return r if isinstance(r, Ast) else Constant(r)
+		return id
 
 	def visit_matdecl(self, matdecl: MatDecl):
-		matdecl.rows = [[self.visit(cell) for cell in row] for row in matdecl.rows]
-		if all(isinstance(cell, Constant) for row in matdecl.rows for cell in row):
-			self.res = Constant(Matrix([[cell.value for cell in row] for row in matdecl.rows]))
-		else:
-			self.res = matdecl
+		rows = [[self.visit(cell) for cell in row] for row in matdecl.rows]
+		if all(isinstance(cell, Constant) for row in rows for cell in row):
+			return Constant(Matrix([[cell.value for cell in row] for row in rows]))
+		return MatDecl(rows)
 
 	def visit_solve(self, solve: Solve):
-		assign = solve.assign
-		assign.target = self.visit(assign.target)
-		assign.value = self.visit(assign.value)
+		assign = Assign(self.visit(solve.assign.target), self.visit(solve.assign.value))
 		pv = PolynomialVisitor()
-		p = pv.visit(solve)
+		p = pv.visit(Solve(assign))
 		solver = EquationSolverFactory.create(p)
 		r = solver.solve(p)
 		if isinstance(r, list):
 			r = Matrix([[int(x) if isinstance(x, float) and x % 1 == 0 else x for x in r]])
 		elif isinstance(r, float) and r % 1 == 0:
 			r = int(r)
-		self.res = Constant(r)
+		return Constant(r)
 
 	def visit_unaryop(self, unop: UnaryOp):
-		unop.right = self.visit(unop.right)
-		if isinstance(unop.right, Constant):
-			self.res = Constant(unop.evaluate(unop.right.value))
+		right = self.visit(unop.right)
+		if isinstance(right, Constant):
+			return Constant(unop.evaluate(right.value))
 		elif unop.op == '+':
-			self.res = unop.right
-		elif isinstance(unop.right, UnaryOp):
-			self.res = unop.right.right
-		else:
-			self.res = unop
+			return right
+		elif isinstance(right, UnaryOp):
+			return right.right
+		return UnaryOp(unop.op, right)
@@ -0,0 +1,190 @@
+from src.ast import Ast, BinaryOp, Constant, FunCall, Identifier, MatDecl, UnaryOp, Visitor
+from src.dtype import Matrix
+from src.interpreter import CallCache, Context, FunctionStorage, chain_operands, is_chain, \
+	multiply_chain
+
+class SymbolicValue(Exception):
+	"""Raised by a compiled function when a value is not a constant.
+	The caller must then evaluate the function symbolically."""
+
+def shared_nodes(node: Ast):
+	"""Returns the operations reached more than once from the node, which a hash-consed tree
+	shares between its parents."""
+	seen = set()
+	shared = set()
+	work = [node]
+	while work:
+		node = work.pop()
+		cls = node.__class__
+		if cls is Constant or cls is Identifier:
+			continue
+		if node in seen:
+			shared.add(node)
+			continue
+		seen.add(node)
+		if cls is BinaryOp:
+			work += (node.left, node.right)
+		elif cls is UnaryOp:
+			work.append(node.right)
+		elif cls is FunCall:
+			work += node.args
+		elif cls is MatDecl:
+			work += (cell for row in node.rows for cell in row)
+	return shared
+
+class Frame:
+	"""Argument values of a compiled function call, indexed by the slots of the function.
+	The values of the shared subexpressions of the body are memoized for the call."""
+
+	__slots__ = ('ctx', 'values', 'memo')
+
+	def __init__(self, ctx: Context, values: list, memo: dict = None):
+		self.ctx = ctx
+		self.values = values
+		self.memo = memo
+
+	def call(self, id: str, values: list):
+		f = self.ctx.get_function(id)
+		if isinstance(f, FunctionStorage):
+			if f.compiled is None:
+				f.compiled = FunctionCompiler().compile(f)
+			if f.cache is None:
+				return f.compiled(values, self.ctx)
+			key = CallCache.key(values)
+			r = f.cache.get(key)
+			if r is None:
+				r = Constant(f.compiled(values, self.ctx))
+				f.cache.put(key, r)
+			return r.value
+		elif f:
+			return f(*values)
+		raise SymbolicValue
+
+	def function(self, id: str):
+		"""Returns a Python function computing the calls to the given function from the
+		argument values, with the compiled body of a user-defined function."""
+		f = self.ctx.get_function(id)
+		if isinstance(f, FunctionStorage) and f.cache is None:
+			if f.compiled is None:
+				f.compiled = FunctionCompiler().compile(f)
+			compiled, ctx = f.compiled, self.ctx
+			return lambda *values: compiled(values, ctx)
+		return lambda *values: self.call(id, list(values))
+
+	def get_variable(self, id: str):
+		r = self.ctx.get_global_variable(id)
+		if r is None or (isinstance(r, Ast) and not isinstance(r, Constant)):
+			raise SymbolicValue
+		return r.value if isinstance(r, Constant) else r
+
+class FunctionCompiler(Visitor):
+	"""Compiles the body of a user-defined function to nested Python closures.
+
+	The compiled function takes the argument values and the context and returns the value
+	of the body. Parameters are read from their slot, free variables are looked up in the
+	global scope and called functions in the context at call time. A subexpression shared by
+	the hash-consed body is compiled once and computed once per call."""
+
+	def __init__(self):
+		self.slots = {}
+		self.shared = set()
+		self.closures = {}
+
+	def _memoize(self, node: Ast, closure):
+		# Calls to impure builtins are computed every time
+		id = node.id.value if node.__class__ is FunCall else None
+
+		def memoized(frame: Frame):
+			r = frame.memo.get(node)
+			if r is None:
+				r = closure(frame)
+				if id is None or frame.ctx.is_pure(id):
+					frame.memo[node] = r
+			return r
+		return memoized
+
+	def _compile_chain(self, binop: BinaryOp):
+		operands = [self.visit(operand) for operand in chain_operands(binop)]
+		matmul = BinaryOp.binary_ops['**']
+
+		def chain(frame: Frame):
+			values = [operand(frame) for operand in operands]
+			r = multiply_chain(frame.ctx.chains, values, binop)
+			if r is None:
+				# Not a chain of matrices, the multiplications raise the usual errors
+				r = values[0]
+				for value in values[1:]:
+					r = matmul(r, value)
+			return r
+		return chain
+
+	def compile(self, f: FunctionStorage):
+		self.slots = f.slots
+		self.shared = shared_nodes(f.body)
+		self.closures = {}
+		body = self.visit(f.body)
+		memoized = bool(self.shared)
+
+		def function(values: list, ctx: Context):
+			return body(Frame(ctx, values, {} if memoized else None))
+		return function
+
+	def visit(self, node: Ast):
+		if node not in self.shared:
+			return self.handlers[node.__class__](self, node)
+		closure = self.closures.get(node)
+		if closure is None:
+			closure = self._memoize(node, self.handlers[node.__class__](self, node))
+			self.closures[node] = closure
+		return closure
+
+	def visit_assign(self, _):
+		raise TypeError('cannot compile an assignment.')
+
+	def visit_binaryop(self, binop: BinaryOp):
+		if is_chain(binop):
+			return self._compile_chain(binop)
+		left = self.visit(binop.left)
+		right = self.visit(binop.right)
+		op = BinaryOp.binary_ops[binop.op]
+		return lambda frame: op(left(frame), right(frame))
+
+	def visit_bind(self, _):
+		raise TypeError('cannot compile a binding.')
+
+	def visit_command(self, _):
+		raise TypeError('cannot compile a command.')
+
+	def visit_constant(self, constant: Constant):
+		value = constant.value
+		return lambda _: value
+
+	def visit_funcall(self, funcall: FunCall):
+		id = funcall.id.value
+		f = Context.builtins.get(id)
+		n = f.functions if f else 0
+		names = [arg.value for arg in funcall.args[:n]]
+		args = [self.visit(arg) for arg in funcall.args[n:]]
+		if names:
+			return lambda frame: frame.call(id,
+				[frame.function(name) for name in names] + [arg(frame) for arg in args])
+		return lambda frame: frame.call(id, [arg(frame) for arg in args])
+
+	def visit_identifier(self, id: Identifier):
+		name = id.value
+		if name in self.slots:
+			i = self.slots[name]
+			return lambda frame: frame.values[i]
+		return lambda frame: frame.get_variable(name)
+
+	def visit_matdecl(self, matdecl: MatDecl):
+		rows = [[self.visit(cell) for cell in row] for row in matdecl.rows]
+		return lambda frame: Matrix([[cell(frame) for cell in row] for row in rows])
+
+	def visit_solve(self, _):
+		raise TypeError('cannot compile an equation.')
+
+	def visit_unaryop(self, unop: UnaryOp):
+		right = self.visit(unop.right)
+		op = UnaryOp.unary_ops[unop.op]
+		return lambda frame: op(right(frame))
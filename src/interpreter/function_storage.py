@@ -1,8 +1,30 @@
 from dataclasses import dataclass, field
 from src.ast import Ast
 
+@dataclass
+class AnalysisSummary:
+	"""Semantic analysis of a function body, checked at each call site instead of the body.
+	Free variables and dependencies include those of the functions called, transitively."""
+	arity: int
+	free_variables: frozenset
+	dependencies: frozenset
+	errors: list
+
 @dataclass
 class FunctionStorage:
+	"""A user-defined function. It is pure unless its body calls an impure builtin or a
+	function which is not pure, which Context keeps up to date as functions are redefined."""
 	args: list
 	body: Ast
 	dependencies: set = field(default_factory=set)
+	calls_impure: bool = False
+	pure: bool = field(default=True, init=False, compare=False, repr=False)
+	compiled: object = field(default=None, compare=False, repr=False)
+	code: object = field(default=None, compare=False, repr=False)
+	cache: object = field(default=None, compare=False, repr=False)
+	summary: AnalysisSummary = field(default=None, compare=False, repr=False)
+	slots: dict = field(init=False, compare=False, repr=False)
+
+	def __post_init__(self):
+		# Parameters are resolved to the index of their value in the call frame
+		self.slots = {arg.value: i for i, arg in enumerate(self.args)}
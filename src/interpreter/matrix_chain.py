@@ -0,0 +1,111 @@
+from dataclasses import dataclass
+from src.ast import Ast, BinaryOp, Constant, RenderVisitor
+from src.dtype import Matrix
+
+class ChainRenderVisitor(RenderVisitor):
+	"""Renders the operands of a chain, the inlined matrices being labeled by their shape and
+	their number in the chain instead of their values."""
+
+	def __init__(self):
+		super().__init__()
+		self.matrices = 0
+
+	def visit_constant(self, constant: Constant):
+		if constant.value.__class__ is not Matrix:
+			return super().visit_constant(constant)
+		self.matrices += 1
+		n, m = constant.value.shape
+		return f'[{n}x{m}]#{self.matrices}'
+
+def chain_names(operands: list):
+	"""Returns the names of the operands as they are rendered, binary operations being put in
+	parentheses."""
+	renderer = ChainRenderVisitor()
+	names = []
+	for operand in operands:
+		if operand.__class__ is BinaryOp:
+			names.append(f'({renderer.visit(operand)})')
+		else:
+			names.append(renderer.visit(operand))
+	return tuple(names)
+
+def chain_operands(node: BinaryOp):
+	"""Returns the operands of the left-nested chain of matrix multiplications at the node.
+	Operands in parentheses on the right, as in A ** (B ** C), are kept as they are."""
+	operands = [node.right]
+	while node.left.__class__ is BinaryOp and node.left.op == '**':
+		node = node.left
+		operands.append(node.right)
+	operands.append(node.left)
+	operands.reverse()
+	return operands
+
+def is_chain(node: Ast):
+	"""Tells whether the node multiplies at least three matrices."""
+	return node.__class__ is BinaryOp and node.op == '**' and \
+		node.left.__class__ is BinaryOp and node.left.op == '**'
+
+@dataclass
+class MatrixChain:
+	"""Cheapest order of the multiplications of a chain of matrices.
+
+	The order is found by dynamic programming over the shapes of the matrices, the cost being
+	the number of scalar multiplications. The product of the matrices i to j is split after
+	the matrix split[i][j]."""
+	names: tuple
+	shapes: tuple
+	cost: int
+	split: list
+
+	@classmethod
+	def order(cls, names: tuple, shapes: tuple):
+		n = len(shapes)
+		dims = [shapes[0][0]] + [shape[1] for shape in shapes]
+		cost = [[0] * n for _ in range(n)]
+		split = [[i] * n for i in range(n)]
+		for length in range(1, n):
+			for i in range(n - length):
+				j = i + length
+				# Later splits are tried first, so that ties keep the left to right order
+				for k in range(j - 1, i - 1, -1):
+					c = cost[i][k] + cost[k + 1][j] + dims[i] * dims[k + 1] * dims[j + 1]
+					if k == j - 1 or c < cost[i][j]:
+						cost[i][j] = c
+						split[i][j] = k
+		return cls(names, shapes, cost[0][n - 1], split)
+
+	def get_left_to_right_cost(self):
+		rows = self.shapes[0][0]
+		return sum(rows * shape[0] * shape[1] for shape in self.shapes[1:])
+
+	def multiply(self, matrices: list):
+		def product(i: int, j: int):
+			if i == j:
+				return matrices[i]
+			k = self.split[i][j]
+			return product(i, k).matmul(product(k + 1, j))
+		return product(0, len(matrices) - 1)
+
+	def render(self):
+		def render(i: int, j: int, nested: bool):
+			if i == j:
+				return self.names[i]
+			k = self.split[i][j]
+			r = f'{render(i, k, False)} ** {render(k + 1, j, True)}'
+			return f'({r})' if nested else r
+		return render(0, len(self.names) - 1, False)
+
+def multiply_chain(chains: dict, values: list, node: BinaryOp):
+	"""Multiplies the values of the operands of the chain at the node in the cheapest order,
+	which is recorded in chains by node. Returns None unless the values are matrices of
+	matching shapes."""
+	if any(value.__class__ is not Matrix for value in values):
+		return None
+	shapes = tuple(value.shape for value in values)
+	if any(a[1] != b[0] for a, b in zip(shapes, shapes[1:])):
+		return None
+	chain = chains.get(node)
+	if chain is None or chain.shapes != shapes:
+		chain = MatrixChain.order(chain_names(chain_operands(node)), shapes)
+		chains[node] = chain
+	return chain.multiply(values)
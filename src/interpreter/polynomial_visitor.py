@@ -17,7 +17,7 @@ class PolynomialVisitor(Visitor):
 		self.stack = []
 
 	def visit(self, node: Ast):
-		node.accept(self)
+		self.handlers[node.__class__](self, node)
 		return self.res
 
 	def visit_assign(self, assign: Assign):
@@ -55,6 +55,9 @@ class PolynomialVisitor(Visitor):
 			return
 		raise InvalidPolynomialError
 
+	def visit_bind(self, _):
+		raise InvalidPolynomialError
+
 	def visit_command(self, _):
 		raise InvalidPolynomialError
 
@@ -75,7 +78,7 @@ class PolynomialVisitor(Visitor):
 		raise InvalidPolynomialError
 
 	def visit_solve(self, solve: Solve):
-		solve.assign.accept(self)
+		self.visit(solve.assign)
 
 	def visit_unaryop(self, unop: UnaryOp):
 		self.visit(unop.right)
@@ -2,5 +2,7 @@ from dataclasses import dataclass
 
 @dataclass
 class Scope:
+	"""A scope holds its variables by name. The frames of function calls are not scopes,
+	see Context.push_frame."""
 	id: str
 	variables: dict
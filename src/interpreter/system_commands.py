@@ -1,8 +1,8 @@
 import os
 from abc import ABC, abstractmethod
 from src.ast import RenderVisitor
-from src.interpreter import CommandError, Context, InterpreterErrorGroup, InvalidCommandError, \
-	RemovedFunctionError
+from src.interpreter import Binding, CallCache, CommandError, Context, FunctionStorage, \
+	InterpreterErrorGroup, InvalidCommandError
 
 class SystemCommand(ABC):
 	"""Abstract class for system commands."""
@@ -16,6 +16,67 @@ class SystemCommand(ABC):
 		"""Execute the command."""
 		pass
 
+class CacheCommand(SystemCommand):
+	"""This command shows or configures the memoization of user-defined function calls."""
+
+	def __init__(self, ctx: Context, args: list):
+		super().__init__(ctx, args)
+
+	def _get_function(self, name: str):
+		f = self.ctx.get_function(name)
+		if not isinstance(f, FunctionStorage):
+			raise CommandError('cache', f'undefined function: {name}')
+		return f
+
+	def _clear(self):
+		if len(self.args) > 2:
+			raise CommandError('cache', 'invalid number of arguments')
+		if len(self.args) == 2:
+			functions = [self._get_function(self.args[1])]
+		else:
+			functions = self.ctx.functions.values()
+		[f.cache.clear() for f in functions if f.cache is not None]
+
+	def _disable(self):
+		if len(self.args) != 2:
+			raise CommandError('cache', 'invalid number of arguments')
+		self._get_function(self.args[1]).cache = None
+
+	def _enable(self):
+		if len(self.args) not in (2, 3):
+			raise CommandError('cache', 'invalid number of arguments')
+		f = self._get_function(self.args[1])
+		if not f.pure:
+			raise CommandError('cache', f'impure function: {self.args[1]}')
+		maxsize = 128
+		if len(self.args) == 3:
+			if not self.args[2].isdigit():
+				raise CommandError('cache', f'invalid size: {self.args[2]}')
+			maxsize = int(self.args[2])
+		f.cache = CallCache(maxsize)
+
+	def _show(self):
+		if len(self.args) > 1:
+			raise CommandError('cache', 'invalid number of arguments')
+		caches = {id: f.cache for id, f in self.ctx.functions.items() if f.cache is not None}
+		if not caches:
+			print('No function calls are cached.')
+		for id, cache in caches.items():
+			print(f'{id}: {cache.hits} hits, {cache.misses} misses '
+				f'({cache.get_hit_rate():.1%} hit rate), {len(cache)}/{cache.maxsize} entries')
+
+	def execute(self):
+		actions = {
+			'clear': self._clear,
+			'disable': self._disable,
+			'enable': self._enable,
+			'show': self._show
+		}
+		action = self.args[0] if self.args else 'show'
+		if action not in actions:
+			raise CommandError('cache', 'invalid argument')
+		actions[action]()
+
 class ClearCommand(SystemCommand):
 	"""This command clears the screen."""
 
@@ -31,14 +92,6 @@ class DeleteCommand(SystemCommand):
 	def __init__(self, ctx: Context, args: list):
 		super().__init__(ctx, args)
 
-	def _remove_functions_with_dependecy(self, dep_id: str):
-		errors = []
-		for id in self.ctx.get_functions_using_dependency(dep_id):
-			errors += self._remove_functions_with_dependecy(id)
-			errors.append(RemovedFunctionError(id, dep_id))
-		self.ctx.unset_function(dep_id)
-		return errors
-
 	def execute(self):
 		if len(self.args) != 2:
 			raise CommandError('delete', 'invalid number of arguments')
@@ -48,7 +101,7 @@ class DeleteCommand(SystemCommand):
 				raise CommandError('delete', f'cannot delete built-in function: {name}')
 			if not self.ctx.get_function(name):
 				raise CommandError('delete', f'undefined function: {name}')
-			errors = self._remove_functions_with_dependecy(name)
+			errors = self.ctx.remove_function(name)
 			if errors:
 				raise InterpreterErrorGroup(errors)
 		elif id_type == 'variable':
@@ -60,13 +113,34 @@ class DeleteCommand(SystemCommand):
 		else:
 			raise CommandError('delete', f'invalid identifier type: {id_type}')
 
+class ExplainCommand(SystemCommand):
+	"""This command shows the order of the chains of matrix multiplications of the last
+	statement."""
+
+	def __init__(self, ctx: Context, args: list):
+		super().__init__(ctx, args)
+
+	def execute(self):
+		if self.args:
+			raise CommandError('explain', 'invalid number of arguments')
+		if not self.ctx.chains:
+			print('No chains of matrix multiplications in the last statement.')
+		for chain in self.ctx.chains.values():
+			shapes = dict(zip(chain.names, chain.shapes))
+			shapes = ', '.join(f'{name}: {n}x{m}' for name, (n, m) in shapes.items())
+			print(f'{chain.render()} with {shapes}')
+			print(f'cost: {chain.cost} multiplications instead of '
+				f'{chain.get_left_to_right_cost()} from left to right')
 
 class HelpCommand(SystemCommand):
 	"""This command shows a help message."""
 
 	commands_help = {
+		'cache': ['Show or configure the memoization of user-defined function calls.',
+			'[show|enable <function> [size]|disable <function>|clear [function]]'],
 		'clear': ['Clear the screen.', ''],
 		'delete': ['Delete a function or a variable.', '<function|variable> <name>'],
+		'explain': ['Show the order of the matrix multiplications of the last statement.', ''],
 		'help': ['Show a help message.', '[command]'],
 		'show': ['Show stored functions and/or variables.', '[all|functions|variables]']
 	}
@@ -113,7 +187,11 @@ class ShowCommand(SystemCommand):
 		if not variables:
 			print('No variables stored.')
 		else:
-			[print(f'{id} = {RenderVisitor().visit(val)}') for id, val in variables.items()]
+			for id, val in variables.items():
+				if isinstance(val, Binding):
+					print(f'{id} := {RenderVisitor().visit(val.value)}')
+				else:
+					print(f'{id} = {RenderVisitor().visit(val)}')
 
 	def _show_all(self):
 		self._show_functions()
@@ -138,8 +216,10 @@ class SystemCommandFactory():
 	"""Factory for creating system commands."""
 
 	commands = {
+		'cache': CacheCommand,
 		'clear': ClearCommand,
 		'delete': DeleteCommand,
+		'explain': ExplainCommand,
 		'help': HelpCommand,
 		'show': ShowCommand
 	}
@@ -0,0 +1,251 @@
+import time
+from dataclasses import dataclass
+from src.ast import Ast, BinaryOp, Constant, FunCall, Identifier, MatDecl, UnaryOp
+from src.dtype import Matrix
+from src.interpreter import CallCache, Context, Frame, FunctionStorage, SymbolicValue, \
+	chain_operands, is_chain, multiply_chain, shared_nodes
+
+LOAD_CONST = 0
+LOAD_SLOT = 1
+LOAD_NAME = 2
+BINARY_OP = 3
+UNARY_OP = 4
+CALL = 5
+BUILD_MATRIX = 6
+MATMUL_CHAIN = 7
+
+opnames = ('LOAD_CONST', 'LOAD_SLOT', 'LOAD_NAME', 'BINARY_OP', 'UNARY_OP', 'CALL',
+	'BUILD_MATRIX', 'MATMUL_CHAIN')
+
+@dataclass
+class Code:
+	"""Instructions of a lowered expression.
+	Each instruction is an (opcode, argument) pair, names are the identifiers of the slots.
+	The argument of a CALL holds the call node when the call is shared by the tree, so that
+	its result is memoized for the frame. The argument of a MATMUL_CHAIN holds the chain node,
+	which keys its order, and the number of operands."""
+	instructions: list
+	names: tuple = ()
+
+def lower(node: Ast, names: tuple = ()):
+	"""Lowers an expression into instructions for the virtual machine.
+	The tree is walked with an explicit stack so that deep expressions do not recurse."""
+	slots = {name: i for i, name in enumerate(names)}
+	shared = shared_nodes(node)
+	instructions = []
+	work = [(node, False)]
+	while work:
+		node, children_done = work.pop()
+		cls = node.__class__
+		if cls is Constant:
+			instructions.append((LOAD_CONST, node.value))
+		elif cls is Identifier:
+			if node.value in slots:
+				instructions.append((LOAD_SLOT, slots[node.value]))
+			else:
+				instructions.append((LOAD_NAME, node.value))
+		elif children_done:
+			if is_chain(node):
+				instructions.append((MATMUL_CHAIN, (node, len(chain_operands(node)))))
+			elif cls is BinaryOp:
+				instructions.append((BINARY_OP, (node.op, BinaryOp.binary_ops[node.op])))
+			elif cls is UnaryOp:
+				instructions.append((UNARY_OP, (node.op, UnaryOp.unary_ops[node.op])))
+			elif cls is FunCall:
+				instructions.append((CALL, (node.id, len(node.args), node if node in shared else None)))
+			else:
+				instructions.append((BUILD_MATRIX, tuple(len(row) for row in node.rows)))
+		elif is_chain(node):
+			work.append((node, True))
+			work += ((operand, False) for operand in reversed(chain_operands(node)))
+		elif cls is BinaryOp:
+			work += ((node, True), (node.right, False), (node.left, False))
+		elif cls is UnaryOp:
+			work += ((node, True), (node.right, False))
+		elif cls is FunCall:
+			work.append((node, True))
+			# The names of the functions given to a higher-order builtin are loaded as constants
+			f = Context.builtins.get(node.id.value)
+			n = f.functions if f else 0
+			work += ((arg, False) for arg in reversed(node.args[n:]))
+			work += ((Constant(arg.value), False) for arg in reversed(node.args[:n]))
+		elif cls is MatDecl:
+			work.append((node, True))
+			work += ((cell, False) for row in reversed(node.rows) for cell in reversed(row))
+		else:
+			raise TypeError(f'cannot lower {cls.__name__}.')
+	return Code(instructions, tuple(names))
+
+# Checking the exact class is much cheaper than isinstance() against the Ast ABC
+ast_types = frozenset((BinaryOp, Constant, FunCall, Identifier, MatDecl, UnaryOp))
+
+def to_ast(value):
+	return value if value.__class__ in ast_types else Constant(value)
+
+class VirtualMachine:
+	"""Stack-based interpreter for lowered expressions.
+
+	Values on the stack are either plain values or AST nodes for symbolic results, which are
+	built the same way as the EvaluatorVisitor does. Calls to user-defined functions push a
+	frame instead of recursing, and the results of shared calls are memoized per frame."""
+
+	def __init__(self, ctx: Context):
+		self.ctx = ctx
+		self.profiling = False
+		self.stats = {}
+
+	def _code(self, f: FunctionStorage):
+		if f.code is None:
+			f.code = lower(f.body, tuple(arg.value for arg in f.args))
+		return f.code
+
+	def _call_with_functions(self, id: Identifier, f, args: list, expand_functions: bool):
+		names, values = args[:f.functions], args[f.functions:]
+		pure = f.pure and all(self.ctx.is_pure(name) for name in names)
+		if (pure or expand_functions) and not any(a.__class__ in ast_types for a in values):
+			frame = Frame(self.ctx, [])
+			try:
+				return f(*[frame.function(name) for name in names], *values)
+			except SymbolicValue:
+				pass
+		return FunCall(id, [Identifier(name) for name in names] + [to_ast(a) for a in values])
+
+	def _load_name(self, id: str, frames: list):
+		# Names in a function body are not parameters, which are lowered to slots
+		r = self.ctx.get_global_variable(id) if frames else self.ctx.get_variable(id)
+		if r is None:
+			return Identifier(id)
+		if isinstance(r, Constant):
+			return r.value
+		return r
+
+	def evaluate(self, node: Ast, expand_functions: bool = True):
+		"""Evaluates an expression and returns the resulting AST node."""
+		return to_ast(self.run(lower(node), expand_functions=expand_functions))
+
+	def run(self, code: Code, slots: list = None, expand_functions: bool = True):
+		"""Runs the code with the given slot values and returns the value left on the stack."""
+		frames = []
+		slots = slots or []
+		memo = None
+		instructions = code.instructions
+		stack = []
+		pc = 0
+		profiling = self.profiling
+		while True:
+			if pc == len(instructions):
+				r = stack.pop()
+				if not frames:
+					return r
+				code, slots, instructions, stack, pc, id, args, cache, key, memo, node = frames.pop()
+				if r.__class__ not in ast_types:
+					if key:
+						cache.put(key, Constant(r))
+				elif not expand_functions:
+					r = FunCall(id, [to_ast(arg) for arg in args])
+				if node is not None:
+					if memo is None:
+						memo = {}
+					memo[node] = r
+				stack.append(r)
+				continue
+			opcode, arg = instructions[pc]
+			pc += 1
+			if profiling:
+				start = time.perf_counter()
+			if opcode == LOAD_CONST:
+				stack.append(arg)
+			elif opcode == LOAD_SLOT:
+				stack.append(slots[arg])
+			elif opcode == BINARY_OP:
+				right = stack.pop()
+				left = stack.pop()
+				if left.__class__ in ast_types or right.__class__ in ast_types:
+					stack.append(BinaryOp(to_ast(left), arg[0], to_ast(right)))
+				else:
+					stack.append(arg[1](left, right))
+			elif opcode == LOAD_NAME:
+				stack.append(self._load_name(arg, frames))
+			elif opcode == UNARY_OP:
+				right = stack.pop()
+				if right.__class__ not in ast_types:
+					stack.append(arg[1](right))
+				elif arg[0] == '+':
+					stack.append(right)
+				elif isinstance(right, UnaryOp):
+					stack.append(right.right)
+				else:
+					stack.append(UnaryOp(arg[0], right))
+			elif opcode == CALL:
+				id, n, node = arg
+				args = stack[len(stack) - n:]
+				del stack[len(stack) - n:]
+				r = memo.get(node) if memo and node is not None else None
+				if r is not None:
+					stack.append(r)
+					continue
+				f = self.ctx.get_function(id.value)
+				if isinstance(f, FunctionStorage) and (f.pure or expand_functions):
+					key = None
+					if f.cache is not None and not any(a.__class__ in ast_types for a in args):
+						key = CallCache.key(args)
+						r = f.cache.get(key)
+						if r is not None:
+							stack.append(r.value)
+							continue
+					# The results of impure functions are not memoized
+					frames.append((code, slots, instructions, stack, pc, id, args, f.cache, key,
+						memo, node if f.pure else None))
+					code = self._code(f)
+					slots = args
+					instructions = code.instructions
+					stack = []
+					pc = 0
+					memo = None
+				else:
+					if isinstance(f, FunctionStorage):
+						# Impure functions are not computed in the body of a definition
+						r = FunCall(id, [to_ast(a) for a in args])
+					elif f and f.functions:
+						r = self._call_with_functions(id, f, args, expand_functions)
+					elif f and (f.pure or expand_functions) and \
+							not any(a.__class__ in ast_types for a in args):
+						r = f(*args)
+					else:
+						r = FunCall(id, [to_ast(a) for a in args])
+					if node is not None and self.ctx.is_pure(id.value):
+						if memo is None:
+							memo = {}
+						memo[node] = r
+					stack.append(r)
+			elif opcode == BUILD_MATRIX:
+				n = sum(arg)
+				cells = stack[len(stack) - n:]
+				del stack[len(stack) - n:]
+				if any(cell.__class__ in ast_types for cell in cells):
+					cells = [to_ast(cell) for cell in cells]
+				rows, i = [], 0
+				for length in arg:
+					rows.append(cells[i:i + length])
+					i += length
+				if cells and cells[0].__class__ in ast_types:
+					stack.append(MatDecl(rows))
+				else:
+					stack.append(Matrix(rows))
+			elif opcode == MATMUL_CHAIN:
+				node, n = arg
+				values = stack[len(stack) - n:]
+				del stack[len(stack) - n:]
+				r = multiply_chain(self.ctx.chains, values, node)
+				if r is None:
+					r = values[0]
+					for value in values[1:]:
+						if r.__class__ in ast_types or value.__class__ in ast_types:
+							r = BinaryOp(to_ast(r), '**', to_ast(value))
+						else:
+							r = BinaryOp.binary_ops['**'](r, value)
+				stack.append(r)
+			if profiling:
+				stat = self.stats.setdefault(opnames[opcode], [0, 0.0])
+				stat[0] += 1
+				stat[1] += time.perf_counter() - start
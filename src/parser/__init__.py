@@ -1,2 +1,7 @@
-from src.parser.lexer import lexer, reset_lexer, tokenize, tokens
-from src.parser.parser import associativity_dict, parser, parse, precedence_dict
+from src.parser.lexer import Token, iter_tokens, lexer, tokenize, tokens
+from src.parser.parser import associativity_dict, parser, precedence_dict
+from src.parser.pratt import PrattParser
+from src.parser.pool import Parser, ParserPool, parse, parser_pool
+from src.parser.session import INCOMPLETE, Incomplete, ParseSession
+from src.parser.cache import ParseCache
+from src.parser.script import ScriptStatement, parse_script
@@ -0,0 +1,63 @@
+import re
+from collections import OrderedDict
+from threading import Lock
+from src.ast import Ast
+from src.parser.pool import parse
+
+class ParseCache:
+	"""Bounded LRU cache mapping the normalized source of a statement to its AST.
+
+	The visitors never modify the statements they visit, so the same AST can be handed out to
+	every caller. Statements that fail to parse are not cached."""
+
+	whitespace_regex = re.compile(r'[^\S\r\n]+')
+
+	def __init__(self, maxsize: int = 256):
+		self.maxsize = maxsize
+		self.hits = 0
+		self.misses = 0
+		self.lock = Lock()
+		self.statements = OrderedDict()
+
+	@staticmethod
+	def normalize(s: str):
+		"""Collapses the horizontal whitespaces, which are not significant between tokens."""
+		return ParseCache.whitespace_regex.sub(' ', s).strip()
+
+	def clear(self):
+		with self.lock:
+			self.statements.clear()
+			self.hits = 0
+			self.misses = 0
+
+	def get(self, s: str):
+		"""Returns the cached AST of the statement or None."""
+		key = self.normalize(s)
+		with self.lock:
+			stmt = self.statements.get(key)
+			if stmt is None:
+				self.misses += 1
+			else:
+				self.hits += 1
+				self.statements.move_to_end(key)
+			return stmt
+
+	def parse(self, s: str, backend: str = 'ply'):
+		stmt = self.get(s)
+		if stmt is None:
+			stmt = parse(s, backend)
+			self.put(s, stmt)
+		return stmt
+
+	def put(self, s: str, stmt: Ast):
+		if self.maxsize <= 0:
+			return
+		key = self.normalize(s)
+		with self.lock:
+			self.statements[key] = stmt
+			self.statements.move_to_end(key)
+			while len(self.statements) > self.maxsize:
+				self.statements.popitem(last=False)
+
+	def __len__(self):
+		return len(self.statements)
@@ -5,6 +5,7 @@ tokens = [
 	# Simple tokens
 		# Operators
 	'ADD',
+	'BIND',
 	'DIV',
 	'EQUALS',
 	'MATMUL',
@@ -30,6 +31,7 @@ tokens = [
 # Regular expression rules for simple tokens
 	# Operators
 t_ADD = r'\+'
+t_BIND = r':='
 t_DIV = r'\/'
 t_EQUALS = r'='
 t_MATMUL = r'\*\*'
@@ -71,21 +73,42 @@ def t_newline(t):
 
 # Error handling rule
 def t_error(t):
-	raise SyntaxError("illegal character '%s' on line %d" % (t.value[0], t.lineno))
+	e = SyntaxError("illegal character '%s' on line %d" % (t.value[0], t.lineno))
+	e.span = (t.lexpos, t.lexpos + 1)
+	raise e
 
-# Build the lexer
+# Build the lexer, it is used as a template and cloned for each input
 lexer = lex.lex()
 
-def reset_lexer():
-	lexer.lineno = 1
+class Token:
+	"""Represents a token and its span [start, end) in the source."""
 
-def tokenize(contents):
-	reset_lexer()
-	lexer.input(contents)
-	tokens = []
+	__slots__ = ('type', 'value', 'lineno', 'start', 'end', 'lexer')
+
+	def __init__(self, type: str, value, lineno: int, start: int, end: int):
+		self.type = type
+		self.value = value
+		self.lineno = lineno
+		self.start = start
+		self.end = end
+
+	def __repr__(self):
+		return f"{self.__class__.__name__}({self.type!r}, {self.value!r}, {self.lineno}, " \
+			f"{self.start}, {self.end})"
+
+def iter_tokens(contents: str, start: int = 0, lineno: int = 1, l=None):
+	"""Lazily yields the tokens of contents, starting at the given offset and line number.
+	A clone of the template lexer is used unless another lexer is given."""
+	l = l or lexer.clone()
+	l.input(contents)
+	l.lexpos = start
+	l.lineno = lineno
+	next_token = l.token
 	while True:
-		token = lexer.token()
-		if not token:
-			break
-		tokens.append(token)
-	return tokens
+		t = next_token()
+		if not t:
+			return
+		yield Token(t.type, t.value, t.lineno, t.lexpos, l.lexpos)
+
+def tokenize(contents):
+	return list(iter_tokens(contents))
@@ -1,6 +1,8 @@
+import glob, hashlib, os
 import ply.yacc as yacc
-from src.parser import reset_lexer, tokens
+from src.parser import tokens
 from src import ast
+from src.dtype import Matrix
 
 precedence = (
 	('left', 'ADD', 'SUB'),
@@ -13,9 +15,33 @@ precedence = (
 associativity_dict = { token: e[0] for e in precedence for token in e[1:] }
 precedence_dict = { token: i for i, e in enumerate(precedence) for token in e[1:] }
 
+def literal_value(cell: ast.Ast):
+	"""Returns the value of a number literal, optionally signed, or None for any other
+	expression."""
+	if isinstance(cell, ast.Constant):
+		return cell.value
+	if isinstance(cell, ast.UnaryOp) and isinstance(cell.right, ast.Constant):
+		return cell.evaluate(cell.right.value)
+	return None
+
+def make_mat_decl(rows: list):
+	"""Builds the matrix directly when all its cells are number literals, so that it is
+	never visited cell by cell."""
+	n = len(rows[0])
+	values = []
+	for row in rows:
+		if len(row) != n:
+			return ast.MatDecl(rows)
+		values_row = [literal_value(cell) for cell in row]
+		if None in values_row:
+			return ast.MatDecl(rows)
+		values.append(values_row)
+	return ast.Constant(Matrix(values))
+
 def p_statement(p):
 	'''statement : eval
 		| assign
+		| bind
 		| solve
 		| cmd'''
 	p[0] = p[1]
@@ -71,7 +97,7 @@ def p_signed_expr(p):
 
 def p_mat_decl(p):
 	'''mat_decl : LBRACKET mat_decl_rows RBRACKET'''
-	p[0] = ast.MatDecl(p[2])
+	p[0] = make_mat_decl(p[2])
 
 def p_mat_decl_rows(p):
 	'''mat_decl_rows : mat_decl_row'''
@@ -103,6 +129,10 @@ def p_assign(p):
 	'''assign : expr EQUALS expr'''
 	p[0] = ast.Assign(p[1], p[3])
 
+def p_bind(p):
+	'''bind : expr BIND expr'''
+	p[0] = ast.Bind(p[1], p[3])
+
 def p_solve(p):
 	'''solve : assign QMARK'''
 	p[0] = ast.Solve(p[1])
@@ -112,7 +142,7 @@ def p_cmd(p):
 	p[0] = ast.Command(p[2])
 
 def p_cmd_args(p):
-	'''cmd_args : cmd_arg'''
+	'''cmd_args : ID'''
 	p[0] = [p[1]]
 
 def p_cmd_args_append(p):
@@ -121,19 +151,77 @@ def p_cmd_args_append(p):
 	p[0].append(p[2])
 
 def p_cmd_arg(p):
-	'''cmd_arg : ID'''
-	p[0] = p[1]
+	'''cmd_arg : ID
+		| INT'''
+	p[0] = str(p[1])
 
 # Error rule for syntax errors
 def p_error(p):
 	if not p:
 		raise EOFError("unexpected end of file")
-	raise SyntaxError("syntax error near unexpected token '%s' on line %d" % (p.value, p.lineno))
-
-parser = yacc.yacc()
-
-def parse(s: str):
-	if hasattr(parser, 'statestack'):
-		parser.restart()
-	reset_lexer()
-	return parser.parse(s)
+	e = SyntaxError("syntax error near unexpected token '%s' on line %d" % (p.value, p.lineno))
+	e.span = (p.start, p.end)
+	raise e
+
+def get_tables_dir():
+	"""Returns the directory where the parse tables are cached.
+	It can be overridden with the COMPUTORV2_CACHE_DIR environment variable."""
+	cache_dir = os.environ.get('COMPUTORV2_CACHE_DIR')
+	if not cache_dir:
+		xdg_cache = os.environ.get('XDG_CACHE_HOME') or os.path.join('~', '.cache')
+		cache_dir = os.path.join(os.path.expanduser(xdg_cache), 'computorv2')
+	return os.path.join(cache_dir, f'ply-{yacc.__version__}')
+
+def get_tables_path():
+	"""Returns the path of the parse tables matching the current grammar."""
+	pinfo = yacc.ParserReflect(globals(), log=yacc.NullLogger())
+	pinfo.get_all()
+	grammar_hash = hashlib.sha256(pinfo.signature().encode()).hexdigest()[:16]
+	return os.path.join(get_tables_dir(), f'parsetab-{grammar_hash}.pickle')
+
+def prune_tables(path: str, keep: int = 8):
+	"""Removes the least recently used parse tables beyond the given count.
+	Several checkouts may share the cache with different grammars, so the tables of the other
+	grammars are kept as long as they are used."""
+	paths = glob.glob(os.path.join(os.path.dirname(path), 'parsetab-*.pickle'))
+	paths = sorted((p for p in paths if p != path), key=os.path.getmtime, reverse=True)
+	for old_path in paths[keep - 1:]:
+		try:
+			os.remove(old_path)
+		except OSError:
+			pass
+
+def build_parser():
+	"""Loads the parse tables from the cache, generating them once if they are missing.
+	Tables are written to a temporary file first so that concurrent processes never read a
+	partial file. Loading tables marks them as recently used, and only the most recently
+	used tables are kept."""
+	path = get_tables_path()
+	options = { 'debug': False, 'optimize': True, 'errorlog': yacc.NullLogger() }
+	if os.path.exists(path):
+		try:
+			os.utime(path)
+		except OSError:
+			pass
+		return yacc.yacc(picklefile=path, **options)
+	tmp_path = f'{path}.{os.getpid()}.tmp'
+	try:
+		os.makedirs(os.path.dirname(path), exist_ok=True)
+	except OSError:
+		pass
+	try:
+		p = yacc.yacc(picklefile=tmp_path, **options)
+		try:
+			os.replace(tmp_path, path)
+			prune_tables(path)
+		except OSError:
+			pass
+	finally:
+		try:
+			os.remove(tmp_path)
+		except OSError:
+			pass
+	return p
+
+# Template sharing the read-only parse tables, it is copied by each Parser instance.
+parser = build_parser()
@@ -0,0 +1,63 @@
+from collections import deque
+from contextlib import contextmanager
+from copy import copy
+from src.parser.lexer import iter_tokens, lexer
+from src.parser.parser import parser
+from src.parser.pratt import PrattParser
+
+class Parser:
+	"""Parses statements with its own lexer and parser state.
+	Distinct instances can be used from different threads at the same time."""
+
+	backends = ('ply', 'pratt')
+
+	def __init__(self):
+		self.lexer = lexer.clone()
+		self.lr_parser = copy(parser)
+		self.pratt_parser = PrattParser()
+
+	def parse(self, s: str, backend: str = 'ply'):
+		"""Parses a statement using either the PLY grammar ('ply') or the hand-written parser
+		('pratt')."""
+		if backend == 'pratt':
+			return self.pratt_parser.parse(s)
+		if backend != 'ply':
+			raise ValueError(f'unknown parser backend: {backend}')
+		tokens = iter_tokens(s, l=self.lexer)
+		return self.lr_parser.parse(lexer=self.lexer, tokenfunc=lambda: next(tokens, None))
+
+class ParserPool:
+	"""Keeps idle Parser instances to be reused by the next callers.
+	A new parser is created when all of them are in use, so callers never wait on each
+	other."""
+
+	def __init__(self, maxsize: int = 8):
+		self.maxsize = maxsize
+		self.idle = deque()
+
+	def acquire(self):
+		try:
+			return self.idle.pop()
+		except IndexError:
+			return Parser()
+
+	@contextmanager
+	def get(self):
+		p = self.acquire()
+		try:
+			yield p
+		finally:
+			self.release(p)
+
+	def parse(self, s: str, backend: str = 'ply'):
+		with self.get() as p:
+			return p.parse(s, backend)
+
+	def release(self, p: Parser):
+		if len(self.idle) < self.maxsize:
+			self.idle.append(p)
+
+parser_pool = ParserPool()
+
+def parse(s: str, backend: str = 'ply'):
+	return parser_pool.parse(s, backend)
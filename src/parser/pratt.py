@@ -0,0 +1,139 @@
+from src.parser.parser import associativity_dict, make_mat_decl, p_error, precedence_dict
+from src.parser.lexer import iter_tokens, lexer
+from src import ast
+
+class PrattParser:
+	"""Hand-written recursive descent parser using precedence climbing for expressions.
+
+	It accepts the same language as the PLY grammar, builds the same AST and reports syntax
+	errors on the same tokens."""
+
+	binary_ops = {
+		'ADD': '+',
+		'DIV': '/',
+		'MATMUL': '**',
+		'MOD': '%',
+		'MUL': '*',
+		'POW': '^',
+		'SUB': '-'
+	}
+
+	unary_ops = {
+		'ADD': '+',
+		'SUB': '-'
+	}
+
+	def __init__(self):
+		self.lexer = lexer.clone()
+		self.tokens = None
+		self.token = None
+
+	def _advance(self):
+		token = self.token
+		self.token = next(self.tokens, None)
+		return token
+
+	def _expect(self, type: str):
+		if self._type() != type:
+			p_error(self.token)
+		return self._advance()
+
+	def _type(self):
+		return self.token.type if self.token else '$end'
+
+	def _expr(self, min_precedence: int):
+		left = self._prefix()
+		while self._type() in self.binary_ops:
+			type = self._type()
+			precedence = precedence_dict[type]
+			if precedence < min_precedence:
+				break
+			self._advance()
+			if associativity_dict[type] == 'left':
+				precedence += 1
+			left = ast.BinaryOp(left, self.binary_ops[type], self._expr(precedence))
+		return left
+
+	def _expr_list(self):
+		exprs = [self._expr(0)]
+		while self._type() == 'COMMA':
+			self._advance()
+			exprs.append(self._expr(0))
+		return exprs
+
+	def _implicit_mul(self, left: ast.Ast):
+		if self._type() != 'ID':
+			return left
+		return ast.BinaryOp(left, '*', ast.Identifier(self._advance().value.lower()))
+
+	def _mat_decl(self):
+		self._advance()
+		rows = [self._mat_decl_row()]
+		while self._type() == 'SEMICOL':
+			self._advance()
+			rows.append(self._mat_decl_row())
+		self._expect('RBRACKET')
+		return make_mat_decl(rows)
+
+	def _mat_decl_row(self):
+		self._expect('LBRACKET')
+		row = self._expr_list()
+		self._expect('RBRACKET')
+		return row
+
+	def _prefix(self):
+		type = self._type()
+		if type in ('FLOAT', 'INT'):
+			return self._implicit_mul(ast.Constant(self._advance().value))
+		elif type == 'ID':
+			id = ast.Identifier(self._advance().value.lower())
+			if self._type() != 'LPAREN':
+				return id
+			self._advance()
+			args = self._expr_list()
+			self._expect('RPAREN')
+			return ast.FunCall(id, args)
+		elif type == 'LBRACKET':
+			return self._implicit_mul(self._mat_decl())
+		elif type == 'LPAREN':
+			self._advance()
+			expr = self._expr(0)
+			self._expect('RPAREN')
+			return expr
+		elif type in self.unary_ops:
+			self._advance()
+			precedence = precedence_dict['U' + type]
+			return ast.UnaryOp(self.unary_ops[type], self._expr(precedence))
+		p_error(self.token)
+
+	def _statement(self):
+		if self._type() == 'MOD':
+			self._advance()
+			args = [self._expect('ID').value]
+			while self._type() in ('ID', 'INT'):
+				args.append(str(self._advance().value))
+			return ast.Command(args)
+		stmt = self._expr(0)
+		if self._type() == 'BIND':
+			self._advance()
+			return ast.Bind(stmt, self._expr(0))
+		if self._type() != 'EQUALS':
+			return stmt
+		self._advance()
+		if self._type() == 'QMARK':
+			self._advance()
+			return stmt
+		stmt = ast.Assign(stmt, self._expr(0))
+		if self._type() == 'QMARK':
+			self._advance()
+			stmt = ast.Solve(stmt)
+		return stmt
+
+	def parse(self, s: str):
+		self.tokens = iter_tokens(s, l=self.lexer)
+		self.token = None
+		self._advance()
+		stmt = self._statement()
+		if self.token:
+			p_error(self.token)
+		return stmt
@@ -0,0 +1,62 @@
+from dataclasses import dataclass
+from src.ast import Ast
+from src.parser.lexer import iter_tokens, lexer
+from src.parser.session import INCOMPLETE, ParseSession
+
+@dataclass
+class ScriptStatement:
+	ast: Ast
+	start_line: int
+	end_line: int
+	error: Exception = None
+
+def _skip_line(l, text: str):
+	"""Moves the lexer to the end of the current line."""
+	end = text.find('\n', l.lexpos)
+	l.lexpos = len(text) if end < 0 else end
+
+def parse_script(text: str):
+	"""Parses a whole script in a single pass over its tokens.
+
+	A statement ends on the first line where the tokens read so far form a complete
+	statement, like in the interactive console. A syntax error discards the rest of the line
+	and the statement being parsed, then parsing resumes on the next line.
+	Returns the list of parsed statements, in order, with their line spans."""
+	statements = []
+	session = ParseSession()
+	l = lexer.clone()
+	tokens = iter_tokens(text, l=l)
+	start_line = end_line = None
+	while True:
+		try:
+			token = next(tokens, None)
+		except SyntaxError as e:
+			line = l.lineno
+			statements.append(ScriptStatement(None, start_line or line, line, e))
+			_skip_line(l, text)
+			tokens = iter_tokens(text, l.lexpos, l.lineno, l)
+			session.reset()
+			start_line = end_line = None
+			continue
+		if end_line is not None and (not token or token.lineno != end_line):
+			stmt = session.finish()
+			if stmt is not INCOMPLETE:
+				statements.append(ScriptStatement(stmt, start_line, end_line))
+				start_line = None
+		if not token:
+			break
+		if start_line is None:
+			start_line = token.lineno
+		end_line = token.lineno
+		try:
+			session.push(token)
+		except Exception as e:
+			statements.append(ScriptStatement(None, start_line, end_line, e))
+			_skip_line(l, text)
+			tokens = iter_tokens(text, l.lexpos, l.lineno, l)
+			session.reset()
+			start_line = end_line = None
+	if start_line is not None:
+		error = EOFError('unexpected end of file')
+		statements.append(ScriptStatement(None, start_line, end_line, error))
+	return statements
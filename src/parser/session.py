@@ -0,0 +1,113 @@
+from ply.yacc import YaccProduction, YaccSymbol
+from src.parser.lexer import iter_tokens, lexer
+from src.parser.parser import p_error, parser
+
+class Incomplete:
+	"""Result of a parse session waiting for more input."""
+
+	def __repr__(self):
+		return 'INCOMPLETE'
+
+INCOMPLETE = Incomplete()
+
+class ParseSession:
+	"""Resumable LALR parse that keeps the lexer and parser state between fed lines.
+
+	Each call to feed() only lexes and shifts the new tokens, so a statement written on
+	several lines is parsed in linear time."""
+
+	def __init__(self):
+		self.lexer = lexer.clone()
+		self.reset()
+
+	def _accepts_end(self):
+		"""Check without side effects if the end of input would complete the statement."""
+		states = self.statestack[:]
+		while True:
+			state = states[-1]
+			t = parser.defaulted_states.get(state)
+			if t is None:
+				t = parser.action[state].get('$end')
+			if t is None or t > 0:
+				return False
+			if t == 0:
+				return True
+			p = parser.productions[-t]
+			if p.len:
+				del states[-p.len:]
+			states.append(parser.goto[states[-1]][p.name])
+
+	def _reduce(self, n: int):
+		p = parser.productions[n]
+		sym = YaccSymbol()
+		sym.type = p.name
+		sym.value = None
+		if p.len:
+			targ = self.symstack[-p.len - 1:]
+			targ[0] = sym
+		else:
+			targ = [sym]
+		self.pslice.slice = targ
+		p.callable(self.pslice)
+		if p.len:
+			del self.symstack[-p.len:]
+			del self.statestack[-p.len:]
+		self.symstack.append(sym)
+		self.statestack.append(parser.goto[self.statestack[-1]][p.name])
+
+	def _shift(self, token):
+		while True:
+			state = self.statestack[-1]
+			t = parser.defaulted_states.get(state)
+			if t is None:
+				t = parser.action[state].get(token.type)
+			if t is None:
+				p_error(token if token.type != '$end' else None)
+			if t > 0:
+				self.statestack.append(t)
+				self.symstack.append(token)
+				return None
+			if t == 0:
+				return self.symstack[-1].value
+			self._reduce(-t)
+
+	def feed(self, text: str):
+		"""Parse a new chunk of input.
+		Returns the statement if it is complete, INCOMPLETE otherwise."""
+		self.pending = True
+		try:
+			for token in iter_tokens(text, lineno=self.lexer.lineno, l=self.lexer):
+				self.push(token)
+			return self.finish()
+		except Exception:
+			self.reset()
+			raise
+
+	def finish(self):
+		"""Complete the statement if the input received so far is a valid one.
+		Returns the statement or INCOMPLETE."""
+		if not self._accepts_end():
+			return INCOMPLETE
+		end = YaccSymbol()
+		end.type = '$end'
+		try:
+			return self._shift(end)
+		finally:
+			self.reset()
+
+	def push(self, token):
+		"""Shift a single token into the session."""
+		self.pending = True
+		self._shift(token)
+
+	def reset(self):
+		"""Discard the statement being parsed."""
+		self.lexer.lineno = 1
+		self.pending = False
+		start = YaccSymbol()
+		start.type = '$end'
+		self.statestack = [0]
+		self.symstack = [start]
+		self.pslice = YaccProduction(None, self.symstack)
+		self.pslice.lexer = self.lexer
+		self.pslice.parser = parser
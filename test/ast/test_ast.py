@@ -64,6 +64,16 @@ class TestAst(unittest.TestCase):
 		self.assertEqual(repr(Constant(1)), "Constant(1)")
 		self.assertEqual(repr(Constant(1.5)), "Constant(1.5)")
 
+	def test_equality(self):
+		a = BinaryOp(Identifier('x'), '+', FunCall(Identifier('f'), [Constant(1)]))
+		b = BinaryOp(Identifier('x'), '+', FunCall(Identifier('f'), [Constant(1)]))
+		self.assertEqual(a, b)
+		self.assertEqual(hash(a), hash(b))
+		self.assertNotEqual(a, BinaryOp(Identifier('x'), '-', FunCall(Identifier('f'), [Constant(1)])))
+		self.assertNotEqual(Constant(1), Constant(1.0))
+		self.assertNotEqual(Constant(1), Identifier('1'))
+		self.assertEqual(len({a, b, Identifier('x')}), 2)
+
 	def test_funcall(self):
 		self.assertEqual(repr(FunCall(Identifier('f'), [Constant(1)])),
 			"FunCall(Identifier('f'), [Constant(1)])")
@@ -74,6 +84,17 @@ class TestAst(unittest.TestCase):
 		self.assertEqual(repr(Identifier('x')), "Identifier('x')")
 		self.assertEqual(repr(Identifier('abc')), "Identifier('abc')")
 
+	def test_immutable(self):
+		node = BinaryOp(Constant(1), '+', Constant(2))
+		with self.assertRaises(AttributeError):
+			node.left = Constant(3)
+		with self.assertRaises(AttributeError):
+			node.other = 1
+		with self.assertRaises(AttributeError):
+			del node.op
+		self.assertFalse(hasattr(node, '__dict__'))
+		self.assertIsInstance(FunCall(Identifier('f'), [Constant(1)]).args, tuple)
+
 	def test_matdecl(self):
 		self.assertEqual(repr(MatDecl([[Constant(1), Constant(2)]])),
 			"MatDecl([[Constant(1), Constant(2)]])")
@@ -0,0 +1,43 @@
+import unittest
+from src.ast import BinaryOp, Constant, FunCall, Identifier, Interner, MatDecl, UnaryOp
+
+class TestInterner(unittest.TestCase):
+	"""This class contains tests for the AST interner."""
+
+	def setUp(self):
+		self.interner = Interner()
+
+	def _square(self):
+		x1 = BinaryOp(Identifier('x'), '+', Constant(1))
+		return BinaryOp(x1, '*', BinaryOp(Identifier('x'), '+', Constant(1)))
+
+	def test_shared_subtrees(self):
+		node = self.interner.visit(self._square())
+		self.assertEqual(node, self._square())
+		self.assertIs(node.left, node.right)
+		self.assertIs(node.left.left, self.interner.visit(Identifier('x')))
+		self.assertEqual(len(self.interner), 4)
+
+	def test_same_node(self):
+		a = self.interner.visit(self._square())
+		b = self.interner.visit(self._square())
+		self.assertIs(a, b)
+		self.assertIs(self.interner.visit(UnaryOp('-', a)).right, a)
+
+	def test_distinct_constants(self):
+		a = self.interner.visit(Constant(1))
+		b = self.interner.visit(Constant(1.0))
+		self.assertIsNot(a, b)
+		self.assertIsInstance(b.value, float)
+
+	def test_nested_nodes(self):
+		node = self.interner.visit(FunCall(Identifier('f'),
+			[MatDecl([[Identifier('x'), Constant(2)]]), Identifier('x')]))
+		self.assertIs(node.args[0].rows[0][0], node.args[1])
+
+	def test_retain(self):
+		kept = self.interner.visit(BinaryOp(Identifier('a'), '+', Constant(1)))
+		self.interner.visit(self._square())
+		self.interner.retain([kept, 42])
+		self.assertEqual(len(self.interner), 3)
+		self.assertIs(self.interner.visit(Identifier('a')), kept.left)
@@ -0,0 +1,96 @@
+import unittest
+from src.ast import BinaryOp, Constant, FunCall, Identifier, MatDecl, Optimizer, UnaryOp
+
+x = Identifier('x')
+y = Identifier('y')
+
+class TestOptimizer(unittest.TestCase):
+	"""This class contains tests for the AST optimizer."""
+
+	def setUp(self):
+		self.optimizer = Optimizer()
+		self.scalar_optimizer = Optimizer(scalars={'x'})
+
+	def _assert_optimized(self, node, expected, optimizer=None):
+		self.assertEqual((optimizer or self.optimizer).optimize(node), expected)
+
+	def test_add(self):
+		self._assert_optimized(BinaryOp(x, '+', Constant(0)), BinaryOp(x, '+', Constant(0)))
+		self._assert_optimized(BinaryOp(Constant(0), '+', x), BinaryOp(Constant(0), '+', x))
+		self._assert_optimized(BinaryOp(x, '+', x), BinaryOp(Constant(2), '*', x))
+		self._assert_optimized(BinaryOp(x, '+', Constant(0.0)), BinaryOp(x, '+', Constant(0.0)))
+
+	def test_add_calls(self):
+		sin = FunCall(Identifier('sin'), [x])
+		rand = FunCall(Identifier('rand'), [Constant(1), Constant(1)])
+		optimizer = Optimizer(pure_functions={'sin'})
+		self._assert_optimized(BinaryOp(sin, '+', sin), BinaryOp(sin, '+', sin))
+		self._assert_optimized(BinaryOp(sin, '+', sin), BinaryOp(Constant(2), '*', sin), optimizer)
+		self._assert_optimized(BinaryOp(rand, '+', rand), BinaryOp(rand, '+', rand), optimizer)
+		node = UnaryOp('-', FunCall(Identifier('sin'), [MatDecl([[rand]])]))
+		self._assert_optimized(BinaryOp(node, '+', node), BinaryOp(node, '+', node), optimizer)
+
+	def test_constant(self):
+		self._assert_optimized(BinaryOp(Constant(2), '+', Constant(3)), Constant(5))
+		self._assert_optimized(UnaryOp('-', BinaryOp(Constant(2), '*', Constant(3))), Constant(-6))
+
+	def test_div(self):
+		self._assert_optimized(BinaryOp(x, '/', Constant(1)), BinaryOp(x, '/', Constant(1)))
+		self._assert_optimized(BinaryOp(x, '/', x), BinaryOp(x, '/', x), self.scalar_optimizer)
+
+	def test_fixpoint(self):
+		node = BinaryOp(BinaryOp(x, '*', Constant(1)), '+', BinaryOp(x, '-', Constant(0)))
+		self._assert_optimized(node, BinaryOp(Constant(2), '*', x))
+		node = UnaryOp('-', UnaryOp('+', UnaryOp('-', BinaryOp(y, '^', Constant(1)))))
+		self._assert_optimized(node, BinaryOp(y, '^', Constant(1)))
+		self._assert_optimized(node, y, Optimizer(scalars={'y'}))
+
+	def test_long_sum(self):
+		node = y
+		for _ in range(2999):
+			node = BinaryOp(node, '+', y)
+		node = self.optimizer.optimize(node)
+		terms = 0
+		while node.op == '+':
+			self.assertIs(node.right, y)
+			node, terms = node.left, terms + 1
+		self.assertEqual((node, terms), (BinaryOp(Constant(2), '*', y), 2998))
+
+	def test_mul(self):
+		self._assert_optimized(BinaryOp(Constant(1), '*', x), x)
+		self._assert_optimized(BinaryOp(x, '*', Constant(1)), x)
+		self._assert_optimized(BinaryOp(x, '*', x), BinaryOp(x, '*', x))
+		self._assert_optimized(BinaryOp(x, '*', x), BinaryOp(x, '*', x), self.scalar_optimizer)
+		self._assert_optimized(BinaryOp(Constant(0), '*', x), BinaryOp(Constant(0), '*', x),
+			self.scalar_optimizer)
+
+	def test_nested_nodes(self):
+		node = FunCall(Identifier('f'), [MatDecl([[BinaryOp(x, '-', Constant(0))]]),
+			UnaryOp('+', y)])
+		self._assert_optimized(node, FunCall(Identifier('f'), [MatDecl([[x]]), y]))
+
+	def test_pow(self):
+		self._assert_optimized(BinaryOp(x, '^', Constant(1)), BinaryOp(x, '^', Constant(1)))
+		self._assert_optimized(BinaryOp(x, '^', Constant(1)), x, self.scalar_optimizer)
+		self._assert_optimized(BinaryOp(x, '^', Constant(1)), x, Optimizer(assume_scalars=True))
+		self._assert_optimized(BinaryOp(BinaryOp(x, '**', y), '^', Constant(1)),
+			BinaryOp(BinaryOp(x, '**', y), '^', Constant(1)), Optimizer(scalars={'x', 'y'}))
+		self._assert_optimized(BinaryOp(x, '^', Constant(0)), BinaryOp(x, '^', Constant(0)),
+			self.scalar_optimizer)
+
+	def test_rules_index(self):
+		self.assertNotIn('%', self.optimizer.index)
+		self.assertNotIn('/', self.optimizer.index)
+		self.assertEqual(len(self.optimizer.index['*']), 1)
+		self.assertEqual(len(self.optimizer.index['^']), 1)
+
+	def test_sub(self):
+		self._assert_optimized(BinaryOp(x, '-', Constant(0)), x)
+		self._assert_optimized(BinaryOp(Constant(0), '-', x), BinaryOp(Constant(0), '-', x))
+		self._assert_optimized(BinaryOp(x, '-', Constant(0.0)), BinaryOp(x, '-', Constant(0.0)))
+		self._assert_optimized(BinaryOp(x, '-', x), BinaryOp(x, '-', x), self.scalar_optimizer)
+
+	def test_unary(self):
+		self._assert_optimized(UnaryOp('+', x), x)
+		self._assert_optimized(UnaryOp('-', UnaryOp('-', x)), x)
+		self._assert_optimized(UnaryOp('-', x), UnaryOp('-', x))
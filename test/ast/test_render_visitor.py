@@ -22,6 +22,15 @@ class TestRenderVisitor(unittest.TestCase):
 		self.assertEqual(R().visit(BinaryOp(Constant(1), '^', Constant(2))), '1 ^ 2')
 		self.assertEqual(R().visit(BinaryOp(Constant(1), '-', Constant(2))), '1 - 2')
 
+	def test_bind(self):
+		self.assertEqual(R().visit(Bind(Identifier('y'), BinaryOp(Identifier('x'), '*',
+			Constant(2)))), 'y := x * 2')
+
+	def test_accept(self):
+		node = UnaryOp('-', Identifier('x'))
+		self.assertEqual(node.accept(R()), '-x')
+		self.assertEqual(MatDecl([[Constant(1)]]).accept(R()), '[[1]]')
+
 	def test_command(self):
 		self.assertEqual(R().visit(Command(['foo', 'bar'])), '% foo bar')
 
@@ -35,6 +44,11 @@ class TestRenderVisitor(unittest.TestCase):
 		self.assertEqual(R().visit(FunCall(Identifier('bar'), [Constant(1), Constant(2)])),
 			'bar(1, 2)')
 
+	def test_handlers(self):
+		self.assertEqual(set(R.handlers), set(Visitor.node_types))
+		self.assertIs(R.handlers[Solve], R.visit_solve)
+		self.assertEqual(R().dispatch(Identifier('x')), 'x')
+
 	def test_identifier(self):
 		self.assertEqual(R().visit(Identifier('foo')), 'foo')
 		self.assertEqual(R().visit(Identifier('bar')), 'bar')
@@ -1,4 +1,4 @@
-import unittest
+import copy, unittest
 from src.dtype import Complex, Matrix
 
 class TestComplex(unittest.TestCase):
@@ -31,6 +31,12 @@ class TestComplex(unittest.TestCase):
 		self.assertEqual(Complex(1, 2), Complex(1, 2))
 		self.assertEqual(Complex(1, 0), 1)
 
+	def test_immutable(self):
+		c = Complex(1, 2)
+		with self.assertRaises(AttributeError):
+			c.real = 3
+		self.assertIs(copy.deepcopy(c), c)
+
 	def test_mod(self):
 		with self.assertRaises(TypeError):
 			Complex() % 1
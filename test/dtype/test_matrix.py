@@ -1,47 +1,78 @@
+import copy, unittest
 from src.dtype import Complex, Matrix
-import unittest
+
+def rows(values: list):
+	"""Returns the given rows as they are stored by a matrix."""
+	return tuple(map(tuple, values))
 
 class TestMatrix(unittest.TestCase):
 	"""This class contains tests for the Matrix class."""
 
 	def test_identity(self):
 		m = Matrix.identity(3)
-		self.assertEqual(m.values, [[1., 0., 0.], [0., 1., 0.], [0., 0., 1.]])
+		self.assertEqual(m.values, rows([[1., 0., 0.], [0., 1., 0.], [0., 0., 1.]]))
 		self.assertEqual(m.shape, (3, 3))
 
+	def test_linspace(self):
+		m = Matrix.linspace(0, 1, 5)
+		self.assertEqual(m.values, rows([[0.], [.25], [.5], [.75], [1.]]))
+		self.assertEqual(Matrix.linspace(0, .3, 4).values[-1], (.3,))
+		self.assertEqual(Matrix.linspace(2, 3, 1).values, rows([[2.]]))
+		with self.assertRaises(ValueError):
+			Matrix.linspace(0, 1, 0)
+
 	def test_ones(self):
 		m = Matrix.ones(2, 3)
-		self.assertEqual(m.values, [[1., 1., 1.], [1., 1., 1.]])
+		self.assertEqual(m.values, rows([[1., 1., 1.], [1., 1., 1.]]))
 		self.assertEqual(m.shape, (2, 3))
 
+	def test_range(self):
+		self.assertEqual(Matrix.range(0, 3).values, rows([[0], [1], [2]]))
+		self.assertEqual(Matrix.range(0, 5, 2).values, rows([[0], [2], [4]]))
+		self.assertEqual(Matrix.range(3, 0, -1).values, rows([[3], [2], [1]]))
+		m = Matrix.range(0, 1, .1)
+		self.assertEqual(m.shape, (10, 1))
+		self.assertEqual(m.values[3], (.1 * 3,))
+
+	def test_random(self):
+		m = Matrix.random(3, 2)
+		self.assertEqual(m.shape, (3, 2))
+		self.assertTrue(all(0 <= x < 1 for row in m.values for x in row))
+
+	def test_range_invalid(self):
+		with self.assertRaises(ValueError):
+			Matrix.range(0, 1, 0)
+		with self.assertRaises(ValueError):
+			Matrix.range(1, 0)
+
 	def test_zeros(self):
 		m = Matrix.zeros(3, 2)
-		self.assertEqual(m.values, [[0., 0.], [0., 0.], [0., 0.]])
+		self.assertEqual(m.values, rows([[0., 0.], [0., 0.], [0., 0.]]))
 		self.assertEqual(m.shape, (3, 2))
 
 	def test_init(self):
 		m = Matrix([[1., 2., 3.], [4., 5., 6.]])
-		self.assertEqual(m.values, [[1., 2., 3.], [4., 5., 6.]])
+		self.assertEqual(m.values, rows([[1., 2., 3.], [4., 5., 6.]]))
 		self.assertEqual(m.shape, (2, 3))
 
 	def test_init_complex(self)	:
 		m = Matrix([[Complex(), Complex(1)], [Complex(2, 3), Complex(4, 5)]])
-		self.assertEqual(m.values, [[Complex(), Complex(1)], [Complex(2, 3), Complex(4, 5)]])
+		self.assertEqual(m.values, rows([[Complex(), Complex(1)], [Complex(2, 3), Complex(4, 5)]]))
 		self.assertEqual(m.shape, (2, 2))
 
 	def test_init_complex_promotion(self):
 		m = Matrix([[Complex(1), 2], [3, Complex(4)]])
-		self.assertEqual(m.values, [[Complex(1), Complex(2)], [Complex(3), Complex(4)]])
+		self.assertEqual(m.values, rows([[Complex(1), Complex(2)], [Complex(3), Complex(4)]]))
 		self.assertEqual(m.shape, (2, 2))
 
 	def test_init_float_promotion(self):
 		m = Matrix([[1, 2], [3.5, 4]])
-		self.assertEqual(m.values, [[1., 2.], [3.5, 4.]])
+		self.assertEqual(m.values, rows([[1., 2.], [3.5, 4.]]))
 		self.assertEqual(m.shape, (2, 2))
 
 	def test_init_mixed_promotion(self):
 		m = Matrix([[1, 2.4], [Complex(3), 4]])
-		self.assertEqual(m.values, [[Complex(1), Complex(2.4)], [Complex(3), Complex(4)]])
+		self.assertEqual(m.values, rows([[Complex(1), Complex(2.4)], [Complex(3), Complex(4)]]))
 		self.assertEqual(m.shape, (2, 2))
 
 	def test_init_invalid_shape(self):
@@ -56,6 +87,20 @@ class TestMatrix(unittest.TestCase):
 		with self.assertRaises(ValueError):
 			Matrix([['x', 2], [3, 4]])
 
+	def test_immutable(self):
+		values = [[1, 2], [3, 4]]
+		m = Matrix(values)
+		values[0][0] = 5
+		values.append([5, 6])
+		self.assertEqual(m.values, rows([[1, 2], [3, 4]]))
+		with self.assertRaises(AttributeError):
+			m.values = [[0, 0], [0, 0]]
+		with self.assertRaises(AttributeError):
+			m.shape = (1, 4)
+		self.assertIs(copy.deepcopy(m), m)
+		m.inverse()
+		self.assertEqual(m.values, rows([[1, 2], [3, 4]]))
+
 	def test_inverse(self):
 		u = Matrix.identity(3)
 		v = u.inverse()
@@ -63,7 +108,7 @@ class TestMatrix(unittest.TestCase):
 
 		u *= 2
 		v = u.inverse()
-		self.assertEqual(v.values, [[0.5, 0., 0.], [0., 0.5, 0.], [0., 0., 0.5]])
+		self.assertEqual(v.values, rows([[0.5, 0., 0.], [0., 0.5, 0.], [0., 0., 0.5]]))
 
 		u = Matrix([[8., 5., -2.], [4., 7., 20.], [7., 6., 1.]])
 		v = u.inverse()
@@ -90,18 +135,23 @@ class TestMatrix(unittest.TestCase):
 		with self.assertRaises(ValueError):
 			u.inverse()
 
+	def test_map(self):
+		u = Matrix([[1, 2], [3, 4]])
+		self.assertEqual(u.map(lambda x: x * x).values, rows([[1, 4], [9, 16]]))
+		self.assertEqual(u.map(float).values, rows([[1., 2.], [3., 4.]]))
+
 	def test_matmul(self):
 		u = Matrix.identity(2)
 		v = u.matmul(u)
-		self.assertEqual(v.values, [[1., 0.], [0., 1.]])
+		self.assertEqual(v.values, rows([[1., 0.], [0., 1.]]))
 
 		v = Matrix([[2., 1.], [4., 2.]])
 		w = u.matmul(v)
-		self.assertEqual(w.values, [[2., 1.], [4., 2.]])
+		self.assertEqual(w.values, rows([[2., 1.], [4., 2.]]))
 
 		u = Matrix([[3., -5.], [6., 8.]])
 		w = u.matmul(v)
-		self.assertEqual(w.values, [[-14., -7.], [44., 22.]])
+		self.assertEqual(w.values, rows([[-14., -7.], [44., 22.]]))
 
 	def test_matmul_invalid_shape(self):
 		u = Matrix([[1., 2.], [3., 4.]])
@@ -112,24 +162,24 @@ class TestMatrix(unittest.TestCase):
 	def test_transpose(self):
 		u = Matrix([[1., 2.], [3., 4.]])
 		v = u.transpose()
-		self.assertEqual(v.values, [[1., 3.], [2., 4.]])
+		self.assertEqual(v.values, rows([[1., 3.], [2., 4.]]))
 
 		u = Matrix([[3., 4., 5.], [6., 7., 8.]])
 		v = u.transpose()
-		self.assertEqual(v.values, [[3., 6.], [4., 7.], [5., 8.]])
+		self.assertEqual(v.values, rows([[3., 6.], [4., 7.], [5., 8.]]))
 
 	def test_add(self):
 		u = Matrix([[1., 2.], [3., 4.]])
 		v = Matrix([[7., 4.], [-2., 2.]])
 		expectedValues = [[8., 6.], [1., 6.]]
 		w = u + v
-		self.assertEqual(w.values, expectedValues)
+		self.assertEqual(w.values, rows(expectedValues))
 
 	def test_add_scl(self):
 		u = Matrix([[1., 2.], [3., 4.]])
 		expectedValues = [[3., 4.], [5., 6.]]
 		v = u + 2
-		self.assertEqual(v.values, expectedValues)
+		self.assertEqual(v.values, rows(expectedValues))
 
 	def test_eq(self):
 		m = Matrix([[1., 2.], [3., 4.]])
@@ -137,24 +187,24 @@ class TestMatrix(unittest.TestCase):
 
 	def test_mod(self):
 		m = Matrix([[7, 4], [3, 10]]) % 3
-		self.assertEqual(m.values, [[1, 1], [0, 1]])
+		self.assertEqual(m.values, rows([[1, 1], [0, 1]]))
 
 	def test_mod_scl(self):
 		m = Matrix([[1., 2.], [3., 4.]])
-		self.assertEqual((m % 2).values, [[1., 0.], [1., 0.]])
+		self.assertEqual((m % 2).values, rows([[1., 0.], [1., 0.]]))
 
 	def test_mul(self):
 		u = Matrix([[1., 2.], [3., 4.]])
 		v = Matrix([[7., 4.], [-2., 2.]])
 		expectedValues = [[7., 8.], [-6., 8.]]
 		w = u * v
-		self.assertEqual(w.values, expectedValues)
+		self.assertEqual(w.values, rows(expectedValues))
 
 	def test_mul_scl(self):
 		u = Matrix([[1., 2.], [3., 4.]])
 		expectedValues = [[2., 4.], [6., 8.]]
 		v = u * 2
-		self.assertEqual(v.values, expectedValues)
+		self.assertEqual(v.values, rows(expectedValues))
 
 	def test_ne(self):
 		m = Matrix([[1., 2.], [3., 4.]])
@@ -163,11 +213,11 @@ class TestMatrix(unittest.TestCase):
 
 	def test_neg(self):
 		m = Matrix([[1., 2.], [3., 4.]])
-		self.assertEqual((-m).values, [[-1., -2.], [-3., -4.]])
+		self.assertEqual((-m).values, rows([[-1., -2.], [-3., -4.]]))
 
 	def test_pos(self):
 		m = Matrix([[1., 2.], [3., 4.]])
-		self.assertEqual((+m).values, [[1., 2.], [3., 4.]])
+		self.assertEqual((+m).values, rows([[1., 2.], [3., 4.]]))
 
 	def test_pow(self):
 		m = Matrix([[1., 2.], [3., 4.]])
@@ -178,7 +228,7 @@ class TestMatrix(unittest.TestCase):
 		self.assertEqual(m ** 1, m)
 		self.assertEqual(m ** 2, m.matmul(m))
 		m = Matrix([[0.4, 0.6], [0.8, 0.2]]) ** 111
-		m.values = [[round(x, 2) for x in r] for r in m.values]
+		m = Matrix([[round(x, 2) for x in r] for r in m.values])
 		m2 = Matrix([[0.57, 0.43], [0.57, 0.43]])
 		self.assertEqual(m, m2)
 
@@ -201,7 +251,7 @@ class TestMatrix(unittest.TestCase):
 		u = Matrix([[1., 2.], [3., 4.]])
 		expectedValues = [[8., 9.], [10., 11.]]
 		v = 7 + u
-		self.assertEqual(v.values, expectedValues)
+		self.assertEqual(v.values, rows(expectedValues))
 
 	def test_repr(self):
 		self.assertEqual(repr(Matrix([[1, 2], [3, 4]])), 'Matrix([[1, 2], [3, 4]])')
@@ -218,7 +268,7 @@ class TestMatrix(unittest.TestCase):
 		u = Matrix([[1., 2.], [3., 4.]])
 		expectedValues = [[2., 4.], [6., 8.]]
 		v = 2 * u
-		self.assertEqual(v.values, expectedValues)
+		self.assertEqual(v.values, rows(expectedValues))
 
 	def test_rpow(self):
 		with self.assertRaises(TypeError):
@@ -228,7 +278,7 @@ class TestMatrix(unittest.TestCase):
 		u = Matrix([[1., 2.], [3., 4.]])
 		expectedValues = [[6., 5.], [4., 3.]]
 		v = 7 - u
-		self.assertEqual(v.values, expectedValues)
+		self.assertEqual(v.values, rows(expectedValues))
 
 	def test_rtruediv(self):
 		with self.assertRaises(TypeError):
@@ -246,18 +296,18 @@ class TestMatrix(unittest.TestCase):
 		v = Matrix([[7., 4.], [-2., 2.]])
 		expectedValues = [[-6., -2.], [5., 2.]]
 		w = u - v
-		self.assertEqual(w.values, expectedValues)
+		self.assertEqual(w.values, rows(expectedValues))
 
 	def test_sub_scl(self):
 		u = Matrix([[1., 2.], [3., 4.]])
 		expectedValues = [[-1., 0.], [1., 2.]]
 		v = u - 2
-		self.assertEqual(v.values, expectedValues)
+		self.assertEqual(v.values, rows(expectedValues))
 
 	def test_truediv(self):
 		u = Matrix([[1., 2.], [3., 4.]])
 		v = u / 2
-		self.assertEqual(v.values, [[0.5, 1.], [1.5, 2.]])
+		self.assertEqual(v.values, rows([[0.5, 1.], [1.5, 2.]]))
 
 	def test_truediv_invalid_type(self):
 		u = Matrix([[1., 2.], [3., 4.]])
@@ -1,8 +1,8 @@
 import unittest
-from src.ast import Assign, BinaryOp, Command, Constant, FunCall, Identifier, MatDecl, Solve, \
-	UnaryOp
+from src.ast import Assign, BinaryOp, Bind, Command, Constant, FunCall, Identifier, MatDecl, \
+	Solve, UnaryOp
 from src.interpreter.errors import *
-from src.interpreter import Context, FunctionStorage, AnalyzerVisitor
+from src.interpreter import AnalysisSummary, Binding, Context, FunctionStorage, AnalyzerVisitor
 
 class TestAnalyzerVisitor(unittest.TestCase):
 	"""This class checks if all exceptions are raised correctly."""
@@ -18,83 +18,157 @@ class TestAnalyzerVisitor(unittest.TestCase):
 
 	def setUp(self):
 		self.ctx = Context()
-		self.ast = Assign(None, None)
 
 	def test_assign_expr_error(self):
-		self.ast.target = BinaryOp(Identifier('x'), '+', Identifier('y'))
-		self.ast.value = Identifier('x')
+		self.ast = Assign(BinaryOp(Identifier('x'), '+', Identifier('y')), Identifier('x'))
+		self._assert_errors_raised([AssignExpressionError])
+
+	def test_bind(self):
+		self.ctx.set_variable('x', Constant(1))
+		AnalyzerVisitor(self.ctx).visit(Bind(Identifier('y'), Identifier('x')))
+
+	def test_bind_constant_error(self):
+		self.ast = Bind(Identifier('pi'), Constant(3))
+		self._assert_errors_raised([BuiltInConstantError])
+
+	def test_bind_cyclic_binding_error(self):
+		self.ctx.set_variable('x', Constant(1))
+		self.ast = Bind(Identifier('x'), BinaryOp(Identifier('x'), '+', Constant(1)))
+		self._assert_errors_raised([CyclicBindingError])
+		with self.assertRaises(InterpreterErrorGroup) as e:
+			AnalyzerVisitor(self.ctx).visit(self.ast)
+		self.assertEqual(str(e.exception.errors[0]), 'binding x depends on itself.')
+
+	def test_bind_cyclic_binding_error_through_binding(self):
+		self.ctx.set_variable('x', Constant(1))
+		self.ctx.bind('y', Binding(Identifier('x'), frozenset({'x'}), lambda value: value))
+		self.ast = Bind(Identifier('x'), Identifier('y'))
+		self._assert_errors_raised([CyclicBindingError])
+
+	def test_bind_expr_error(self):
+		self.ast = Bind(FunCall(Identifier('f'), [Identifier('x')]), Identifier('x'))
 		self._assert_errors_raised([AssignExpressionError])
 
 	def test_built_in_call(self):
 		self.ast = FunCall(Identifier('log'), [Identifier('x')])
 		AnalyzerVisitor(self.ctx).visit(self.ast)
 
+	def test_built_in_call_optional_argument(self):
+		self.ast = FunCall(Identifier('log'), [Constant(8), Constant(2)])
+		AnalyzerVisitor(self.ctx).visit(self.ast)
+		self.ast = FunCall(Identifier('log'), [Constant(8), Constant(2), Constant(1)])
+		self._assert_errors_raised([InvalidArgumentsLengthError])
+
 	def test_built_in_constant_error(self):
-		self.ast.target = FunCall(Identifier('f'), [Identifier('x'), Identifier('pi')])
-		self.ast.value = BinaryOp(Identifier('x'), '*', Identifier('pi'))
+		self.ast = Assign(FunCall(Identifier('f'), [Identifier('x'), Identifier('pi')]),
+			BinaryOp(Identifier('x'), '*', Identifier('pi')))
 		self._assert_errors_raised([BuiltInConstantError])
 
 	def test_built_in_function_error(self):
-		self.ast.target = FunCall(Identifier('cos'), [Identifier('x')])
-		self.ast.value = Identifier('x')
+		self.ast = Assign(FunCall(Identifier('cos'), [Identifier('x')]), Identifier('x'))
 		self._assert_errors_raised([BuiltInFunctionError])
 
+	def test_call_summary(self):
+		self.ctx.set_function('f', FunctionStorage([Identifier('x')],
+			BinaryOp(Identifier('x'), '*', Identifier('pi'))))
+		self.ctx.set_function('g', FunctionStorage([Identifier('x')],
+			FunCall(Identifier('f'), [Identifier('x')]), {'f'}))
+		AnalyzerVisitor(self.ctx).visit(FunCall(Identifier('g'), [Constant(1)]))
+		summary = self.ctx.get_function('g').summary
+		self.assertEqual(summary, AnalysisSummary(1, frozenset({'pi'}), frozenset({'f'}), []))
+		self.ctx.set_function('f', FunctionStorage([Identifier('x')], Identifier('x')))
+		self.assertIsNone(self.ctx.get_function('g').summary)
+
 	def test_call_too_few_arguments(self):
 		self.ctx.set_function('f', FunctionStorage([Identifier('x'), Identifier('y')], Identifier('x')))
-		self.ast.target = FunCall(Identifier('g'), [Identifier('x')])
-		self.ast.value = FunCall(Identifier('f'), [Identifier('x')])
+		self.ast = Assign(FunCall(Identifier('g'), [Identifier('x')]),
+			FunCall(Identifier('f'), [Identifier('x')]))
 		self._assert_errors_raised([InvalidArgumentsLengthError])
 
 	def test_call_too_many_arguments(self):
 		self.ctx.set_function('f', FunctionStorage([Identifier('x')], Identifier('x')))
-		self.ast.target = FunCall(Identifier('g'), [Identifier('x')])
-		self.ast.value = FunCall(Identifier('f'), [Identifier('x'), Identifier('x')])
+		self.ast = Assign(FunCall(Identifier('g'), [Identifier('x')]),
+			FunCall(Identifier('f'), [Identifier('x'), Identifier('x')]))
 		self._assert_errors_raised([InvalidArgumentsLengthError])
 
+	def test_call_undefined_free_variable(self):
+		self.ctx.set_function('f', FunctionStorage([Identifier('x')],
+			BinaryOp(Identifier('x'), '+', Identifier('y'))))
+		self.ast = Assign(Identifier('a'), FunCall(Identifier('f'), [Constant(1)]))
+		self._assert_errors_raised([UndefinedVariableError])
+		self.ctx.set_variable('y', Constant(2))
+		AnalyzerVisitor(self.ctx).visit(self.ast)
+
 	def test_call_undefined_function(self):
-		self.ast.target = FunCall(Identifier('f'), [Identifier('x')])
-		self.ast.value = FunCall(Identifier('g'), [Identifier('x')])
+		self.ast = Assign(FunCall(Identifier('f'), [Identifier('x')]),
+			FunCall(Identifier('g'), [Identifier('x')]))
 		self._assert_errors_raised([UndefinedFunctionError])
 
 	def test_call_undefined_variable(self):
-		self.ast.target = FunCall(Identifier('f'), [Identifier('x')])
-		self.ast.value = BinaryOp(Identifier('x'), '+', Identifier('y'))
+		self.ast = Assign(FunCall(Identifier('f'), [Identifier('x')]),
+			BinaryOp(Identifier('x'), '+', Identifier('y')))
 		self._assert_errors_raised([UndefinedVariableError])
 
 	def test_cyclic_dependency_error(self):
-		self.ast.target = FunCall(Identifier('f'), [Identifier('x')])
-		self.ast.value = FunCall(Identifier('f'), [Identifier('x')])
+		self.ast = Assign(FunCall(Identifier('f'), [Identifier('x')]),
+			FunCall(Identifier('f'), [Identifier('x')]))
+		self._assert_errors_raised([CyclicDependencyError])
+
+	def test_cyclic_dependency_error_through_call(self):
+		self.ctx.set_function('f', FunctionStorage([Identifier('x')], Identifier('x')))
+		self.ctx.set_function('g', FunctionStorage([Identifier('x')],
+			FunCall(Identifier('f'), [Identifier('x')]), {'f'}))
+		self.ast = Assign(FunCall(Identifier('f'), [Identifier('x')]),
+			FunCall(Identifier('g'), [Identifier('x')]))
 		self._assert_errors_raised([CyclicDependencyError])
 
 	def test_invalid_arguments_length_error(self):
-		self.ast.target = FunCall(Identifier('f'), [Identifier('x')])
-		self.ast.value = FunCall(Identifier('cos'), [Identifier('x'), Identifier('x')])
+		self.ast = Assign(FunCall(Identifier('f'), [Identifier('x')]),
+			FunCall(Identifier('cos'), [Identifier('x'), Identifier('x')]))
+		self._assert_errors_raised([InvalidArgumentsLengthError])
+
+	def test_map(self):
+		self.ctx.set_function('f', FunctionStorage([Identifier('x')], Identifier('x')))
+		self.ast = Assign(FunCall(Identifier('g'), [Identifier('m')]),
+			FunCall(Identifier('map'), [Identifier('f'), Identifier('m')]))
+		AnalyzerVisitor(self.ctx).visit(self.ast)
+		AnalyzerVisitor(self.ctx).visit(FunCall(Identifier('map'),
+			[Identifier('sin'), Constant(1)]))
+
+	def test_map_errors(self):
+		self.ctx.set_function('f', FunctionStorage([Identifier('x'), Identifier('y')],
+			Identifier('x')))
+		self.ast = FunCall(Identifier('map'), [Identifier('f'), Constant(1)])
 		self._assert_errors_raised([InvalidArgumentsLengthError])
+		self.ast = FunCall(Identifier('map'), [Identifier('h'), Constant(1)])
+		self._assert_errors_raised([UndefinedFunctionError])
+		self.ast = FunCall(Identifier('map'), [Constant(1), Constant(1)])
+		self._assert_errors_raised([RequireIdentifierError])
+		self.ast = Assign(FunCall(Identifier('g'), [Identifier('m')]),
+			FunCall(Identifier('map'), [Identifier('g'), Identifier('m')]))
+		self._assert_errors_raised([CyclicDependencyError])
 
 	def test_matdecl(self):
-		self.ast.target = FunCall(Identifier('f'), [Identifier('x')])
-		self.ast.value = MatDecl([[Constant(1), Identifier('x')]])
+		self.ast = Assign(FunCall(Identifier('f'), [Identifier('x')]),
+			MatDecl([[Constant(1), Identifier('x')]]))
 		AnalyzerVisitor(self.ctx).visit(self.ast)
 
 	def test_multiple_declaration_error(self):
-		self.ast.target = FunCall(Identifier('f'),
-			[Identifier('x'), Identifier('x'), Identifier('y'), Identifier('x')])
-		self.ast.value = BinaryOp(Identifier('x'), '+', Identifier('y'))
+		self.ast = Assign(FunCall(Identifier('f'),
+			[Identifier('x'), Identifier('x'), Identifier('y'), Identifier('x')]),
+			BinaryOp(Identifier('x'), '+', Identifier('y')))
 		self._assert_errors_raised([MultipleDeclarationError])
 
 	def test_require_identifier_error(self):
-		self.ast.target = FunCall(Identifier('f'), [Identifier('x'), Constant(1)])
-		self.ast.value = Identifier('x')
+		self.ast = Assign(FunCall(Identifier('f'), [Identifier('x'), Constant(1)]), Identifier('x'))
 		self._assert_errors_raised([RequireIdentifierError])
 
 	def test_solve(self):
-		self.ast.target = Identifier('x')
-		self.ast.value = Constant(1)
+		self.ast = Assign(Identifier('x'), Constant(1))
 		AnalyzerVisitor(self.ctx).visit(Solve(self.ast))
 
 	def test_too_many_equation_variables_error(self):
-		self.ast.target = BinaryOp(Identifier('a'), '+', Identifier('b'))
-		self.ast.value = Identifier('a')
+		self.ast = Assign(BinaryOp(Identifier('a'), '+', Identifier('b')), Identifier('a'))
 		self.ast = Solve(self.ast)
 		self._assert_errors_raised([TooManyEquationVariablesError])
 
@@ -106,13 +180,13 @@ class TestAnalyzerVisitor(unittest.TestCase):
 		self._assert_errors_raised([UndefinedFunctionError])
 
 	def test_unused_parameter_error(self):
-		self.ast.target = FunCall(Identifier('f'), [Identifier('x'), Identifier('y')])
-		self.ast.value = Identifier('x')
+		self.ast = Assign(FunCall(Identifier('f'), [Identifier('x'), Identifier('y')]),
+			Identifier('x'))
 		self._assert_errors_raised([UnusedParameterError])
 
 	def test_multiple_errors(self):
-		self.ast.target = FunCall(Identifier('f'), [Identifier('x'), Identifier('y'), Constant(42), Identifier('y')])
-		self.ast.value = FunCall(Identifier('g'), [BinaryOp(Identifier('x'), '+', Identifier('z'))])
+		self.ast = Assign(FunCall(Identifier('f'), [Identifier('x'), Identifier('y'), Constant(42), Identifier('y')]),
+			FunCall(Identifier('g'), [BinaryOp(Identifier('x'), '+', Identifier('z'))]))
 		self._assert_errors_raised([RequireIdentifierError, MultipleDeclarationError,
 			UndefinedFunctionError, UndefinedVariableError, UnusedParameterError])
 
@@ -0,0 +1,25 @@
+import unittest
+from src.ast import Constant, Identifier
+from src.interpreter import Binding
+
+class TestBinding(unittest.TestCase):
+	"""This class contains tests for the Binding class."""
+
+	def setUp(self):
+		self.computed = []
+		self.binding = Binding(Identifier('x'), frozenset({'x'}), self._compute)
+
+	def _compute(self, value):
+		self.computed.append(value)
+		return Constant(len(self.computed))
+
+	def test_get(self):
+		self.assertEqual(self.binding.get(), Constant(1))
+		self.assertEqual(self.binding.get(), Constant(1))
+		self.assertEqual(self.computed, [Identifier('x')])
+
+	def test_get_dirty(self):
+		self.binding.get()
+		self.binding.dirty = True
+		self.assertEqual(self.binding.get(), Constant(2))
+		self.assertFalse(self.binding.dirty)
@@ -0,0 +1,59 @@
+import math, unittest
+from src.dtype import Matrix
+from src.interpreter import Builtin, Context
+
+class TestBuiltin(unittest.TestCase):
+	"""This class contains tests for the Builtin class."""
+
+	def test_accepts(self):
+		log = Context.builtins['log']
+		self.assertFalse(log.accepts(0))
+		self.assertTrue(log.accepts(1))
+		self.assertTrue(log.accepts(2))
+		self.assertFalse(log.accepts(3))
+
+	def test_call(self):
+		self.assertEqual(Context.builtins['log'](8, 2), 3.0)
+		self.assertEqual(Context.builtins['abs'](-1), 1)
+
+	def test_call_invalid_type(self):
+		with self.assertRaises(TypeError):
+			Context.builtins['sin'](Matrix([[1]]))
+		with self.assertRaises(TypeError):
+			Context.builtins['zeros'](2, 1.5)
+
+	def test_functions(self):
+		map = Context.builtins['map']
+		self.assertEqual(map.functions, 1)
+		self.assertEqual(map(lambda x: x + 1, Matrix([[1, 2]])), Matrix([[2, 3]]))
+		with self.assertRaises(TypeError):
+			map(Context.builtins['abs'], Matrix([[1]]))
+		self.assertEqual(Context.builtins['abs'].functions, 0)
+
+	def test_iterate(self):
+		iterate = Context.builtins['iterate']
+		self.assertEqual(iterate(lambda x: x * 2, 1, 10), 1024)
+		self.assertEqual(iterate(lambda x: x * 2, Matrix([[1]]), 3), Matrix([[8]]))
+		self.assertEqual(iterate(lambda x: x * 2, 1, 0), 1)
+		with self.assertRaises(ValueError):
+			iterate(lambda x: x, 1, -1)
+
+	def test_prod(self):
+		self.assertEqual(Context.builtins['prod'](lambda k: k, 1, 5), 120)
+		self.assertEqual(Context.builtins['prod'](lambda k: k, 5, 1), 1)
+
+	def test_pure(self):
+		self.assertEqual([b.name for b in Context.builtins.values() if not b.pure], ['rand'])
+		self.assertFalse(Builtin('f', math.sin, 1, pure=False).pure)
+
+	def test_registry(self):
+		for name, b in Context.builtins.items():
+			self.assertEqual(b.name, name)
+
+	def test_sum(self):
+		sum = Context.builtins['sum']
+		self.assertEqual(sum(lambda k: k * k, 1, 3), 14)
+		self.assertEqual(sum(lambda k: k, 5, 1), 0)
+		self.assertEqual(sum(lambda k: Matrix([[k]]), 1, 2), Matrix([[3]]))
+		with self.assertRaises(TypeError):
+			sum(lambda k: k, 1, 2.5)
@@ -0,0 +1,58 @@
+import unittest
+from src.ast import Constant
+from src.interpreter import CallCache
+
+class TestCallCache(unittest.TestCase):
+	"""This class tests the CallCache class."""
+
+	def setUp(self):
+		self.cache = CallCache(2)
+
+	def test_clear(self):
+		self.cache.put(CallCache.key([1]), Constant(2))
+		self.cache.get(CallCache.key([1]))
+		self.cache.clear()
+		self.assertEqual(len(self.cache), 0)
+		self.assertEqual((self.cache.hits, self.cache.misses), (0, 0))
+
+	def test_get(self):
+		self.cache.put(CallCache.key([1]), Constant(2))
+		self.assertEqual(self.cache.get(CallCache.key([Constant(1)])), Constant(2))
+		self.assertIsNone(self.cache.get(CallCache.key([2])))
+		self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+	def test_get_hit_rate(self):
+		self.assertEqual(self.cache.get_hit_rate(), 0.0)
+		self.cache.put(CallCache.key([1]), Constant(2))
+		self.cache.get(CallCache.key([1]))
+		self.cache.get(CallCache.key([1]))
+		self.cache.get(CallCache.key([3]))
+		self.cache.get(CallCache.key([4]))
+		self.assertEqual(self.cache.get_hit_rate(), 0.5)
+
+	def test_invalidate(self):
+		self.cache.put(CallCache.key([1]), Constant(2))
+		self.cache.get(CallCache.key([1]))
+		self.cache.invalidate()
+		self.assertEqual(len(self.cache), 0)
+		self.assertEqual(self.cache.hits, 1)
+
+	def test_key(self):
+		self.assertEqual(CallCache.key([1, Constant(2)]), (Constant(1), Constant(2)))
+
+	def test_key_types(self):
+		self.assertNotEqual(CallCache.key([1]), CallCache.key([1.0]))
+
+	def test_put_evicts_least_recently_used(self):
+		self.cache.put(CallCache.key([1]), Constant(1))
+		self.cache.put(CallCache.key([2]), Constant(2))
+		self.cache.get(CallCache.key([1]))
+		self.cache.put(CallCache.key([3]), Constant(3))
+		self.assertEqual(len(self.cache), 2)
+		self.assertIsNone(self.cache.get(CallCache.key([2])))
+		self.assertEqual(self.cache.get(CallCache.key([1])), Constant(1))
+
+	def test_put_size_zero(self):
+		cache = CallCache(0)
+		cache.put(CallCache.key([1]), Constant(1))
+		self.assertEqual(len(cache), 0)
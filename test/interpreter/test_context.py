@@ -1,6 +1,7 @@
 import math, unittest
+from src.ast import BinaryOp, Constant, FunCall, Identifier
 from src.dtype import Matrix
-from src.interpreter import Context, FunctionStorage
+from src.interpreter import AnalysisSummary, Binding, CallCache, Context, FunctionStorage
 
 class TestContext(unittest.TestCase):
 	"""This class contains tests for the Context class."""
@@ -8,6 +9,18 @@ class TestContext(unittest.TestCase):
 	def setUp(self):
 		self.ctx = Context()
 
+	def test_bind(self):
+		self.ctx.set_variable('x', Constant(2))
+		binding = Binding(Identifier('x'), frozenset({'x'}),
+			lambda value: Constant(self.ctx.get_variable('x').value * 2))
+		self.ctx.bind('y', binding)
+		self.assertEqual(self.ctx.get_variable('y'), Constant(4))
+		self.ctx.set_variable('x', Constant(3))
+		self.assertTrue(binding.dirty)
+		self.assertEqual(self.ctx.get_variable('y'), Constant(6))
+		self.ctx.set_variable('y', Constant(0))
+		self.assertEqual(self.ctx.watchers, {})
+
 	def test_builtin_inv(self):
 		inv = self.ctx.get_function('inv')
 		with self.assertRaises(TypeError):
@@ -45,7 +58,7 @@ class TestContext(unittest.TestCase):
 		self.assertIsNone(self.ctx.get_function('f'))
 
 	def test_get_function_builtin(self):
-		self.assertEqual(self.ctx.get_function('abs'), abs)
+		self.assertEqual(self.ctx.get_function('abs').function, abs)
 
 	def test_get_function_user_defined(self):
 		f = FunctionStorage([], None)
@@ -58,6 +71,20 @@ class TestContext(unittest.TestCase):
 		self.assertEqual(self.ctx.get_functions_using_dependency('f'), {'g'})
 		self.assertEqual(self.ctx.get_functions_using_dependency('x'), {'f'})
 
+	def test_get_global_variable(self):
+		self.ctx.set_variable('y', 1)
+		self.ctx.push_scope('foo')
+		self.ctx.set_variable('y', 2)
+		self.assertEqual(self.ctx.get_global_variable('y'), 1)
+
+	def test_get_functions_using_dependency_redefined(self):
+		self.ctx.set_function('g', FunctionStorage([], None, {'f'}))
+		self.ctx.set_function('g', FunctionStorage([], None, {'h'}))
+		self.assertEqual(self.ctx.get_functions_using_dependency('f'), set())
+		self.assertEqual(self.ctx.get_functions_using_dependency('h'), {'g'})
+		self.ctx.unset_function('g')
+		self.assertEqual(self.ctx.dependents, {})
+
 	def test_get_scope(self):
 		self.assertEqual(self.ctx.get_scope(), None)
 
@@ -70,6 +97,16 @@ class TestContext(unittest.TestCase):
 		self.ctx.push_scope('bar')
 		self.assertEqual(self.ctx.get_variable('x'), 42)
 
+	def test_get_variable_frame(self):
+		self.ctx.set_variable('y', 1)
+		self.ctx.push_scope('foo')
+		self.ctx.set_variable('z', 2)
+		self.ctx.push_frame('f', {'x': 0}, [42])
+		self.assertEqual(self.ctx.get_variable('x'), 42)
+		self.assertEqual(self.ctx.get_variable('y'), 1)
+		self.assertIsNone(self.ctx.get_variable('z'))
+		self.assertEqual(self.ctx.get_variable('pi'), math.pi)
+
 	def test_get_variable_constant(self):
 		self.assertEqual(self.ctx.get_variable('pi'), math.pi)
 
@@ -77,10 +114,62 @@ class TestContext(unittest.TestCase):
 		self.ctx.set_variable('y', 42)
 		self.assertEqual(self.ctx.get_variable('y'), 42)
 
+	def test_intern(self):
+		self.ctx.interner.limit = 4
+		kept = self.ctx.intern(BinaryOp(Identifier('x'), '+', Constant(1)))
+		self.ctx.set_variable('y', kept)
+		self.ctx.intern(BinaryOp(Identifier('z'), '-', Constant(2)))
+		self.assertEqual(len(self.ctx.interner), 3)
+		self.assertIs(self.ctx.intern(Identifier('x')), kept.left)
+
+	def test_invalidate_bindings(self):
+		bindings = [Binding(Identifier(source), frozenset({source}), lambda value: value)
+			for source in ('x', 'y', 'f')]
+		for id, binding in zip(('y', 'z', 'w'), bindings):
+			self.ctx.bind(id, binding)
+			binding.get()
+		self.ctx.set_variable('x', Constant(1))
+		self.assertEqual([b.dirty for b in bindings], [True, True, False])
+		self.ctx.set_function('f', FunctionStorage([], None))
+		self.assertTrue(bindings[2].dirty)
+
+	def test_invalidate_dependents(self):
+		self.ctx.set_function('f', FunctionStorage([Identifier('x')], Identifier('x')))
+		self.ctx.set_function('g', FunctionStorage([Identifier('x')],
+			FunCall(Identifier('f'), [Identifier('x')]), {'f'}, cache=CallCache()))
+		self.ctx.set_function('h', FunctionStorage([Identifier('x')],
+			FunCall(Identifier('g'), [Identifier('x')]), {'g'}, cache=CallCache()))
+		for id in 'gh':
+			self.ctx.get_function(id).cache.put(CallCache.key([1]), Constant(1))
+			self.ctx.get_function(id).summary = AnalysisSummary(1, frozenset(), frozenset({'f'}), [])
+		self.ctx.set_function('f', FunctionStorage([Identifier('x')], Constant(2)))
+		for id in 'gh':
+			self.assertEqual(len(self.ctx.get_function(id).cache), 0)
+			self.assertIsNone(self.ctx.get_function(id).summary)
+
 	def test_is_builtin(self):
 		self.assertTrue(self.ctx.is_builtin('abs'))
 		self.assertFalse(self.ctx.is_builtin('foo'))
 
+	def test_is_pure(self):
+		self.assertTrue(self.ctx.is_pure('sin'))
+		self.assertFalse(self.ctx.is_pure('rand'))
+		self.assertTrue(self.ctx.is_pure('foo'))
+		self.ctx.set_function('f', FunctionStorage([], None))
+		self.ctx.set_function('g', FunctionStorage([], None, {'f'}))
+		self.ctx.set_function('h', FunctionStorage([], None, {'g'}))
+		self.ctx.get_function('h').cache = CallCache()
+		self.assertTrue(self.ctx.is_pure('h'))
+		self.ctx.set_function('f', FunctionStorage([], None, set(), True))
+		self.assertFalse(self.ctx.is_pure('g'))
+		self.assertFalse(self.ctx.is_pure('h'))
+		self.assertIsNone(self.ctx.get_function('h').cache)
+		self.ctx.set_function('f', FunctionStorage([], None))
+		self.assertTrue(self.ctx.is_pure('h'))
+		self.ctx.set_function('f', FunctionStorage([], None, set(), True))
+		self.ctx.unset_function('f')
+		self.assertTrue(self.ctx.is_pure('h'))
+
 	def test_is_constant(self):
 		self.assertTrue(self.ctx.is_constant('pi'))
 		self.assertFalse(self.ctx.is_constant('foo'))
@@ -97,6 +186,14 @@ class TestContext(unittest.TestCase):
 		self.ctx.pop_scope()
 		self.assertIsNone(self.ctx.get_scope())
 
+	def test_push_frame(self):
+		self.ctx.push_frame('f', {'x': 0}, [42])
+		self.assertEqual(self.ctx.get_scope(), 'f')
+		self.assertEqual(self.ctx.get_depth(), 1)
+		self.assertEqual(len(self.ctx.scopes), 1)
+		self.ctx.pop_frame()
+		self.assertIsNone(self.ctx.get_variable('x'))
+
 	def test_push_scope(self):
 		self.ctx.push_scope('foo')
 		self.assertEqual(self.ctx.get_scope(), 'foo')
@@ -106,6 +203,18 @@ class TestContext(unittest.TestCase):
 		self.ctx.push_scope('bar')
 		self.assertEqual(self.ctx.get_scope(), 'bar')
 
+	def test_remove_function(self):
+		self.ctx.set_function('f', FunctionStorage([], None))
+		self.ctx.set_function('g', FunctionStorage([], None, {'f'}))
+		self.ctx.set_function('h', FunctionStorage([], None, {'f', 'g'}))
+		self.ctx.set_function('k', FunctionStorage([], None))
+		errors = self.ctx.remove_function('f')
+		self.assertEqual([str(e) for e in errors], [
+			'function h has been removed due to an invalid function call to g.',
+			'function g has been removed due to an invalid function call to f.'])
+		self.assertEqual(list(self.ctx.functions), ['k'])
+		self.assertEqual(self.ctx.dependents, {})
+
 	def test_reset_stack(self):
 		self.ctx.reset_stack()
 		self.assertIsNone(self.ctx.get_scope())
@@ -116,12 +225,20 @@ class TestContext(unittest.TestCase):
 		self.assertIsNone(self.ctx.get_scope())
 
 	def test_set_function(self):
-		self.ctx.set_function('f', None)
-		self.assertEqual(self.ctx.get_function('f'), None)
+		f = FunctionStorage([], None)
+		self.ctx.set_function('f', f)
+		self.assertEqual(self.ctx.get_function('f'), f)
 
 	def test_set_function_builtin(self):
-		self.ctx.set_function('abs', None)
-		self.assertEqual(self.ctx.get_function('abs'), None)
+		f = FunctionStorage([], None)
+		self.ctx.set_function('abs', f)
+		self.assertEqual(self.ctx.get_function('abs'), f)
+
+	def test_set_function_keeps_cache(self):
+		self.ctx.set_function('f', FunctionStorage([Identifier('x')], Identifier('x'),
+			cache=CallCache(4)))
+		self.ctx.set_function('f', FunctionStorage([Identifier('x')], Constant(1)))
+		self.assertEqual(self.ctx.get_function('f').cache.maxsize, 4)
 
 	def test_set_variable(self):
 		self.ctx.set_variable('y', 42)
@@ -156,7 +273,7 @@ class TestContext(unittest.TestCase):
 		self.assertIsNone(self.ctx.get_variable('x'))
 
 	def test_unset_function(self):
-		self.ctx.set_function('f', None)
+		self.ctx.set_function('f', FunctionStorage([], None))
 		self.ctx.unset_function('f')
 		self.assertIsNone(self.ctx.get_function('f'))
 
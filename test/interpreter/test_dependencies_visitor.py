@@ -1,6 +1,6 @@
 import unittest
-from src.ast import Assign, BinaryOp, Command, Constant, FunCall, Identifier, MatDecl, Solve, \
-	UnaryOp
+from src.ast import Assign, BinaryOp, Bind, Command, Constant, FunCall, Identifier, MatDecl, \
+	Solve, UnaryOp
 from src.interpreter.errors import *
 from src.interpreter import Context, FunctionStorage, DependenciesVisitor
 
@@ -15,6 +15,11 @@ class TestDependenciesVisitor(unittest.TestCase):
 			FunctionStorage([Identifier('y')], Identifier('y')))
 		self.dv = DependenciesVisitor(self.ctx)
 
+	def test_bind(self):
+		self.dv.visit(Bind(Identifier('y'), FunCall(Identifier('f'), [Identifier('x')])))
+		self.assertEqual(self.dv.visited_variables, {'x', 'y'})
+		self.assertEqual(self.dv.visited_functions, {'f'})
+
 	def test_get_undefined_variables(self):
 		self.dv.visit(BinaryOp(Identifier('x'), '+', Identifier('y')))
 		self.assertEqual(self.dv.get_undefined_variables(), {'x', 'y'})
@@ -47,6 +52,12 @@ class TestDependenciesVisitor(unittest.TestCase):
 		self.assertEqual(self.dv.visited_functions, set())
 		self.assertEqual(self.dv.visited_variables, {'x', 'y'})
 
+	def test_map(self):
+		self.dv.visit(FunCall(Identifier('map'), [Identifier('f'), Identifier('m')]))
+		self.assertEqual(self.dv.visited_functions, {'map', 'f'})
+		self.assertEqual(self.dv.visited_variables, {'m'})
+		self.assertEqual(self.dv.get_user_defined_functions(), {'f'})
+
 	def test_multiple_functions(self):
 		expr = FunCall(Identifier('f'), [FunCall(Identifier('g'), [Constant(1)])])
 		self.dv.visit(expr)
@@ -71,6 +82,12 @@ class TestDependenciesVisitor(unittest.TestCase):
 		self.assertEqual(self.dv.visited_functions, set())
 		self.assertEqual(self.dv.visited_variables, set())
 
+	def test_real_variables(self):
+		expr = BinaryOp(FunCall(Identifier('sqrt'), [Identifier('x')]), '+',
+			FunCall(Identifier('abs'), [Identifier('y')]))
+		self.dv.visit(BinaryOp(expr, '+', FunCall(Identifier('sin'), [UnaryOp('-', Identifier('z'))])))
+		self.assertEqual(self.dv.real_variables, {'x'})
+
 	def test_single_assignment(self):
 		expr = Assign(Identifier('x'), Constant(1))
 		self.dv.visit(expr)
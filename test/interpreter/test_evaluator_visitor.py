@@ -1,8 +1,9 @@
 import unittest
-from src.ast import Assign, BinaryOp, Command, Constant, FunCall, Identifier, MatDecl, Solve, \
-	UnaryOp
+from src.ast import Assign, BinaryOp, Bind, Command, Constant, FunCall, Identifier, MatDecl, \
+	Solve, UnaryOp
 from src.dtype import Matrix
-from src.interpreter import Context, EvaluatorVisitor, FunctionStorage, InterpreterErrorGroup
+from src.interpreter import Builtin, CallCache, Context, EvaluatorVisitor, FunctionStorage, \
+	InterpreterErrorGroup
 
 class TestEvaluatorVisitor(unittest.TestCase):
 	"""This class tests the EvaluatiorVisitor class."""
@@ -37,6 +38,63 @@ class TestEvaluatorVisitor(unittest.TestCase):
 		self.assertEqual(repr(add.args), "[Identifier('x'), Identifier('y')]")
 		self.assertEqual(repr(add.body), "BinaryOp(Identifier('x'), '+', Identifier('y'))")
 
+	def test_assign_function_interned(self):
+		self.ev.visit(Assign(FunCall(Identifier('g'), [Identifier('x')]),
+			BinaryOp(BinaryOp(Identifier('x'), '+', Identifier('y')), '*',
+			BinaryOp(Identifier('x'), '+', Identifier('y')))))
+		self.ev.visit(Assign(Identifier('z'), BinaryOp(Identifier('x'), '+', Identifier('y'))))
+		body = self.ctx.get_function('g').body
+		self.assertIs(body.left, body.right)
+		self.assertIs(self.ctx.get_variable('z'), body.left)
+
+	def test_assign_function_optimized(self):
+		self.ev.visit(Assign(FunCall(Identifier('g'), [Identifier('x')]),
+			BinaryOp(BinaryOp(Identifier('x'), '*', Constant(1)), '+', Identifier('x'))))
+		self.assertEqual(repr(self.ctx.get_function('g').body),
+			"BinaryOp(Constant(2), '*', Identifier('x'))")
+
+	def test_assign_function_optimized_keeps_value(self):
+		self.ev.visit(Assign(FunCall(Identifier('h'), [Identifier('x')]),
+			BinaryOp(Identifier('x'), '^', Constant(1))))
+		self.ev.visit(Assign(FunCall(Identifier('k'), [Identifier('x')]),
+			BinaryOp(Identifier('x'), '/', Constant(1))))
+		with self.assertRaises(Matrix.NotSquareError):
+			self.ev.visit(FunCall(Identifier('h'), [Constant(Matrix([[1, 2]]))]))
+		self.ev.visit(FunCall(Identifier('k'), [Constant(3)]))
+		self.assertIs(self.ev.res.value.__class__, float)
+		self._assert_constant_eq(self.ev.res, 3.0)
+
+	def test_assign_function_optimized_pure_calls(self):
+		self.ev.visit(Assign(FunCall(Identifier('f'), [Identifier('x')]),
+			BinaryOp(Identifier('x'), '^', Constant(2))))
+		call = FunCall(Identifier('f'), [Identifier('x')])
+		self.ev.visit(Assign(FunCall(Identifier('g'), [Identifier('x')]),
+			BinaryOp(call, '+', call)))
+		self.assertEqual(self.ctx.get_function('g').body, BinaryOp(call, '+', call))
+		call = FunCall(Identifier('sin'), [Identifier('x')])
+		self.ev.visit(Assign(FunCall(Identifier('h'), [Identifier('x')]),
+			BinaryOp(call, '+', call)))
+		self.assertEqual(self.ctx.get_function('h').body, BinaryOp(Constant(2), '*', call))
+
+	def test_assign_function_optimized_scalars(self):
+		self.ev.visit(Assign(FunCall(Identifier('s'), [Identifier('x'), Identifier('y')]),
+			BinaryOp(FunCall(Identifier('sqrt'), [Identifier('x')]), '+',
+			BinaryOp(BinaryOp(Identifier('x'), '^', Constant(1)), '*',
+			BinaryOp(Identifier('y'), '^', Constant(1))))))
+		self.assertEqual(repr(self.ctx.get_function('s').body), "BinaryOp(FunCall(Identifier("
+			"'sqrt'), [Identifier('x')]), '+', BinaryOp(Identifier('x'), '*', BinaryOp("
+			"Identifier('y'), '^', Constant(1))))")
+
+	def test_assign_function_optimized_signed_zero(self):
+		self.ev.visit(Assign(FunCall(Identifier('f'), [Identifier('x')]),
+			BinaryOp(Constant(0), '-', Identifier('x'))))
+		self.ev.visit(Assign(FunCall(Identifier('g'), [Identifier('x')]),
+			BinaryOp(Identifier('x'), '+', Constant(0))))
+		self.ev.visit(FunCall(Identifier('f'), [Constant(0.0)]))
+		self.assertEqual(str(self.ev.res.value), '0.0')
+		self.ev.visit(FunCall(Identifier('g'), [Constant(-0.0)]))
+		self.assertEqual(str(self.ev.res.value), '0.0')
+
 	def test_assign_function_calling_builtin_function(self):
 		ast = Assign(FunCall(Identifier('foo'), [Identifier('x')]),
 			UnaryOp('-', FunCall(Identifier('sin'), [Identifier('x')])))
@@ -67,6 +125,86 @@ class TestEvaluatorVisitor(unittest.TestCase):
 		self.ev.visit(ast)
 		self._assert_constant_eq(self.ev.res, 42)
 
+	def test_binaryop_matmul_chain(self):
+		self.ctx.set_variable('m', Constant(Matrix.ones(4, 4)))
+		self.ctx.set_variable('v', Constant(Matrix.ones(4, 1)))
+		chain = BinaryOp(BinaryOp(Identifier('m'), '**', Identifier('m')), '**', Identifier('v'))
+		self.ev.visit(chain)
+		self._assert_constant_eq(self.ev.res, Matrix([[16.]] * 4))
+		self.assertEqual(self.ctx.chains[chain].render(), 'm ** (m ** v)')
+		self.ev.visit(Command(['explain']))
+		self.assertEqual(len(self.ctx.chains), 1)
+		self.ev.visit(Identifier('m'))
+		self.assertEqual(self.ctx.chains, {})
+		self.ev.visit(BinaryOp(BinaryOp(Identifier('m'), '**', Identifier('m')), '**',
+			Identifier('z')))
+		self.assertEqual(repr(self.ev.res), "BinaryOp(Constant(Matrix([[4.0, 4.0, 4.0, 4.0], "
+			"[4.0, 4.0, 4.0, 4.0], [4.0, 4.0, 4.0, 4.0], [4.0, 4.0, 4.0, 4.0]])), '**', "
+			"Identifier('z'))")
+
+	def test_binaryop_matmul_chain_visited_once(self):
+		calls = []
+		self.ctx.builtins = dict(self.ctx.builtins,
+			g=Builtin('g', lambda x: calls.append(x) or x, 1, pure=False))
+		m = Matrix.ones(2, 2)
+		self.ctx.set_variable('m', Constant(m))
+		g = FunCall(Identifier('g'), [Identifier('m')])
+		self.ev.visit(BinaryOp(BinaryOp(g, '**', Identifier('m')), '**', Identifier('z')))
+		self.assertEqual(calls, [m])
+		self.assertEqual(repr(self.ev.res), "BinaryOp(Constant(Matrix([[2.0, 2.0], [2.0, 2.0]])), "
+			"'**', Identifier('z'))")
+		with self.assertRaises(TypeError):
+			self.ev.visit(BinaryOp(BinaryOp(g, '**', Constant(2)), '**', Identifier('m')))
+
+	def test_bind(self):
+		self.ev.visit(Bind(Identifier('y'), BinaryOp(Identifier('a'), '+', Identifier('b'))))
+		self._assert_constant_eq(self.ev.res, 3)
+		self.ev.visit(Bind(Identifier('z'), FunCall(Identifier('f'), [Identifier('y')])))
+		self._assert_constant_eq(self.ev.res, 6)
+		self.ev.visit(Assign(Identifier('a'), Constant(10)))
+		self.assertTrue(self.ctx.get_binding('z').dirty)
+		self.ev.visit(Identifier('z'))
+		self._assert_constant_eq(self.ev.res, 24)
+
+	def test_bind_keeps_chains(self):
+		self.ctx.set_variable('m', Constant(Matrix.ones(2, 2)))
+		self.ctx.set_variable('v', Constant(Matrix.ones(2, 1)))
+		self.ev.visit(Bind(Identifier('y'), Identifier('v')))
+		self.ev.visit(Assign(Identifier('v'), Constant(Matrix.ones(2, 1))))
+		chain = BinaryOp(BinaryOp(Identifier('m'), '**', Identifier('m')), '**', Identifier('v'))
+		self.ev.visit(BinaryOp(chain, '+', Identifier('y')))
+		self._assert_constant_eq(self.ev.res, Matrix([[5.], [5.]]))
+		self.assertIn(chain, self.ctx.chains)
+
+	def test_bind_error(self):
+		self.ev.visit(Assign(Identifier('x'), Constant(0)))
+		self.ev.visit(Assign(Identifier('y'), Constant(5)))
+		for id in ('y', 'z'):
+			with self.assertRaises(ZeroDivisionError):
+				self.ev.visit(Bind(Identifier(id), BinaryOp(Constant(1), '/', Identifier('x'))))
+			self.assertIsNone(self.ctx.get_binding(id))
+		self._assert_constant_eq(self.ctx.get_variable('y'), 5)
+		self.assertNotIn('x', self.ctx.watchers)
+
+	def test_bind_in_function_body(self):
+		self.ev.visit(Bind(Identifier('y'), BinaryOp(Identifier('a'), '*', Constant(2))))
+		self.ctx.push_frame('f', {'a': 0}, [Constant(5)])
+		self.ev.visit(Identifier('y'))
+		self.ctx.pop_frame()
+		self._assert_constant_eq(self.ev.res, 2)
+
+	def test_bind_lazy(self):
+		calls = []
+		self.ctx.builtins = dict(self.ctx.builtins,
+			g=Builtin('g', lambda x: calls.append(x) or x, 1))
+		self.ev.visit(Bind(Identifier('y'), FunCall(Identifier('g'), [Identifier('a')])))
+		self.ev.visit(Assign(Identifier('a'), Constant(2)))
+		self.ev.visit(Assign(Identifier('a'), Constant(3)))
+		self.assertEqual(calls, [1])
+		self.ev.visit(BinaryOp(Identifier('y'), '+', Identifier('y')))
+		self._assert_constant_eq(self.ev.res, 6)
+		self.assertEqual(calls, [1, 3])
+
 	def test_command(self):
 		ast = Command(['clear'])
 		self.ev.visit(ast)
@@ -81,6 +219,113 @@ class TestEvaluatorVisitor(unittest.TestCase):
 		self.ev.visit(ast)
 		self._assert_constant_eq(self.ev.res, 1.0)
 
+	def test_funcall_impure(self):
+		calls = []
+		self.ctx.builtins = dict(self.ctx.builtins,
+			g=Builtin('g', lambda x: calls.append(x) or x, 1, pure=False))
+		call = FunCall(Identifier('g'), [Constant(1)])
+		self.ev.visit(BinaryOp(call, '+', call))
+		self.assertEqual(calls, [1, 1])
+		self.ev.visit(Assign(FunCall(Identifier('h'), [Identifier('x')]),
+			BinaryOp(Identifier('x'), '+', call)))
+		self.assertEqual(repr(self.ctx.get_function('h').body),
+			"BinaryOp(Identifier('x'), '+', FunCall(Identifier('g'), [Constant(1)]))")
+
+	def test_funcall_impure_user_defined(self):
+		self.ev.visit(Assign(FunCall(Identifier('g'), [Identifier('y')]),
+			BinaryOp(FunCall(Identifier('rand'), [Constant(1), Constant(1)]), '*', Identifier('y'))))
+		g = FunCall(Identifier('g'), [Constant(1)])
+		for compile_functions in (False, True):
+			self.ev.compile_functions = compile_functions
+			self.ev.visit(BinaryOp(g, '-', g))
+			self.assertNotEqual(self.ev.res.value, Matrix([[0.]]))
+			self.ev.visit(Assign(FunCall(Identifier('h'), [Identifier('x')]),
+				BinaryOp(g, '+', Identifier('x'))))
+			self.assertEqual(self.ctx.get_function('h').body.left, g)
+
+	def test_funcall_iterate(self):
+		self.ctx.set_variable('m', Constant(Matrix([[0, 1], [1, 1]])))
+		self.ctx.set_function('g', FunctionStorage([Identifier('v')],
+			BinaryOp(Identifier('m'), '**', Identifier('v'))))
+		self.ev.visit(FunCall(Identifier('iterate'),
+			[Identifier('g'), Constant(Matrix([[0], [1]])), Constant(10)]))
+		self._assert_constant_eq(self.ev.res, Matrix([[55], [89]]))
+
+	def test_funcall_map(self):
+		m = Constant(Matrix([[1, 2], [3, 4]]))
+		self.ev.visit(FunCall(Identifier('map'), [Identifier('f'), m]))
+		self._assert_constant_eq(self.ev.res, Matrix([[2, 4], [6, 8]]))
+		self.ev.visit(Assign(Identifier('f'), Constant(0)))
+		self.ev.visit(FunCall(Identifier('map'), [Identifier('f'), m]))
+		self._assert_constant_eq(self.ev.res, Matrix([[2, 4], [6, 8]]))
+		self.ev.visit(FunCall(Identifier('map'), [Identifier('sqrt'), m]))
+		self._assert_constant_eq(self.ev.res, Matrix([[1, 2 ** .5], [3 ** .5, 2]]))
+
+	def test_funcall_map_function_body(self):
+		self.ev.visit(Assign(FunCall(Identifier('g'), [Identifier('m')]),
+			FunCall(Identifier('map'), [Identifier('f'), Identifier('m')])))
+		self.assertEqual(self.ctx.get_functions_using_dependency('f'), {'g'})
+		self.ev.visit(FunCall(Identifier('g'), [Constant(Matrix([[1, 2]]))]))
+		self._assert_constant_eq(self.ev.res, Matrix([[2, 4]]))
+
+	def test_funcall_map_symbolic(self):
+		self.ctx.set_function('g', FunctionStorage([Identifier('x')],
+			BinaryOp(Identifier('x'), '+', Identifier('z'))))
+		node = FunCall(Identifier('map'), [Identifier('g'), Constant(Matrix([[1]]))])
+		self.assertEqual(self.ev.visit(node), node)
+		node = FunCall(Identifier('map'), [Identifier('f'), Identifier('z')])
+		self.assertEqual(self.ev.visit(node), node)
+
+	def test_funcall_memoized(self):
+		calls = []
+		self.ctx.builtins = dict(self.ctx.builtins, g=Builtin('g', lambda x: calls.append(x) or x, 1))
+		call = FunCall(Identifier('g'), [Identifier('a')])
+		self.ev.visit(BinaryOp(call, '+', FunCall(Identifier('g'), [Identifier('a')])))
+		self._assert_constant_eq(self.ev.res, 2)
+		self.assertEqual(calls, [1])
+		self.ev.visit(Assign(Identifier('a'), Constant(3)))
+		self.ev.visit(call)
+		self.assertEqual(calls, [1, 3])
+
+	def test_funcall_memoized_engines(self):
+		calls = []
+		self.ctx.builtins = dict(self.ctx.builtins, g=Builtin('g', lambda x: calls.append(x) or x, 1))
+		x = Identifier('x')
+		body = BinaryOp(FunCall(Identifier('g'), [x]), '*', FunCall(Identifier('g'), [x]))
+		self.ev.visit(Assign(FunCall(Identifier('h'), [x]), body))
+		self.assertIsNotNone(self.ctx.get_function('h').compiled)
+		self.ev.visit(FunCall(Identifier('h'), [Constant(3)]))
+		self._assert_constant_eq(self.ev.res, 9)
+		self.assertEqual(calls, [3])
+		ev = EvaluatorVisitor(self.ctx, 'vm')
+		ev.visit(FunCall(Identifier('h'), [Constant(4)]))
+		self._assert_constant_eq(ev.res, 16)
+		call = FunCall(Identifier('g'), [Identifier('a')])
+		ev.visit(BinaryOp(call, '+', FunCall(Identifier('g'), [Identifier('a')])))
+		self._assert_constant_eq(ev.res, 2)
+		self.assertEqual(calls, [3, 4, 1])
+
+	def test_funcall_cached(self):
+		self.ctx.get_function('f').cache = CallCache()
+		self.ev.visit(FunCall(Identifier('f'), [Constant(3)]))
+		self.ev.visit(FunCall(Identifier('f'), [Constant(3)]))
+		self._assert_constant_eq(self.ev.res, 6)
+		cache = self.ctx.get_function('f').cache
+		self.assertEqual((cache.hits, cache.misses), (1, 1))
+		self.ev.visit(Assign(FunCall(Identifier('f'), [Identifier('x')]), Identifier('x')))
+		self.ev.visit(FunCall(Identifier('f'), [Constant(3)]))
+		self._assert_constant_eq(self.ev.res, 3)
+
+	def test_funcall_compiled(self):
+		self.ev.visit(Assign(FunCall(Identifier('g'), [Identifier('x')]),
+			BinaryOp(FunCall(Identifier('f'), [Identifier('x')]), '+', Identifier('x'))))
+		self.assertIsNotNone(self.ctx.get_function('g').compiled)
+		self.ev.visit(FunCall(Identifier('g'), [Constant(3)]))
+		self._assert_constant_eq(self.ev.res, 9)
+		self.ev.visit(FunCall(Identifier('g'), [Identifier('z')]))
+		self.assertEqual(repr(self.ev.res),
+			"BinaryOp(BinaryOp(Identifier('z'), '*', Constant(2)), '+', Identifier('z'))")
+
 	def test_funcall_nested(self):
 		ast = FunCall(Identifier('f'), [FunCall(Identifier('f'), [Constant(10)])])
 		self.ev.visit(ast)
@@ -92,6 +337,43 @@ class TestEvaluatorVisitor(unittest.TestCase):
 		self.assertEqual(repr(self.ev.res),
 			"BinaryOp(BinaryOp(Identifier('x'), '*', Constant(2)), '*', Constant(2))")
 
+	def test_funcall_rand(self):
+		rand = FunCall(Identifier('rand'), [Constant(1), Constant(2)])
+		for engine in EvaluatorVisitor.engines:
+			ev = EvaluatorVisitor(self.ctx, engine)
+			ev.visit(BinaryOp(rand, '-', rand))
+			self.assertEqual(ev.res.value.shape, (1, 2))
+			self.assertNotEqual(ev.res.value, Matrix([[0., 0.]]))
+			ev.visit(Assign(FunCall(Identifier('g'), [Identifier('x')]),
+				BinaryOp(rand, '*', Identifier('x'))))
+			self.assertEqual(repr(self.ctx.get_function('g').body), "BinaryOp(FunCall(Identifier("
+				"'rand'), [Constant(1), Constant(2)]), '*', Identifier('x'))")
+
+	def test_funcall_shared_calls(self):
+		calls = []
+		self.ctx.builtins = dict(self.ctx.builtins, g=Builtin('g', lambda x: calls.append(x) or x, 1))
+		x = Identifier('x')
+		for engine, compile_functions in (('tree', False), ('tree', True), ('vm', True)):
+			ev = EvaluatorVisitor(self.ctx, engine)
+			ev.compile_functions = compile_functions
+			ev.visit(Assign(FunCall(Identifier('f0'), [x]), FunCall(Identifier('g'), [x])))
+			for i in range(1, 11):
+				call = FunCall(Identifier(f'f{i - 1}'), [x])
+				ev.visit(Assign(FunCall(Identifier(f'f{i}'), [x]),
+					BinaryOp(call, '+', BinaryOp(call, '*', Constant(2)))))
+			calls.clear()
+			ev.visit(FunCall(Identifier('f10'), [Constant(1)]))
+			self._assert_constant_eq(ev.res, 3 ** 10)
+			self.assertEqual(calls, [1], engine)
+
+	def test_funcall_sum(self):
+		self.ev.visit(FunCall(Identifier('sum'), [Identifier('f'), Constant(1), Constant(100)]))
+		self._assert_constant_eq(self.ev.res, 10100)
+		self.ev.visit(FunCall(Identifier('prod'), [Identifier('f'), Constant(1), Identifier('b')]))
+		self._assert_constant_eq(self.ev.res, 8)
+		node = FunCall(Identifier('sum'), [Identifier('f'), Constant(1), Identifier('n')])
+		self.assertEqual(self.ev.visit(node), node)
+
 	def test_funcall_undefined(self):
 		ast = FunCall(Identifier('foo'), [Constant(1)])
 		self.ev.visit(ast)
@@ -102,6 +384,23 @@ class TestEvaluatorVisitor(unittest.TestCase):
 		self.ev.visit(ast)
 		self._assert_constant_eq(self.ev.res, 42)
 
+	def test_funcall_user_defined_with_parameter_name_arg(self):
+		self.ctx.set_function('g', FunctionStorage([Identifier('x'), Identifier('y')],
+			BinaryOp(Identifier('x'), '+', Identifier('y'))))
+		self.ev.visit(FunCall(Identifier('g'), [Constant(1), Identifier('x')]))
+		self.assertEqual(repr(self.ev.res), "BinaryOp(Constant(1), '+', Identifier('x'))")
+
+	def test_funcall_user_defined_lexical_scope(self):
+		self.ctx.set_function('g', FunctionStorage([Identifier('x')],
+			BinaryOp(Identifier('x'), '*', Identifier('z'))))
+		self.ctx.set_function('h', FunctionStorage([Identifier('z')],
+			FunCall(Identifier('g'), [Constant(2)]), {'g'}))
+		self.ev.visit(FunCall(Identifier('h'), [Identifier('z')]))
+		self.assertEqual(repr(self.ev.res), "BinaryOp(Constant(2), '*', Identifier('z'))")
+		self.ctx.set_variable('z', Constant(3))
+		self.ev.visit(FunCall(Identifier('h'), [Constant(5)]))
+		self._assert_constant_eq(self.ev.res, 6)
+
 	def test_funcall_user_defined_with_undefined_args(self):
 		ast = FunCall(Identifier('f'), [Identifier('y')])
 		self.ev.visit(ast)
@@ -112,6 +411,12 @@ class TestEvaluatorVisitor(unittest.TestCase):
 		self.ev.visit(ast)
 		self._assert_constant_eq(self.ev.res, 1)
 
+	def test_identifier_shared(self):
+		m = Matrix([[1, 2], [3, 4]])
+		self.ctx.set_variable('m', Constant(m))
+		self.ev.visit(Identifier('m'))
+		self.assertIs(self.ev.res.value, m)
+
 	def test_identifier_undeclared(self):
 		ast = Identifier('x')
 		self.ev.visit(ast)
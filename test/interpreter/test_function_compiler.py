@@ -0,0 +1,93 @@
+import unittest
+from src.ast import BinaryOp, Constant, FunCall, Identifier, MatDecl, UnaryOp
+from src.dtype import Matrix
+from src.interpreter import Builtin, Context, FunctionCompiler, FunctionStorage, SymbolicValue, \
+	shared_nodes
+
+class TestFunctionCompiler(unittest.TestCase):
+	"""This class contains tests for the FunctionCompiler class."""
+
+	def _call(self, id, *values):
+		f = self.ctx.get_function(id)
+		return FunctionCompiler().compile(f)(list(values), self.ctx)
+
+	def setUp(self):
+		self.ctx = Context()
+		self.ctx.set_function('f',
+			FunctionStorage([Identifier('x')], BinaryOp(Identifier('x'), '*', Constant(2))))
+
+	def test_binaryop(self):
+		self.assertEqual(self._call('f', 21), 42)
+
+	def test_builtin(self):
+		self.ctx.set_function('g', FunctionStorage([Identifier('x')],
+			FunCall(Identifier('abs'), [UnaryOp('-', Identifier('x'))])))
+		self.assertEqual(self._call('g', 3), 3)
+
+	def test_constant_variable(self):
+		self.ctx.set_function('g', FunctionStorage([Identifier('x')],
+			BinaryOp(Identifier('x'), '+', Identifier('pi'))))
+		self.assertAlmostEqual(self._call('g', 1), 4.14159, places=5)
+
+	def test_falsy_variable(self):
+		self.ctx.set_function('g', FunctionStorage([Identifier('x')],
+			BinaryOp(Identifier('x'), '+', Identifier('z'))))
+		self.ctx.set_variable('z', Constant(0))
+		self.assertEqual(self._call('g', 1), 1)
+		self.ctx.set_variable('z', 0.0)
+		self.assertEqual(self._call('g', 1), 1.0)
+
+	def test_map(self):
+		self.ctx.set_function('g', FunctionStorage([Identifier('m')],
+			FunCall(Identifier('map'), [Identifier('f'), Identifier('m')])))
+		self.assertEqual(self._call('g', Matrix([[1], [2]])), Matrix([[2], [4]]))
+
+	def test_matdecl(self):
+		self.ctx.set_function('g', FunctionStorage([Identifier('x'), Identifier('y')],
+			MatDecl([[Identifier('x'), Constant(0)], [Constant(0), Identifier('y')]])))
+		self.assertEqual(self._call('g', 1, 2), Matrix([[1, 0], [0, 2]]))
+
+	def test_matmul_chain(self):
+		chain = BinaryOp(BinaryOp(Identifier('m'), '**', Identifier('m')), '**', Identifier('v'))
+		self.ctx.set_function('g', FunctionStorage([Identifier('m'), Identifier('v')], chain))
+		self.assertEqual(self._call('g', Matrix.ones(3, 3), Matrix.ones(3, 1)), Matrix([[9.]] * 3))
+		self.assertEqual(self.ctx.chains[chain].render(), 'm ** (m ** v)')
+		with self.assertRaises(TypeError):
+			self._call('g', 2, Matrix.ones(3, 1))
+
+	def test_shared_nodes(self):
+		call = FunCall(Identifier('g'), [Identifier('x')])
+		total = BinaryOp(call, '+', Constant(1))
+		self.assertEqual(shared_nodes(BinaryOp(total, '*', total)), {total})
+		calls = []
+		self.ctx.builtins = dict(self.ctx.builtins, g=Builtin('g', lambda x: calls.append(x) or x, 1))
+		self.ctx.set_function('h', FunctionStorage([Identifier('x')], BinaryOp(total, '*', total)))
+		self.assertEqual(self._call('h', 2), 9)
+		self.assertEqual(calls, [2])
+		self.ctx.builtins['g'] = Builtin('g', lambda x: calls.append(x) or x, 1, pure=False)
+		self.ctx.set_function('h', FunctionStorage([Identifier('x')], BinaryOp(call, '*', call)))
+		self.assertEqual(self._call('h', 3), 9)
+		self.assertEqual(calls, [2, 3, 3])
+
+	def test_symbolic_variable(self):
+		self.ctx.set_function('g', FunctionStorage([Identifier('x')],
+			BinaryOp(Identifier('x'), '+', Identifier('y'))))
+		with self.assertRaises(SymbolicValue):
+			self._call('g', 1)
+		self.ctx.set_variable('y', BinaryOp(Identifier('z'), '+', Constant(1)))
+		with self.assertRaises(SymbolicValue):
+			self._call('g', 1)
+		self.ctx.set_variable('y', Constant(1))
+		self.assertEqual(self._call('g', 1), 2)
+
+	def test_undefined_function(self):
+		self.ctx.set_function('g', FunctionStorage([Identifier('x')],
+			FunCall(Identifier('h'), [Identifier('x')])))
+		with self.assertRaises(SymbolicValue):
+			self._call('g', 1)
+
+	def test_user_defined_function(self):
+		self.ctx.set_function('g', FunctionStorage([Identifier('y')],
+			BinaryOp(FunCall(Identifier('f'), [Identifier('y')]), '+', Constant(1))))
+		self.assertEqual(self._call('g', 2), 5)
+		self.assertIsNotNone(self.ctx.get_function('f').compiled)
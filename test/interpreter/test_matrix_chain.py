@@ -0,0 +1,61 @@
+import unittest
+from src.ast import BinaryOp, Constant, Identifier
+from src.dtype import Matrix
+from src.interpreter import MatrixChain, chain_names, chain_operands, is_chain, multiply_chain
+
+def matmul(*names):
+	node = Identifier(names[0])
+	for name in names[1:]:
+		node = BinaryOp(node, '**', Identifier(name))
+	return node
+
+class TestMatrixChain(unittest.TestCase):
+	"""This class tests the MatrixChain class and the matrix chain helpers."""
+
+	def test_chain_names(self):
+		operands = [Identifier('a'), Constant(Matrix([[1, 2]])), BinaryOp(Identifier('b'), '+',
+			Constant(1)), BinaryOp(Constant(2), '*', Constant(Matrix.ones(20, 1)))]
+		self.assertEqual(chain_names(operands), ('a', '[1x2]#1', '(b + 1)', '(2 * [20x1]#2)'))
+
+	def test_chain_operands(self):
+		self.assertEqual(chain_operands(matmul('a', 'b', 'c')),
+			[Identifier('a'), Identifier('b'), Identifier('c')])
+		node = BinaryOp(Identifier('a'), '**', matmul('b', 'c'))
+		self.assertEqual(chain_operands(node), [Identifier('a'), matmul('b', 'c')])
+
+	def test_is_chain(self):
+		self.assertTrue(is_chain(matmul('a', 'b', 'c')))
+		self.assertFalse(is_chain(matmul('a', 'b')))
+		self.assertFalse(is_chain(BinaryOp(matmul('a', 'b'), '*', Identifier('c'))))
+		self.assertFalse(is_chain(Identifier('a')))
+
+	def test_multiply(self):
+		a = Matrix([[1, 2], [3, 4]])
+		v = Matrix([[1], [1]])
+		chain = MatrixChain.order(('a', 'a', 'v'), (a.shape, a.shape, v.shape))
+		self.assertEqual(chain.multiply([a, a, v]), a.matmul(a).matmul(v))
+
+	def test_multiply_chain(self):
+		chains = {}
+		a = Matrix.ones(3, 3)
+		v = Matrix.ones(3, 1)
+		self.assertEqual(multiply_chain(chains, [a, a, v], matmul('a', 'a', 'v')),
+			Matrix([[9.]] * 3))
+		self.assertEqual(chains[matmul('a', 'a', 'v')].render(), 'a ** (a ** v)')
+		self.assertIsNone(multiply_chain(chains, [a, v, a], matmul('a', 'v', 'a')))
+		self.assertIsNone(multiply_chain(chains, [a, 2, a], matmul('a', 'b', 'a')))
+		self.assertEqual(len(chains), 1)
+
+	def test_order(self):
+		# Example from Introduction to Algorithms, 15.2
+		dims = [30, 35, 15, 5, 10, 20, 25]
+		names = tuple(f'a{i}' for i in range(1, 7))
+		chain = MatrixChain.order(names, tuple(zip(dims, dims[1:])))
+		self.assertEqual(chain.cost, 15125)
+		self.assertEqual(chain.render(), 'a1 ** (a2 ** a3) ** (a4 ** a5 ** a6)')
+		self.assertEqual(chain.get_left_to_right_cost(), 40500)
+
+	def test_order_left_to_right(self):
+		chain = MatrixChain.order(('a', 'b', 'c'), ((2, 2), (2, 2), (2, 2)))
+		self.assertEqual(chain.render(), 'a ** b ** c')
+		self.assertEqual(chain.cost, chain.get_left_to_right_cost())
@@ -1,7 +1,9 @@
-import unittest
+import contextlib, io, unittest
 from src.ast import *
-from src.interpreter import ClearCommand, CommandError, Context, DeleteCommand, FunctionStorage, \
-	HelpCommand, InterpreterErrorGroup, InvalidCommandError, ShowCommand, SystemCommandFactory
+from src.dtype import Matrix
+from src.interpreter import Binding, CacheCommand, ClearCommand, CommandError, Context, \
+	DeleteCommand, ExplainCommand, FunctionStorage, HelpCommand, InterpreterErrorGroup, \
+	InvalidCommandError, ShowCommand, SystemCommandFactory, multiply_chain
 
 class TestSystemCommands(unittest.TestCase):
 	"""This class tests the SystemCommandFactory class and its subclasses."""
@@ -9,6 +11,47 @@ class TestSystemCommands(unittest.TestCase):
 	def setUp(self):
 		self.ctx = Context()
 
+	def test_cache(self):
+		CacheCommand(self.ctx, []).execute()
+
+	def test_cache_clear(self):
+		self.ctx.set_function('f', FunctionStorage([Identifier('x')], Identifier('x')))
+		CacheCommand(self.ctx, ['enable', 'f']).execute()
+		cache = self.ctx.get_function('f').cache
+		cache.get(())
+		CacheCommand(self.ctx, ['clear', 'f']).execute()
+		self.assertEqual(cache.misses, 0)
+
+	def test_cache_disable(self):
+		self.ctx.set_function('f', FunctionStorage([Identifier('x')], Identifier('x')))
+		CacheCommand(self.ctx, ['enable', 'f']).execute()
+		CacheCommand(self.ctx, ['disable', 'f']).execute()
+		self.assertIsNone(self.ctx.get_function('f').cache)
+
+	def test_cache_enable(self):
+		self.ctx.set_function('f', FunctionStorage([Identifier('x')], Identifier('x')))
+		CacheCommand(self.ctx, ['enable', 'f', '16']).execute()
+		self.assertEqual(self.ctx.get_function('f').cache.maxsize, 16)
+		CacheCommand(self.ctx, ['show']).execute()
+
+	def test_cache_enable_impure(self):
+		self.ctx.set_function('f', FunctionStorage([Identifier('x')], Identifier('x'), set(), True))
+		with self.assertRaises(CommandError):
+			CacheCommand(self.ctx, ['enable', 'f']).execute()
+
+	def test_cache_enable_invalid_size(self):
+		self.ctx.set_function('f', FunctionStorage([Identifier('x')], Identifier('x')))
+		with self.assertRaises(CommandError):
+			CacheCommand(self.ctx, ['enable', 'f', 'foo']).execute()
+
+	def test_cache_enable_undefined(self):
+		with self.assertRaises(CommandError):
+			CacheCommand(self.ctx, ['enable', 'sin']).execute()
+
+	def test_cache_invalid_command(self):
+		with self.assertRaises(CommandError):
+			CacheCommand(self.ctx, ['foo']).execute()
+
 	def test_clear(self):
 		# This test is not very useful, but it is here for completeness.
 		ClearCommand(None, ['clear']).execute()
@@ -61,6 +104,21 @@ class TestSystemCommands(unittest.TestCase):
 		with self.assertRaises(CommandError):
 			DeleteCommand(self.ctx, ['foo', 'bar']).execute()
 
+	def test_explain(self):
+		ExplainCommand(self.ctx, []).execute()
+		m = Matrix.ones(2, 2)
+		node = BinaryOp(BinaryOp(Identifier('m'), '**', Identifier('m')), '**', Constant(m))
+		multiply_chain(self.ctx.chains, [m, m, m], node)
+		with io.StringIO() as buffer, contextlib.redirect_stdout(buffer):
+			ExplainCommand(self.ctx, []).execute()
+			output = buffer.getvalue()
+		self.assertEqual(output, 'm ** m ** [2x2]#1 with m: 2x2, [2x2]#1: 2x2\n'
+			'cost: 16 multiplications instead of 16 from left to right\n')
+
+	def test_explain_invalid_number_of_arguments(self):
+		with self.assertRaises(CommandError):
+			ExplainCommand(self.ctx, ['foo']).execute()
+
 	def test_help(self):
 		HelpCommand(self.ctx, []).execute()
 
@@ -89,6 +147,10 @@ class TestSystemCommands(unittest.TestCase):
 		self.ctx.set_variable('a', Constant(1))
 		ShowCommand(self.ctx, ['variables']).execute()
 
+	def test_show_variables_binding(self):
+		self.ctx.bind('y', Binding(Identifier('x'), frozenset({'x'}), lambda value: value))
+		ShowCommand(self.ctx, ['variables']).execute()
+
 	def test_show_invalid_command(self):
 		with self.assertRaises(CommandError):
 			ShowCommand(self.ctx, ['foo']).execute()
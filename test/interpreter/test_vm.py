@@ -0,0 +1,130 @@
+import unittest
+from src.ast import Assign, BinaryOp, Command, Constant, FunCall, Identifier, MatDecl, UnaryOp
+from src.dtype import Matrix
+from src.interpreter import BINARY_OP, CALL, CallCache, Context, EvaluatorVisitor, FunctionStorage, \
+	LOAD_CONST, LOAD_NAME, LOAD_SLOT, MATMUL_CHAIN, VirtualMachine, lower
+
+class TestVirtualMachine(unittest.TestCase):
+	"""This class contains tests for the VirtualMachine class."""
+
+	def setUp(self):
+		self.ctx = Context()
+		self.ctx.set_function('f',
+			FunctionStorage([Identifier('x')], BinaryOp(Identifier('x'), '*', Constant(2))))
+		self.ctx.set_variable('a', Constant(1))
+		self.vm = VirtualMachine(self.ctx)
+
+	def test_binaryop(self):
+		r = self.vm.evaluate(BinaryOp(Identifier('a'), '+', Constant(2)))
+		self.assertEqual(repr(r), 'Constant(3)')
+
+	def test_call(self):
+		r = self.vm.evaluate(FunCall(Identifier('f'), [FunCall(Identifier('f'), [Constant(3)])]))
+		self.assertEqual(repr(r), 'Constant(12)')
+		r = self.vm.evaluate(FunCall(Identifier('abs'), [Constant(-3)]))
+		self.assertEqual(repr(r), 'Constant(3)')
+
+	def test_call_cached(self):
+		self.ctx.get_function('f').cache = CallCache()
+		for _ in range(2):
+			r = self.vm.evaluate(FunCall(Identifier('f'), [FunCall(Identifier('f'), [Constant(3)])]))
+			self.assertEqual(repr(r), 'Constant(12)')
+		cache = self.ctx.get_function('f').cache
+		self.assertEqual((cache.hits, cache.misses), (2, 2))
+
+	def test_call_map(self):
+		m = Constant(Matrix([[1, 2]]))
+		r = self.vm.evaluate(FunCall(Identifier('map'), [Identifier('f'), m]))
+		self.assertEqual(r.value, Matrix([[2, 4]]))
+		r = self.vm.evaluate(FunCall(Identifier('map'), [Identifier('abs'), UnaryOp('-', m)]))
+		self.assertEqual(r.value, Matrix([[1, 2]]))
+		node = FunCall(Identifier('map'), [Identifier('f'), Identifier('z')])
+		self.assertEqual(self.vm.evaluate(node), node)
+
+	def test_call_impure(self):
+		ev = EvaluatorVisitor(self.ctx, 'vm')
+		ev.visit(Assign(FunCall(Identifier('g'), [Identifier('y')]),
+			BinaryOp(FunCall(Identifier('rand'), [Constant(1), Constant(1)]), '*', Identifier('y'))))
+		g = FunCall(Identifier('g'), [Constant(1)])
+		r = self.vm.evaluate(BinaryOp(g, '-', g))
+		self.assertNotEqual(r.value, Matrix([[0.]]))
+		ev.visit(Assign(FunCall(Identifier('h'), [Identifier('x')]),
+			BinaryOp(g, '+', Identifier('x'))))
+		self.assertEqual(self.ctx.get_function('h').body.left, g)
+
+	def test_call_symbolic(self):
+		node = FunCall(Identifier('f'), [Identifier('z')])
+		self.assertEqual(repr(self.vm.evaluate(node)),
+			"BinaryOp(Identifier('z'), '*', Constant(2))")
+		self.assertEqual(repr(self.vm.evaluate(node, expand_functions=False)),
+			"FunCall(Identifier('f'), [Identifier('z')])")
+
+	def test_call_lexical_scope(self):
+		self.ctx.set_function('g', FunctionStorage([Identifier('x')],
+			BinaryOp(Identifier('x'), '*', Identifier('z'))))
+		self.ctx.set_function('h', FunctionStorage([Identifier('z')],
+			FunCall(Identifier('g'), [Constant(2)]), {'g'}))
+		r = self.vm.evaluate(FunCall(Identifier('h'), [Constant(5)]))
+		self.assertEqual(repr(r), "BinaryOp(Constant(2), '*', Identifier('z'))")
+
+	def test_deep_expression(self):
+		node = Constant(0)
+		for i in range(1, 10001):
+			node = BinaryOp(node, '+', Constant(i))
+		self.assertEqual(self.vm.evaluate(node).value, 50005000)
+
+	def test_deep_function(self):
+		body = Identifier('y')
+		for _ in range(2999):
+			body = BinaryOp(body, '+', Identifier('y'))
+		ev = EvaluatorVisitor(self.ctx, 'vm')
+		ev.visit(Assign(FunCall(Identifier('h'), [Identifier('y')]), body))
+		self.assertEqual(ev.visit(FunCall(Identifier('h'), [Constant(1)])).value, 3000)
+
+	def test_evaluator_engine(self):
+		with self.assertRaises(ValueError):
+			EvaluatorVisitor(self.ctx, 'foo')
+		ev = EvaluatorVisitor(self.ctx, 'vm')
+		self.assertEqual(ev.visit(FunCall(Identifier('f'), [Identifier('a')])).value, 2)
+	def test_lower(self):
+		code = lower(BinaryOp(Identifier('x'), '+', FunCall(Identifier('g'), [Identifier('y')])),
+			('x',))
+		self.assertEqual([i[0] for i in code.instructions], [LOAD_SLOT, LOAD_NAME, CALL, BINARY_OP])
+		self.assertEqual(code.instructions[0][1], 0)
+		self.assertEqual(code.instructions[1][1], 'y')
+
+	def test_lower_statement(self):
+		with self.assertRaises(TypeError):
+			lower(Command(['foo']))
+
+	def test_matmul_chain(self):
+		self.ctx.set_variable('m', Constant(Matrix.ones(4, 4)))
+		self.ctx.set_variable('v', Constant(Matrix.ones(4, 1)))
+		node = BinaryOp(BinaryOp(Identifier('m'), '**', Identifier('m')), '**', Identifier('v'))
+		code = lower(node)
+		self.assertEqual(code.instructions[-1], (MATMUL_CHAIN, (node, 3)))
+		self.assertEqual(self.vm.evaluate(node).value, Matrix([[16.]] * 4))
+		self.assertEqual(self.ctx.chains[node].render(), 'm ** (m ** v)')
+		node = BinaryOp(BinaryOp(Identifier('z'), '**', Identifier('m')), '**', Identifier('v'))
+		self.assertEqual(repr(self.vm.evaluate(node)), "BinaryOp(BinaryOp(Identifier('z'), '**', "
+			"Constant(Matrix([[1.0, 1.0, 1.0, 1.0], [1.0, 1.0, 1.0, 1.0], [1.0, 1.0, 1.0, 1.0], "
+			"[1.0, 1.0, 1.0, 1.0]]))), '**', Constant(Matrix([[1.0], [1.0], [1.0], [1.0]])))")
+
+	def test_matrix(self):
+		r = self.vm.evaluate(MatDecl([[Identifier('a'), Constant(2)], [Constant(3), Constant(4)]]))
+		self.assertEqual(r.value, Matrix([[1, 2], [3, 4]]))
+		r = self.vm.evaluate(MatDecl([[Identifier('z'), Constant(2)]]))
+		self.assertEqual(repr(r), "MatDecl([[Identifier('z'), Constant(2)]])")
+
+	def test_profiling(self):
+		self.vm.profiling = True
+		self.vm.evaluate(BinaryOp(Constant(1), '+', FunCall(Identifier('f'), [Constant(2)])))
+		self.assertEqual(self.vm.stats['LOAD_CONST'][0], 3)
+		self.assertEqual(self.vm.stats['BINARY_OP'][0], 2)
+		self.assertEqual(self.vm.stats['LOAD_SLOT'][0], 1)
+
+	def test_symbolic(self):
+		node = BinaryOp(Identifier('z'), '+', Constant(2))
+		r = self.vm.evaluate(UnaryOp('-', UnaryOp('-', node)))
+		self.assertEqual(r, node)
+
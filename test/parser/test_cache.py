@@ -0,0 +1,55 @@
+import unittest
+from src.interpreter import Context, EvaluatorVisitor
+from src.parser import ParseCache
+
+class TestParseCache(unittest.TestCase):
+	"""This class contains tests for the parse cache."""
+
+	def setUp(self):
+		self.cache = ParseCache(maxsize=2)
+
+	def test_hit(self):
+		stmt = self.cache.parse('f(3) = ?')
+		self.assertIs(self.cache.parse('f(3)   =\t?  '), stmt)
+		self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+	def test_normalize(self):
+		self.assertEqual(ParseCache.normalize(' 2  x\t+ 1 '), '2 x + 1')
+		self.assertEqual(ParseCache.normalize('a # b\n+ 1'), 'a # b\n+ 1')
+
+	def test_eviction(self):
+		a = self.cache.parse('a')
+		self.cache.parse('b')
+		self.cache.parse('a')
+		self.cache.parse('c')
+		self.assertEqual(len(self.cache), 2)
+		self.assertIs(self.cache.get('a'), a)
+		self.assertIsNone(self.cache.get('b'))
+
+	def test_disabled(self):
+		cache = ParseCache(maxsize=0)
+		cache.parse('a')
+		self.assertEqual(len(cache), 0)
+		self.assertIsNone(cache.get('a'))
+
+	def test_syntax_error_not_cached(self):
+		with self.assertRaises(SyntaxError):
+			self.cache.parse('2 + * 2')
+		self.assertEqual(len(self.cache), 0)
+
+	def test_clear(self):
+		self.cache.parse('a')
+		self.cache.parse('a')
+		self.cache.clear()
+		self.assertEqual((len(self.cache), self.cache.hits, self.cache.misses), (0, 0, 0))
+
+	def test_evaluation_does_not_corrupt(self):
+		ctx = Context()
+		ev = EvaluatorVisitor(ctx)
+		statements = ['f(x) = 2 * x + -x ^ 2', 'f(3) + [[1, 2]] * 2', 'x + 1 = 3 ?', 'f(x) = ?']
+		for s in statements:
+			stmt = self.cache.parse(s)
+			expected = repr(stmt)
+			first = repr(ev.visit(stmt))
+			self.assertEqual(repr(self.cache.parse(s)), expected)
+			self.assertEqual(repr(ev.visit(self.cache.parse(s))), first)
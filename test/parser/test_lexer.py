@@ -1,6 +1,6 @@
 import unittest
 from src import ast
-from src.parser import tokenize as tk
+from src.parser import iter_tokens, tokenize as tk
 
 class TestLexer(unittest.TestCase):
 	"""This class contains tests for the lexer."""
@@ -11,6 +11,9 @@ class TestLexer(unittest.TestCase):
 		for i, token in enumerate(tokens):
 			self.assertEqual(token.type, expected[i])
 
+	def test_bind(self):
+		self.assertEqual([t.type for t in tk('y := x')], ['ID', 'BIND', 'ID'])
+
 	def test_symbols(self):
 		expected = ['COMMA', 'LBRACKET', 'LPAREN', 'QMARK', 'RBRACKET', 'RPAREN', 'SEMICOL']
 		tokens = tk(',[(?]);')
@@ -69,3 +72,23 @@ class TestLexer(unittest.TestCase):
 		expected = ['ID', 'EQUALS', 'INT', 'SUB', 'FLOAT', 'MUL', 'INT', 'DIV', 'INT', 'POW', 'INT']
 		for i, token in enumerate(tokens):
 			self.assertEqual(token.type, expected[i])
+
+	def test_spans(self):
+		s = 'varA = 1.5 # comment\n  f(x)'
+		tokens = tk(s)
+		self.assertEqual([s[t.start:t.end] for t in tokens], ['varA', '=', '1.5', 'f', '(', 'x', ')'])
+		self.assertEqual([t.lineno for t in tokens], [1, 1, 1, 2, 2, 2, 2])
+
+	def test_iter_tokens_lazy(self):
+		tokens = iter_tokens('1 + 2 !')
+		self.assertEqual(next(tokens).type, 'INT')
+		self.assertEqual(next(tokens).type, 'ADD')
+		self.assertEqual(next(tokens).type, 'INT')
+		with self.assertRaises(SyntaxError) as e:
+			next(tokens)
+		self.assertEqual(e.exception.span, (6, 7))
+
+	def test_iter_tokens_start(self):
+		tokens = list(iter_tokens('1 +\n2', start=4, lineno=2))
+		self.assertEqual(len(tokens), 1)
+		self.assertEqual((tokens[0].value, tokens[0].lineno, tokens[0].start), (2, 2, 4))
@@ -1,78 +1,169 @@
-import unittest
+import glob, os, tempfile, unittest
+from unittest import mock
 from src.parser import parse
+from src.parser.parser import build_parser, get_tables_path
 
 class TestParser(unittest.TestCase):
 	"""This class contains tests for the parser."""
 
+	backend = 'ply'
+
+	def parse(self, s: str):
+		return parse(s, backend=self.backend)
+
 	def test_assign_int(self):
-		self.assertEqual(repr(parse('varA = 2')), "Assign(Identifier('vara'), Constant(2))")
+		self.assertEqual(repr(self.parse('varA = 2')), "Assign(Identifier('vara'), Constant(2))")
 
 	def test_assign_float(self):
-		self.assertEqual(repr(parse('varB = 4.242')),
+		self.assertEqual(repr(self.parse('varB = 4.242')),
 			"Assign(Identifier('varb'), Constant(4.242))")
 
 	def test_assign_float_negative(self):
-		self.assertEqual(repr(parse('varC = -4.3')),
+		self.assertEqual(repr(self.parse('varC = -4.3')),
 			"Assign(Identifier('varc'), UnaryOp('-', Constant(4.3)))")
 
 	def test_assign_complex(self):
-		self.assertEqual(repr(parse('varA = 2*i + 3')),
+		self.assertEqual(repr(self.parse('varA = 2*i + 3')),
 			"Assign(Identifier('vara'), BinaryOp(BinaryOp(Constant(2), '*', Identifier('i')), '+', Constant(3)))")
 
 	def test_assign_complex_negative(self):
-		self.assertEqual(repr(parse('varB =  -4i - 4')),
+		self.assertEqual(repr(self.parse('varB =  -4i - 4')),
 			"Assign(Identifier('varb'), BinaryOp(UnaryOp('-', BinaryOp(Constant(4), '*', Identifier('i'))), '-', Constant(4)))")
 
 	def test_assign_matrix(self):
-		self.assertEqual(repr(parse('varC = [[2,3];[4,3]]')),
-			"Assign(Identifier('varc'), MatDecl([[Constant(2), Constant(3)], [Constant(4), Constant(3)]]))")
+		self.assertEqual(repr(self.parse('varC = [[2,3];[4,3]]')),
+			"Assign(Identifier('varc'), Constant(Matrix([[2, 3], [4, 3]])))")
+
+	def test_assign_matrix_signed_literals(self):
+		self.assertEqual(repr(self.parse('varC = [[-2,+3.5]]')),
+			"Assign(Identifier('varc'), Constant(Matrix([[-2.0, 3.5]])))")
+
+	def test_assign_matrix_expressions(self):
+		self.assertEqual(repr(self.parse('varC = [[2,x];[1/2,3]]')),
+			"Assign(Identifier('varc'), MatDecl([[Constant(2), Identifier('x')], [BinaryOp(Constant(1), '/', Constant(2)), Constant(3)]]))")
+
+	def test_assign_matrix_invalid_shape(self):
+		self.assertEqual(repr(self.parse('varC = [[2,3];[4]]')),
+			"Assign(Identifier('varc'), MatDecl([[Constant(2), Constant(3)], [Constant(4)]]))")
 
 	def test_assign_function(self):
-		self.assertEqual(repr(parse('funA(x) = 2x + 1')),
+		self.assertEqual(repr(self.parse('funA(x) = 2x + 1')),
 			"Assign(FunCall(Identifier('funa'), [Identifier('x')]), BinaryOp(BinaryOp(Constant(2), '*', Identifier('x')), '+', Constant(1)))")
 
 	def test_assign_function_multiple_args(self):
-		self.assertEqual(repr(parse('funB(x, y) = x * y')),
+		self.assertEqual(repr(self.parse('funB(x, y) = x * y')),
 			"Assign(FunCall(Identifier('funb'), [Identifier('x'), Identifier('y')]), BinaryOp(Identifier('x'), '*', Identifier('y')))")
 
 	def test_assign_uppercase(self):
-		self.assertEqual(repr(parse('VARC = 2')),
+		self.assertEqual(repr(self.parse('VARC = 2')),
 			"Assign(Identifier('varc'), Constant(2))")
 
 	def test_compute(self):
-		self.assertEqual(repr(parse('2 * 21 = ?')),
+		self.assertEqual(repr(self.parse('2 * 21 = ?')),
 			"BinaryOp(Constant(2), '*', Constant(21))")
 
 	def test_compute_function(self):
-		self.assertEqual(repr(parse('funA(2) = ?')),
+		self.assertEqual(repr(self.parse('funA(2) = ?')),
 			"FunCall(Identifier('funa'), [Constant(2)])")
 
 	def test_priority(self):
-		self.assertEqual(repr(parse('1 * 2 + 3')),
+		self.assertEqual(repr(self.parse('1 * 2 + 3')),
 			"BinaryOp(BinaryOp(Constant(1), '*', Constant(2)), '+', Constant(3))")
-		self.assertEqual(repr(parse('1 + 2 * 3')),
+		self.assertEqual(repr(self.parse('1 + 2 * 3')),
 			"BinaryOp(Constant(1), '+', BinaryOp(Constant(2), '*', Constant(3)))")
-		self.assertEqual(repr(parse('(1 + 2) * 3')),
+		self.assertEqual(repr(self.parse('(1 + 2) * 3')),
 			"BinaryOp(BinaryOp(Constant(1), '+', Constant(2)), '*', Constant(3))")
 
 	def test_compute_eof(self):
 		with self.assertRaises(EOFError):
-			parse('a + 2 =')
+			self.parse('a + 2 =')
 
 	def test_solve(self):
-		self.assertEqual(repr(parse('funA(x) = y ?')),
+		self.assertEqual(repr(self.parse('funA(x) = y ?')),
 			"Solve(Assign(FunCall(Identifier('funa'), [Identifier('x')]), Identifier('y')))")
 
+	def test_bind(self):
+		self.assertEqual(repr(self.parse('y := 2x')),
+			"Bind(Identifier('y'), BinaryOp(Constant(2), '*', Identifier('x')))")
+
+	def test_bind_solve(self):
+		with self.assertRaises(SyntaxError):
+			self.parse('y := x ?')
+
 	def test_command(self):
-		self.assertEqual(repr(parse('% foo')), "Command(['foo'])")
+		self.assertEqual(repr(self.parse('% foo')), "Command(['foo'])")
 
 	def test_command_args(self):
-		self.assertEqual(repr(parse('% foo bar baz')), "Command(['foo', 'bar', 'baz'])")
+		self.assertEqual(repr(self.parse('% foo bar baz')), "Command(['foo', 'bar', 'baz'])")
+
+	def test_command_int_args(self):
+		self.assertEqual(repr(self.parse('% foo bar 16')), "Command(['foo', 'bar', '16'])")
 
 	def test_invalid_variable(self):
 		with self.assertRaises(SyntaxError):
-			parse('_var = 2')
+			self.parse('_var = 2')
 
 	def test_unexcepted_token(self):
 		with self.assertRaises(SyntaxError):
-			parse('2 + * 2')
+			self.parse('2 + * 2')
+
+	def test_error_span(self):
+		with self.assertRaises(SyntaxError) as e:
+			self.parse('x = 2 ** ** 3')
+		self.assertEqual(e.exception.span, (9, 11))
+
+	def test_tables_cache(self):
+		with tempfile.TemporaryDirectory() as cache_dir, \
+			mock.patch.dict(os.environ, {'COMPUTORV2_CACHE_DIR': cache_dir}):
+			path = get_tables_path()
+			self.assertTrue(path.startswith(cache_dir))
+			self.assertFalse(os.path.exists(path))
+			build_parser()
+			self.assertTrue(os.path.exists(path))
+			self.assertEqual(os.listdir(os.path.dirname(path)), [os.path.basename(path)])
+			p = build_parser()
+			self.assertEqual(repr(p.parse('x = 2')), "Assign(Identifier('x'), Constant(2))")
+
+	def test_tables_cache_cleanup(self):
+		with tempfile.TemporaryDirectory() as cache_dir, \
+			mock.patch.dict(os.environ, {'COMPUTORV2_CACHE_DIR': cache_dir}):
+			path = get_tables_path()
+			tables_dir = os.path.dirname(path)
+			with mock.patch('os.replace', side_effect=OSError):
+				build_parser()
+			self.assertFalse(os.path.exists(tables_dir) and os.listdir(tables_dir))
+			other_paths = []
+			for i in range(9):
+				other_path = os.path.join(tables_dir, f'parsetab-{i:016x}.pickle')
+				open(other_path, 'w').close()
+				os.utime(other_path, (i, i))
+				other_paths.append(other_path)
+			build_parser()
+			self.assertEqual(sorted(glob.glob(os.path.join(tables_dir, '*'))),
+				sorted(other_paths[2:] + [path]))
+			os.utime(path, (0, 0))
+			build_parser()
+			self.assertGreater(os.path.getmtime(path), 9)
+
+class TestPrattParser(TestParser):
+	"""This class runs the parser tests against the hand-written parser."""
+
+	backend = 'pratt'
+
+	def test_unknown_backend(self):
+		with self.assertRaises(ValueError):
+			parse('1', backend='foo')
+
+	def test_same_ast(self):
+		statements = ['-2 ^ 2', '2 ^ -3 ^ 2', '2x ^ 3', '1 - 2 - 3', '2 ^ 3 ^ 2',
+			'a ** b * c % d / e', '[[1, 2]; [3, 4]]x', 'f(x, -y) = x - -y ?', '- - 2 * x']
+		for s in statements:
+			self.assertEqual(repr(self.parse(s)), repr(parse(s)), s)
+
+	def test_error_tokens(self):
+		for s in ['2x(3)', '(2)x', '[[1, 2], [3]]', '% 2', 'a = b = c', 'x = ? 1']:
+			with self.assertRaises(SyntaxError) as ply_error:
+				parse(s)
+			with self.assertRaises(SyntaxError) as pratt_error:
+				self.parse(s)
+			self.assertEqual(str(pratt_error.exception), str(ply_error.exception))
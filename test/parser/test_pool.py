@@ -0,0 +1,45 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from src.parser import Parser, ParserPool, parse
+
+class TestParserPool(unittest.TestCase):
+	"""This class contains tests for the reentrant parsers and their pool."""
+
+	def test_parser_instances(self):
+		p1, p2 = Parser(), Parser()
+		self.assertIsNot(p1.lexer, p2.lexer)
+		self.assertIsNot(p1.lr_parser, p2.lr_parser)
+		self.assertEqual(repr(p1.parse('x = 2')), repr(p2.parse('x = 2', 'pratt')))
+
+	def test_parser_error_recovery(self):
+		p = Parser()
+		with self.assertRaises(SyntaxError):
+			p.parse('2 + * 2')
+		with self.assertRaises(EOFError):
+			p.parse('2 +')
+		self.assertEqual(repr(p.parse('2')), 'Constant(2)')
+
+	def test_parser_line_number(self):
+		p = Parser()
+		with self.assertRaisesRegex(SyntaxError, 'on line 2'):
+			p.parse('1 +\n+ * 2')
+		with self.assertRaisesRegex(SyntaxError, 'on line 1'):
+			p.parse('+ * 2')
+
+	def test_pool_reuse(self):
+		pool = ParserPool(maxsize=1)
+		with pool.get() as p1:
+			with pool.get() as p2:
+				self.assertIsNot(p1, p2)
+		self.assertEqual(len(pool.idle), 1)
+		with pool.get() as p3:
+			self.assertIn(p3, (p1, p2))
+
+	def test_concurrent_parse(self):
+		pool = ParserPool()
+		statements = [f'f{i}(x) = [[{i}, x]; [x, {i}]] ** x ^ {i}' for i in range(200)]
+		expected = [repr(parse(s)) for s in statements]
+		for backend in Parser.backends:
+			with ThreadPoolExecutor(max_workers=8) as executor:
+				res = list(executor.map(lambda s: repr(pool.parse(s, backend)), statements))
+			self.assertEqual(res, expected)
@@ -0,0 +1,46 @@
+import unittest
+from src.parser import parse, parse_script
+
+class TestParseScript(unittest.TestCase):
+	"""This class contains tests for the whole script parser."""
+
+	def _assert_statements(self, text: str, expected: list):
+		statements = parse_script(text)
+		self.assertEqual(len(statements), len(expected))
+		for stmt, (s, start_line, end_line) in zip(statements, expected):
+			self.assertIsNone(stmt.error)
+			self.assertEqual(repr(stmt.ast), repr(parse(s)))
+			self.assertEqual((stmt.start_line, stmt.end_line), (start_line, end_line))
+
+	def test_empty(self):
+		self.assertEqual(parse_script(''), [])
+		self.assertEqual(parse_script('# comment\n\n'), [])
+
+	def test_single_line_statements(self):
+		self._assert_statements('x = 2\n\ny = x * 2 # comment\n%show\n',
+			[('x = 2', 1, 1), ('y = x * 2', 3, 3), ('%show', 4, 4)])
+
+	def test_multi_line_statement(self):
+		self._assert_statements('A = [\n\t[1, 2];\n# comment\n\t[3, 4]\n]\nA',
+			[('A = [[1, 2]; [3, 4]]', 1, 5), ('A', 6, 6)])
+
+	def test_syntax_error_recovery(self):
+		statements = parse_script('x = (\n2 + * 3\ny = 1\n')
+		self.assertEqual(len(statements), 2)
+		self.assertIsInstance(statements[0].error, SyntaxError)
+		self.assertIn('on line 2', str(statements[0].error))
+		self.assertEqual((statements[0].start_line, statements[0].end_line), (1, 2))
+		self.assertEqual(repr(statements[1].ast), repr(parse('y = 1')))
+
+	def test_illegal_character_recovery(self):
+		statements = parse_script('x = !1\ny = 1')
+		self.assertEqual(len(statements), 2)
+		self.assertIsInstance(statements[0].error, SyntaxError)
+		self.assertEqual((statements[0].start_line, statements[0].end_line), (1, 1))
+		self.assertEqual(repr(statements[1].ast), repr(parse('y = 1')))
+
+	def test_unexpected_end_of_file(self):
+		statements = parse_script('x = 1\ny = [\n[1]')
+		self.assertEqual(len(statements), 2)
+		self.assertIsInstance(statements[1].error, EOFError)
+		self.assertEqual((statements[1].start_line, statements[1].end_line), (2, 3))
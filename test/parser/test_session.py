@@ -0,0 +1,52 @@
+import unittest
+from src.parser import INCOMPLETE, ParseSession, parse
+
+class TestParseSession(unittest.TestCase):
+	"""This class contains tests for the incremental parse session."""
+
+	def setUp(self):
+		self.session = ParseSession()
+
+	def test_single_line(self):
+		self.assertEqual(repr(self.session.feed('x = 2\n')), repr(parse('x = 2')))
+		self.assertFalse(self.session.pending)
+
+	def test_incomplete(self):
+		self.assertIs(self.session.feed('a + 2 =\n'), INCOMPLETE)
+		self.assertTrue(self.session.pending)
+		self.assertEqual(repr(self.session.feed('3\n')), repr(parse('a + 2 = 3')))
+		self.assertFalse(self.session.pending)
+
+	def test_multi_line_matrix(self):
+		lines = ['A = [', '[1, 2];', '[3, 4];', '[5, 6]', ']']
+		for line in lines[:-1]:
+			self.assertIs(self.session.feed(line + '\n'), INCOMPLETE)
+		self.assertEqual(repr(self.session.feed(lines[-1] + '\n')),
+			repr(parse('\n'.join(lines))))
+
+	def test_comment_only(self):
+		self.assertIs(self.session.feed('# comment\n'), INCOMPLETE)
+		self.assertEqual(repr(self.session.feed('1\n')), 'Constant(1)')
+
+	def test_syntax_error_line_number(self):
+		self.session.feed('x = (\n')
+		with self.assertRaisesRegex(SyntaxError, 'on line 2'):
+			self.session.feed(')\n')
+		self.assertFalse(self.session.pending)
+
+	def test_syntax_error_resets(self):
+		with self.assertRaises(SyntaxError):
+			self.session.feed('2 + * 2\n')
+		self.assertEqual(repr(self.session.feed('2\n')), 'Constant(2)')
+
+	def test_illegal_character_resets(self):
+		self.session.feed('x = [\n')
+		with self.assertRaises(SyntaxError):
+			self.session.feed('!\n')
+		self.assertEqual(repr(self.session.feed('% foo\n')), "Command(['foo'])")
+
+	def test_reset(self):
+		self.session.feed('x = \n')
+		self.session.reset()
+		self.assertFalse(self.session.pending)
+		self.assertEqual(repr(self.session.feed('y\n')), "Identifier('y')")